@@ -3,14 +3,84 @@
 """Main module for the 15-Puzzle Solver."""
 
 import argparse
+import json
 import logging
+import sys
 import time
+from typing import Any, Dict, List, Optional
 
 import psutil
 
-from src.board import Board
-from src.tree import Node, Tree
-from src.utils import convert_string_to_list, validate_list
+from src.batch import solve_batch
+from src.board import DEFAULT_LAYOUT, Board, parse_size
+from src.cache import DEFAULT_MAX_ENTRIES, SolutionCache
+from src.explored import EXPLORED_SETS
+from src.heuristics import HEURISTICS
+from src.patterns import PARTITIONS, load_pattern_heuristic
+from src.perimeter import PerimeterDatabase
+from src.stats import SearchStats
+from src.tree import OPTIMAL_ROUTINES, PRIORITY_QUEUES, ROUTINES, Node, Tree
+from src.utils import convert_string_to_list, is_solvable, validate_list
+
+# Exit statuses reported to the calling process.
+EXIT_INVALID = 1
+EXIT_UNSOLVABLE = 3
+EXIT_TIMEOUT = 4
+EXIT_NO_SOLUTION = 5
+
+
+def print_result(
+    args: argparse.Namespace,
+    routine: str,
+    heuristic: str,
+    moves: List[str],
+    expanded: int,
+    elapsed: float,
+    memory: int,
+    stats: SearchStats,
+    cached: bool = False,
+    solutions: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """Print the outcome of a solve in the format requested by --stats.
+
+    Parameters:
+        args (argparse.Namespace): The parsed command line.
+        routine (str): The routine that found the moves.
+        heuristic (str): The heuristic used by the routine.
+        moves (List[str]): The moves solving the board.
+        expanded (int): The number of nodes expanded.
+        elapsed (float): Seconds taken.
+        memory (int): Change in resident memory in bytes.
+        stats (SearchStats): The statistics of the search.
+        cached (bool): Whether the moves came from the solution cache.
+        solutions (List[Dict[str, Any]]): Every improving solution of an
+            anytime search with its suboptimality bound, if any.
+    """
+    if args.stats == "json":
+        report = {
+            "routine": routine,
+            "heuristic": heuristic,
+            "moves": moves,
+            "cached": cached,
+            "stats": stats.as_dict(),
+        }
+        if solutions is not None:
+            report["solutions"] = solutions
+        print(json.dumps(report))
+        return
+
+    print(
+        f"""
+        Search Routine: {routine}{" (cached)" if cached else ""}\n
+        Moves: {moves}\n
+        Expanded Node Count: {expanded}\n
+        Time Taken: {round(elapsed * 1000)} ms\n
+        Memory Used: {(memory / 1000):.2f} kb\n
+    """
+    )
+    if args.stats == "text":
+        for name, value in stats.as_dict().items():
+            print(f"        {name}: {value}")
 
 
 def main():
@@ -22,7 +92,7 @@ def main():
     parser.add_argument(
         "search_routine",
         type=str,
-        choices=["bfs", "dfs", "ish"],
+        choices=ROUTINES,
         help="The search algorithm to use on this puzzle.",
     )
 
@@ -34,6 +104,170 @@ def main():
         help="The starting state of the program able to create a 4x4 matrix.",
     )
 
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        default=DEFAULT_LAYOUT,
+        metavar="ROWSxCOLS",
+        help="The size of the board, such as 3x3 or 5x5 (default: 4x4).",
+    )
+
+    parser.add_argument(
+        "--heuristic",
+        type=str,
+        choices=list(HEURISTICS) + list(PARTITIONS),
+        default=None,
+        help="The heuristic used by the informed routines. misplaced counts "
+        "the blank, so astar, idastar, biastar and arastar do not accept it.",
+    )
+
+    parser.add_argument(
+        "--weight",
+        type=float,
+        default=None,
+        help="The heuristic weight of the first arastar solution, lowered "
+        "towards 1 by every later one (default: 3).",
+    )
+
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Stop searching after SECONDS; arastar keeps its best solution.",
+    )
+
+    parser.add_argument(
+        "--depth-limit",
+        type=int,
+        default=None,
+        metavar="MOVES",
+        help="The deepest node bfs, dfs and ish expand (default: 16), or the "
+        "longest solution iddfs searches for (default: no limit).",
+    )
+
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        default=None,
+        help="The most boards kept in every layer of the beam routine "
+        "(default: 1000).",
+    )
+
+    parser.add_argument(
+        "--priority-queue",
+        type=str,
+        choices=list(PRIORITY_QUEUES),
+        default=None,
+        help="The frontier of ish, astar and biastar: a bucket queue over the "
+        "integer priorities (default) or a binary heap.",
+    )
+
+    parser.add_argument(
+        "--explored-set",
+        type=str,
+        choices=EXPLORED_SETS,
+        default=None,
+        help="The explored set: a built-in set (default), a compact hash table "
+        "of 64-bit states, a bitset over every board for sizes up to 12 cells, "
+        "or a Bloom filter with a 0.1%% false-positive rate at 10 million states.",
+    )
+
+    parser.add_argument(
+        "--spill-dir",
+        type=str,
+        default=None,
+        metavar="DIRECTORY",
+        help="The directory extbfs writes its sorted layer files to and keeps "
+        "them in (default: a temporary directory removed afterwards).",
+    )
+
+    parser.add_argument(
+        "--perimeter",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="A database built by build_perimeter.py; the search stops at any "
+        "state it holds and the heuristic uses its exact distances.",
+    )
+
+    parser.add_argument(
+        "--pdb-dir",
+        type=str,
+        default="pdb",
+        help="The directory holding tables built by build_patterns.py.",
+    )
+
+    parser.add_argument(
+        "--max-memory",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Resident memory budget; near it the search falls back to idastar.",
+    )
+
+    parser.add_argument(
+        "--stats",
+        type=str,
+        choices=["text", "json"],
+        default=None,
+        help="Time every search phase, trace peak allocation and print all "
+        "statistics as text or as one JSON document.",
+    )
+
+    parser.add_argument(
+        "--progress",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Print a progress report to stderr every SECONDS.",
+    )
+
+    parser.add_argument(
+        "--batch",
+        type=argparse.FileType("r"),
+        metavar="FILE",
+        help="Solve one board per line of FILE ('-' for stdin) in parallel, "
+        "printing one JSON result per line.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes for --batch (default: CPU count), "
+        "or sharing every idastar iteration (default: 1).",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds allowed for each board in --batch mode.",
+    )
+
+    parser.add_argument(
+        "--ordered",
+        action="store_true",
+        help="Print --batch results in input order instead of completion order.",
+    )
+
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Reuse and record solutions in the SQLite database FILE, which "
+        "several processes may share.",
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        help="The most solutions kept in the --cache database.",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -55,35 +289,169 @@ def main():
     args = parser.parse_args()
     logging.basicConfig(level=args.logging_level)
 
+    if args.batch is not None:
+        unsupported = [
+            option
+            for option, value in (
+                ("--max-memory", args.max_memory),
+                ("--stats", args.stats),
+                ("--progress", args.progress),
+                ("--cache", args.cache),
+            )
+            if value is not None
+        ]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --batch")
+        results = solve_batch(
+            args.batch,
+            args.search_routine,
+            args.heuristic,
+            args.workers,
+            args.timeout,
+            args.ordered,
+            args.pdb_dir,
+            args.size.rows,
+            args.size.cols,
+        )
+        for result in results:
+            print(json.dumps(result), flush=True)
+        return 0
+
     matrix_list = convert_string_to_list(args.matrix_string)
 
     try:
-        validate_list(matrix_list)
+        validate_list(matrix_list, args.size.rows, args.size.cols)
     except AssertionError as ae:
         print(ae)
-        return
+        return EXIT_INVALID
+
+    if not is_solvable(matrix_list, args.size.rows, args.size.cols):
+        print("The goal state cannot be reached from this board.")
+        return EXIT_UNSOLVABLE
+
+    if args.heuristic in PARTITIONS:
+        if args.size is not DEFAULT_LAYOUT:
+            print(f"The {args.heuristic} heuristic only supports 4x4 boards.")
+            return EXIT_INVALID
+        try:
+            load_pattern_heuristic(args.heuristic, args.pdb_dir)
+        except FileNotFoundError as fe:
+            print(f"{fe} (build it with ./build_patterns.py {args.heuristic})")
+            return EXIT_INVALID
+
+    perimeter = None
+    if args.perimeter is not None:
+        try:
+            perimeter = PerimeterDatabase(args.perimeter)
+        except (OSError, ValueError) as error:
+            print(f"{error} (build it with ./build_perimeter.py)")
+            return EXIT_INVALID
 
     logging.debug("Running %s routine on %s", args.search_routine, matrix_list)
-    game_board = Board(matrix_list)
-    tree = Tree(Node(game_board), args.search_routine)
+    game_board = Board(matrix_list, args.size)
+    max_memory = None
+    if args.max_memory is not None:
+        max_memory = int(args.max_memory * 1024 * 1024)
+    stats = SearchStats(
+        timed=args.stats is not None,
+        trace_memory=args.stats is not None,
+        report_interval=args.progress,
+        reporter=lambda report: print(json.dumps(report), file=sys.stderr),
+    )
+    # A Bloom filter may skip unseen states, so its solutions are not known
+    # to be shortest.
+    exact = args.explored_set != "bloom"
+    optimal = args.search_routine in OPTIMAL_ROUTINES and exact
+
+    cache = None
+    if args.cache is not None:
+        cache = SolutionCache(args.cache, args.cache_size)
+        start = time.perf_counter()
+        moves = cache.get(game_board, optimal)
+        if moves is not None:
+            end = time.perf_counter()
+            print_result(
+                args,
+                args.search_routine,
+                args.heuristic,
+                moves,
+                0,
+                end - start,
+                0,
+                stats,
+                cached=True,
+            )
+            return 0
+
+    try:
+        tree = Tree(
+            Node(game_board),
+            args.search_routine,
+            args.heuristic,
+            max_memory,
+            stats,
+            args.workers,
+            args.weight,
+            args.time_budget,
+            args.depth_limit,
+            args.beam_width,
+            args.priority_queue,
+            args.spill_dir,
+            args.explored_set,
+            perimeter,
+        )
+    except (AssertionError, ImportError) as error:
+        print(error)
+        return EXIT_INVALID
 
     start = time.perf_counter()
     start_mem = psutil.Process().memory_info().rss
-    while len(tree.goal_states) == 0:
-        tree.expand()
+    reported = []
+    for event in tree.solve_iter():
+        # Anytime solutions and tighter bounds are shown as they are found.
+        if args.stats != "json" and tree.bounds[-1:] != reported[-1:]:
+            print(
+                f"Solution {len(tree.bounds)}: "
+                f"{tree.goal_states[-1].depth_count} moves, "
+                f"within {tree.bounds[-1]:.2f}x optimal",
+                flush=True,
+            )
+            reported = list(tree.bounds)
     end = time.perf_counter()
     end_mem = psutil.Process().memory_info().rss
 
-    print(
-        f"""
-        Search Routine: {tree.routine}\n
-        Moves: {tree.goal_states[0].action_used}\n
-        Expanded Node Count: {tree.expand_count}\n
-        Time Taken: {round((end - start) * 1000)} ms\n
-        Memory Used: {((end_mem - start_mem) / 1000):.2f} kb\n
-    """
+    if not tree.goal_states:
+        if event.reason == "exhausted":
+            print("No solution found within the depth limit.")
+            return EXIT_NO_SOLUTION
+        print(f"No solution found within {args.time_budget} seconds.")
+        return EXIT_TIMEOUT
+
+    # The last solution of an anytime search is the shortest.
+    moves = tree.goal_states[-1].action_used
+    solutions = None
+    if tree.routine == "arastar":
+        optimal = tree.suboptimality <= 1.0 and exact
+        solutions = [
+            {"moves": goal.depth_count, "bound": bound}
+            for goal, bound in zip(tree.goal_states, tree.bounds)
+        ]
+    if cache is not None:
+        cache.put(game_board, moves, optimal)
+
+    print_result(
+        args,
+        tree.routine,
+        tree.heuristic,
+        moves,
+        tree.expand_count,
+        end - start,
+        end_mem - start_mem,
+        tree.stats,
+        solutions=solutions,
     )
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""Benchmark suite for the 15-Puzzle Solver search routines.
+
+Run it from the repository root with `python -m benchmarks`.
+"""
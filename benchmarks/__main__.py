@@ -0,0 +1,100 @@
+"""Command line interface of the benchmark suite.
+
+`python -m benchmarks run` records a JSON result file and
+`python -m benchmarks compare BASELINE CURRENT` exits with status 1 when the
+current results regress beyond the threshold.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from benchmarks.suite import WALK_SETS, compare_results, run_suite
+from src.tree import ROUTINES
+
+
+def main():
+    """Main driver of the benchmark suite."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the 15-Puzzle Solver search routines."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks.")
+    run.add_argument(
+        "--routines",
+        nargs="+",
+        choices=ROUTINES,
+        default=["astar", "idastar", "biastar", "bibfs", "ish", "bfs"],
+        help="The search routines to benchmark.",
+    )
+    run.add_argument(
+        "--sets",
+        nargs="+",
+        choices=list(WALK_SETS) + ["korf100"],
+        default=None,
+        help="The instance sets to use instead of each routine's defaults.",
+    )
+    run.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds allowed for each board (default: none, 10 for korf100).",
+    )
+    run.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Use only the first LIMIT boards of every set (default: all, 5 for "
+        "korf100).",
+    )
+    run.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="benchmarks/results.json",
+        help="The JSON file to write the results to.",
+    )
+
+    compare = commands.add_parser("compare", help="Compare two result files.")
+    compare.add_argument("baseline", type=str, help="The baseline result file.")
+    compare.add_argument("current", type=str, help="The result file to check.")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed relative drop in nodes/sec or rise in peak memory.",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig()
+
+    if args.command == "run":
+        results = run_suite(args.routines, args.sets, args.timeout, args.limit)
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+        for routine, sets in results["results"].items():
+            for name, result in sets.items():
+                print(
+                    f"{routine:>8} {name:<8} solved {result['solved']}/"
+                    f"{result['instances']} expanded {result['expanded']} "
+                    f"{result['nodes_per_sec']:.0f} nodes/s "
+                    f"peak {result['peak_memory'] / 1000:.0f} kb"
+                )
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, "r", encoding="utf-8") as file:
+        current = json.load(file)
+
+    regressions = compare_results(baseline, current, args.threshold)
+    for regression in regressions:
+        print(regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
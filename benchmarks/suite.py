@@ -0,0 +1,288 @@
+"""This module contains the benchmark instance sets, the runner recording the
+cost of every routine on them, and the comparison of two recorded results.
+"""
+
+import os
+import platform
+import random
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.board import Board
+from src.generator import format_board, random_walk
+from src.pruning import get_move_automaton
+from src.tree import Node, Tree
+
+KORF_PATH = os.path.join(os.path.dirname(__file__), "korf100.txt")
+
+# Random walk sets as (walk length, instance count).
+WALK_SETS = {"walk-8": (8, 10), "walk-16": (16, 10), "walk-32": (32, 10)}
+
+# The sets each routine is run on unless others are requested.
+DEFAULT_SETS = {
+    "bfs": ("walk-8",),
+    "dfs": ("walk-8",),
+    "iddfs": ("walk-8", "walk-16"),
+    "ish": ("walk-8",),
+    "astar": ("walk-8", "walk-16", "walk-32", "korf100"),
+    "idastar": ("walk-8", "walk-16", "walk-32", "korf100"),
+    "bibfs": ("walk-8", "walk-16"),
+    "biastar": ("walk-8", "walk-16", "walk-32"),
+    "extbfs": ("walk-8",),
+}
+
+# The boards used and seconds allowed for each in the sets too hard to run
+# in full, unless other limits are requested. Most of Korf's instances take
+# hours in Python, so these mostly measure the speed on deep searches.
+SET_LIMITS = {"korf100": (5, 10.0)}
+
+SEED = 480
+
+
+def random_walk_boards(length: int, count: int, seed: int = SEED) -> List[str]:
+    """Create boards by walking randomly away from the goal state without
+    undoing the previous move.
+
+    Parameters:
+        length (int): The number of moves in every walk.
+        count (int): The number of boards to create.
+        seed (int): The seed making the boards reproducible.
+
+    Returns:
+        List of matrix strings.
+    """
+    generator = random.Random(seed + length)
+    return [format_board(random_walk(generator, length)) for _ in range(count)]
+
+
+def korf_boards(path: str = KORF_PATH) -> List[str]:
+    """Load Korf's 100 instances.
+
+    The file uses Korf's layout, the blank being 0 and the goal state
+    0 1 2 ... 15. Rotating the board half a turn and renaming tile t to
+    16 - t maps that goal onto GOAL_STATE and keeps every distance.
+
+    Parameters:
+        path (str): The file holding one instance per line.
+
+    Returns:
+        List of matrix strings.
+    """
+    boards = []
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            tiles = [int(tile) for tile in line.split()]
+            if not tiles:
+                continue
+            converted = [
+                "_" if tile == 0 else str(16 - tile) for tile in reversed(tiles)
+            ]
+            boards.append(" ".join(converted))
+    return boards
+
+
+def instance_set(name: str) -> List[str]:
+    """Return the boards of a named instance set.
+
+    Parameters:
+        name (str): "korf100" or a key of WALK_SETS.
+
+    Throws:
+        AssertionError if the set does not exist.
+
+    Returns:
+        List of matrix strings.
+    """
+    if name == "korf100":
+        return korf_boards()
+    if name not in WALK_SETS:
+        raise AssertionError(f"Unknown instance set {name}.")
+    return random_walk_boards(*WALK_SETS[name])
+
+
+def search_board(board: Board, routine: str, timeout: Optional[float] = None) -> Tree:
+    """Search one board until it is solved, the timeout passes or no path is
+    left.
+
+    Parameters:
+        board (Board): The starting state.
+        routine (str): The search routine to use.
+        timeout (float): Seconds allowed, the Tree's time budget.
+
+    Returns:
+        The Tree searched, with any solution in its goal states.
+    """
+    tree = Tree(Node(board), routine, time_budget=timeout)
+    try:
+        while len(tree.goal_states) == 0 and not tree.finished:
+            tree.expand()
+    except IndexError:
+        pass
+    finally:
+        tree.close()
+    return tree
+
+
+def run_instance(
+    matrix_string: str, routine: str, timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """Solve one board, recording its cost. Tracing allocations slows the
+    search, so the board is searched twice: once timed and once under
+    tracemalloc for the peak memory.
+
+    Parameters:
+        matrix_string (str): The starting state.
+        routine (str): The search routine to use.
+        timeout (float): Seconds allowed for each search.
+
+    Returns:
+        Dictionary with the solved flag, expanded node count, wall time in
+        seconds, traced peak memory in bytes and solution length.
+    """
+    board = Board(matrix_string.split())
+    result = {"solved": True, "expanded": 0, "time": 0.0, "peak_memory": 0}
+    result["length"] = 0
+    if board.is_goal_state():
+        return result
+
+    start = time.perf_counter()
+    tree = search_board(board, routine, timeout)
+    result["time"] = time.perf_counter() - start
+    result["expanded"] = tree.expand_count
+    result["solved"] = len(tree.goal_states) > 0
+    if result["solved"]:
+        result["length"] = len(tree.goal_states[0].action_used)
+    del tree
+
+    tracemalloc.start()
+    try:
+        search_board(board, routine, timeout)
+        result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def run_set(
+    routine: str,
+    boards: Sequence[str],
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run a routine over a set of boards and summarise the cost.
+
+    Parameters:
+        routine (str): The search routine to use.
+        boards (Sequence[str]): The starting states.
+        timeout (float): Seconds allowed for each board.
+
+    Returns:
+        Dictionary of totals, nodes per second, peak memory, the timeout and
+        the per-instance results.
+    """
+    instances = [run_instance(board, routine, timeout) for board in boards]
+    solved = [instance for instance in instances if instance["solved"]]
+    expanded = sum(instance["expanded"] for instance in instances)
+    elapsed = sum(instance["time"] for instance in instances)
+
+    return {
+        "instances": len(instances),
+        "solved": len(solved),
+        "expanded": expanded,
+        "time": elapsed,
+        "nodes_per_sec": expanded / elapsed if elapsed > 0 else 0.0,
+        "peak_memory": max(
+            (instance["peak_memory"] for instance in instances), default=0
+        ),
+        "solution_length": sum(instance["length"] for instance in solved),
+        "timeout": timeout,
+        "per_instance": instances,
+    }
+
+
+def run_suite(
+    routines: Sequence[str],
+    sets: Optional[Sequence[str]] = None,
+    timeout: Optional[float] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run every requested routine over its instance sets.
+
+    Parameters:
+        routines (Sequence[str]): The search routines to benchmark.
+        sets (Sequence[str]): The instance sets to use; defaults to the
+            DEFAULT_SETS of each routine.
+        timeout (float): Seconds allowed for each board; defaults to the
+            SET_LIMITS of the sets that have one.
+        limit (int): Use only the first limit boards of every set; defaults
+            to the SET_LIMITS of the sets that have one.
+
+    Returns:
+        Dictionary with the environment and the results of every routine
+        and set, ready to be written as JSON.
+    """
+    # Tables shared by every search are built once, outside the timings.
+    get_move_automaton()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for routine in routines:
+        results[routine] = {}
+        for name in sets or DEFAULT_SETS.get(routine, ("walk-8",)):
+            set_limit, set_timeout = SET_LIMITS.get(name, (None, None))
+            if limit is not None:
+                set_limit = limit
+            if timeout is not None:
+                set_timeout = timeout
+            boards = instance_set(name)[:set_limit]
+            results[routine][name] = run_set(routine, boards, set_timeout)
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "timeout": timeout,
+        "limit": limit,
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1
+) -> List[str]:
+    """Find the regressions of a run against a baseline. Only routines and
+    sets present in both are compared.
+
+    Parameters:
+        baseline (Dict[str, Any]): Results recorded by run_suite.
+        current (Dict[str, Any]): Results recorded by run_suite.
+        threshold (float): The allowed relative drop in nodes per second and
+            rise in peak memory.
+
+    Returns:
+        List of messages describing each regression; empty if there are none.
+    """
+    regressions = []
+    for routine, sets in current["results"].items():
+        for name, result in sets.items():
+            previous = baseline["results"].get(routine, {}).get(name)
+            if previous is None:
+                continue
+
+            label = f"{routine}/{name}"
+            speed, old_speed = result["nodes_per_sec"], previous["nodes_per_sec"]
+            if speed < old_speed * (1 - threshold):
+                regressions.append(
+                    f"{label}: nodes/sec fell from {old_speed:.0f} to {speed:.0f}"
+                )
+
+            memory, old_memory = result["peak_memory"], previous["peak_memory"]
+            if memory > old_memory * (1 + threshold):
+                regressions.append(
+                    f"{label}: peak memory rose from {old_memory} to {memory} bytes"
+                )
+
+            if result["solved"] < previous["solved"]:
+                regressions.append(
+                    f"{label}: solved {result['solved']} of {result['instances']}"
+                    f" instead of {previous['solved']}"
+                )
+    return regressions
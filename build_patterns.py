@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+"""Module building the pattern databases used by the pdb heuristics.
+
+The tables are written once and then memory-mapped by every agent run.
+"""
+
+import argparse
+import logging
+
+from src.patterns import PARTITIONS, build_partition
+
+
+def main():
+    """Main driver of the pattern database build script."""
+    parser = argparse.ArgumentParser(
+        description="Build the pattern databases for the 15-Puzzle Solver."
+    )
+
+    parser.add_argument(
+        "partition",
+        type=str,
+        choices=list(PARTITIONS),
+        help="The disjoint partition of tiles to build tables for.",
+    )
+
+    parser.add_argument(
+        "directory",
+        type=str,
+        default="pdb",
+        nargs="?",
+        help="The directory to write the tables to.",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_const",
+        dest="logging_level",
+        const=logging.INFO,
+        help="Output verbose info logs to console.",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="store_const",
+        dest="logging_level",
+        const=logging.DEBUG,
+        help="Output all program debug logs to console.",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=args.logging_level)
+
+    build_partition(args.partition, args.directory)
+
+
+if __name__ == "__main__":
+    main()
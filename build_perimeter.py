@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+"""Module building the perimeter database of the states near the goal.
+
+The database is written once and then memory-mapped by every agent run.
+"""
+
+import argparse
+import logging
+import os
+
+from src.board import DEFAULT_LAYOUT, parse_size
+from src.perimeter import DEFAULT_PERIMETER_DEPTH, build_perimeter, perimeter_path
+
+
+def main():
+    """Main driver of the perimeter database build script."""
+    parser = argparse.ArgumentParser(
+        description="Build the perimeter database for the 15-Puzzle Solver."
+    )
+
+    parser.add_argument(
+        "depth",
+        type=int,
+        default=DEFAULT_PERIMETER_DEPTH,
+        nargs="?",
+        help="The most moves from the goal of a state stored.",
+    )
+
+    parser.add_argument(
+        "directory",
+        type=str,
+        default="pdb",
+        nargs="?",
+        help="The directory to write the database to.",
+    )
+
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        default=DEFAULT_LAYOUT,
+        metavar="ROWSxCOLS",
+        help="The size of the board, such as 3x3 or 5x5 (default: 4x4).",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_const",
+        dest="logging_level",
+        const=logging.INFO,
+        help="Output verbose info logs to console.",
+    )
+
+    parser.add_argument(
+        "-d",
+        "--debug",
+        action="store_const",
+        dest="logging_level",
+        const=logging.DEBUG,
+        help="Output all program debug logs to console.",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=args.logging_level)
+
+    os.makedirs(args.directory, exist_ok=True)
+    path = perimeter_path(args.directory, args.size)
+    sizes = build_perimeter(path, args.size, args.depth)
+    print(f"Wrote {sum(sizes)} states within {len(sizes) - 1} moves to {path}")
+
+
+if __name__ == "__main__":
+    main()
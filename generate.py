@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""Module generating random solvable boards for load testing and benchmarks.
+
+Boards are written to stdout or a file as matrix strings, one per line, or
+as packed binary records; see src/generator.py for the formats.
+"""
+
+import argparse
+import logging
+import math
+import sys
+
+from src.board import DEFAULT_LAYOUT, parse_size
+from src.generator import (
+    DEFAULT_WALK_LENGTH,
+    GENERATOR_MODES,
+    OUTPUT_FORMATS,
+    generate_boards,
+    write_binary,
+    write_text,
+)
+from src.heuristics import HEURISTICS
+
+
+def main():
+    """Main driver of the board generator script."""
+    parser = argparse.ArgumentParser(
+        description="Generate random solvable boards for the 15-Puzzle Solver."
+    )
+
+    parser.add_argument(
+        "count",
+        type=int,
+        help="The number of boards to generate.",
+    )
+
+    parser.add_argument(
+        "--mode",
+        type=str,
+        choices=GENERATOR_MODES,
+        default="uniform",
+        help="Draw uniformly from every solvable board (default) or walk "
+        "--length moves from the goal state without undoing a move.",
+    )
+
+    parser.add_argument(
+        "--length",
+        type=int,
+        default=DEFAULT_WALK_LENGTH,
+        help=f"The moves of every walk (default: {DEFAULT_WALK_LENGTH}).",
+    )
+
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="The seed making the boards reproducible.",
+    )
+
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        default=DEFAULT_LAYOUT,
+        metavar="ROWSxCOLS",
+        help="The size of the board, such as 3x3 or 5x5 (default: 4x4).",
+    )
+
+    parser.add_argument(
+        "--heuristic",
+        type=str,
+        choices=list(HEURISTICS),
+        default="manhattan",
+        help="The heuristic --min-h and --max-h apply to (default: manhattan).",
+    )
+
+    parser.add_argument(
+        "--min-h",
+        type=int,
+        default=None,
+        help="Keep only boards whose heuristic value is at least MIN_H.",
+    )
+
+    parser.add_argument(
+        "--max-h",
+        type=int,
+        default=None,
+        help="Keep only boards whose heuristic value is at most MAX_H.",
+    )
+
+    parser.add_argument(
+        "--min-distance",
+        type=int,
+        default=None,
+        help="Keep only boards whose shortest solution has at least this many "
+        "moves; every board is solved, so keep the range near the goal.",
+    )
+
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=None,
+        help="Keep only boards whose shortest solution has at most this many moves.",
+    )
+
+    parser.add_argument(
+        "--format",
+        type=str,
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Write matrix strings, one per line (default), or packed states "
+        "as big-endian binary records.",
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="-",
+        help="The file to write to (default: stdout).",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_const",
+        dest="logging_level",
+        const=logging.INFO,
+        help="Output verbose info logs to console.",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=args.logging_level)
+
+    heuristic_range = None
+    if args.min_h is not None or args.max_h is not None:
+        heuristic_range = (
+            0 if args.min_h is None else args.min_h,
+            math.inf if args.max_h is None else args.max_h,
+        )
+    distance_range = None
+    if args.min_distance is not None or args.max_distance is not None:
+        distance_range = (
+            0 if args.min_distance is None else args.min_distance,
+            math.inf if args.max_distance is None else args.max_distance,
+        )
+
+    try:
+        boards = generate_boards(
+            args.count,
+            args.size,
+            args.mode,
+            args.seed,
+            args.length,
+            args.heuristic,
+            heuristic_range,
+            distance_range,
+        )
+        if args.format == "text":
+            if args.output == "-":
+                count = write_text(boards, sys.stdout, args.size)
+            else:
+                with open(args.output, "w", encoding="utf-8") as file:
+                    count = write_text(boards, file, args.size)
+        elif args.output == "-":
+            count = write_binary(boards, sys.stdout.buffer, args.size)
+        else:
+            with open(args.output, "wb") as file:
+                count = write_binary(boards, file, args.size)
+    except AssertionError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    logging.info("Wrote %s boards", count)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
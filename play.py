@@ -9,8 +9,8 @@ the given starting input.
 import argparse
 import logging
 
-from src.board import Board
-from src.utils import convert_string_to_list, validate_list
+from src.board import DEFAULT_LAYOUT, Board, parse_size
+from src.utils import convert_string_to_list, is_solvable, validate_list
 
 
 def main():
@@ -25,6 +25,14 @@ def main():
         help="The starting state of the program able to create a 4x4 matrix.",
     )
 
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        default=DEFAULT_LAYOUT,
+        metavar="ROWSxCOLS",
+        help="The size of the board, such as 3x3 or 5x5 (default: 4x4).",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -49,12 +57,16 @@ def main():
     matrix_list = convert_string_to_list(args.matrix_string)
 
     try:
-        validate_list(matrix_list)
+        validate_list(matrix_list, args.size.rows, args.size.cols)
     except AssertionError as ae:
         print(ae)
         return -1
 
-    game_board = Board(matrix_list)
+    if not is_solvable(matrix_list, args.size.rows, args.size.cols):
+        print("The goal state cannot be reached from this board.")
+        return -1
+
+    game_board = Board(matrix_list, args.size)
 
     while not game_board.is_goal_state():
         print(game_board)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""Module running the 15-Puzzle Solver as a service.
+
+Requests are lines of JSON sent over TCP; see src/service.py for the format.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+from src.patterns import PARTITIONS
+from src.service import SolverService, serve
+
+
+def main():
+    """Main driver of the solver service script."""
+    parser = argparse.ArgumentParser(
+        description="Serve 15-Puzzle solve requests as lines of JSON over TCP."
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="The address to listen on.",
+    )
+
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="The port to listen on.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes (default: CPU count).",
+    )
+
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=None,
+        help="The most requests waiting for a worker before new ones are "
+        "refused as busy (default: 4 per worker).",
+    )
+
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Seconds a request may take unless it sets its own deadline.",
+    )
+
+    parser.add_argument(
+        "--preload",
+        type=str,
+        nargs="*",
+        choices=list(PARTITIONS),
+        default=[],
+        help="Pattern database heuristics every worker loads on start.",
+    )
+
+    parser.add_argument(
+        "--pdb-dir",
+        type=str,
+        default="pdb",
+        help="The directory holding tables built by build_patterns.py.",
+    )
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_const",
+        dest="logging_level",
+        const=logging.INFO,
+        help="Output verbose info logs to console.",
+    )
+
+    args = parser.parse_args()
+    logging.basicConfig(level=args.logging_level)
+
+    service = SolverService(
+        args.workers or os.cpu_count() or 1,
+        args.max_queue,
+        args.deadline,
+        args.preload,
+        args.pdb_dir,
+    )
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
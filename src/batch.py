@@ -0,0 +1,195 @@
+"""This module contains the batch solver which spreads many boards across a
+pool of worker processes.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, Optional, Set
+
+from src.board import Board, get_layout
+from src.patterns import PARTITIONS, load_pattern_heuristic
+from src.tree import Node, Tree
+from src.utils import convert_string_to_list, is_solvable, validate_list
+
+# Boards queued per worker so input can be streamed without reading it all.
+QUEUED_PER_WORKER = 4
+
+
+def _init_worker(heuristic: Optional[str], pdb_dir: str) -> None:
+    """Load the pattern tables once in every worker process.
+
+    Parameters:
+        heuristic (str): The heuristic used by the informed routines.
+        pdb_dir (str): The directory holding the pattern tables.
+    """
+    if heuristic in PARTITIONS:
+        load_pattern_heuristic(heuristic, pdb_dir)
+
+
+def solve_board(
+    index: int,
+    matrix_string: str,
+    routine: str,
+    heuristic: Optional[str] = None,
+    timeout: Optional[float] = None,
+    rows: int = 4,
+    cols: int = 4,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> Dict[str, Any]:
+    """Solve one board and describe the outcome.
+
+    Parameters:
+        index (int): The position of this board in the batch input.
+        matrix_string (str): The starting state of the board.
+        routine (str): The search routine to use.
+        heuristic (str): The heuristic used by the informed routines.
+        timeout (float): Seconds allowed for the search, enforced as the
+            Tree's time budget so that it also holds within an idastar or
+            iddfs iteration; None for no limit.
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
+        cancelled (Callable[[], bool]): Passed to the Tree as its
+            interrupt, so it is also checked within an idastar or iddfs
+            iteration; the search stops once it returns True.
+
+    Returns:
+        Dictionary with the index, board, status and, once solved, the
+        moves, expanded node count and time taken. The status is one of
+        "solved", "invalid", "unsolvable", "timeout", "cancelled" or
+        "failed". For arastar the moves are the best solution found before
+        the search finished or timed out.
+    """
+    result: Dict[str, Any] = {"index": index, "board": matrix_string}
+    matrix_list = convert_string_to_list(matrix_string)
+
+    try:
+        validate_list(matrix_list, rows, cols)
+    except AssertionError as ae:
+        result.update(status="invalid", error=str(ae))
+        return result
+
+    if not is_solvable(matrix_list, rows, cols):
+        result["status"] = "unsolvable"
+        return result
+
+    start = time.perf_counter()
+    board = Board(matrix_list, get_layout(rows, cols))
+    if board.is_goal_state():
+        result.update(status="solved", moves=[], expanded=0, time_ms=0)
+        return result
+
+    budget = None
+    if timeout is not None:
+        budget = max(0.0, timeout - (time.perf_counter() - start))
+
+    tree = None
+    try:
+        tree = Tree(
+            Node(board), routine, heuristic, time_budget=budget, interrupt=cancelled
+        )
+        # arastar keeps improving its solution until it is proven optimal
+        # or the time budget runs out; the other routines stop at a goal.
+        while not tree.finished:
+            if cancelled is not None and cancelled():
+                break
+            tree.expand()
+        if len(tree.goal_states) == 0:
+            status = "timeout"
+            if cancelled is not None and cancelled():
+                status = "cancelled"
+            result.update(status=status, expanded=tree.expand_count)
+            return result
+    except (AssertionError, IndexError) as error:
+        result.update(status="failed", error=str(error))
+        return result
+    finally:
+        # Abandoned searches leave no extbfs layer files behind.
+        if tree is not None:
+            tree.close()
+
+    result.update(
+        status="solved",
+        moves=tree.goal_states[-1].action_used,
+        expanded=tree.expand_count,
+        time_ms=round((time.perf_counter() - start) * 1000),
+    )
+    return result
+
+
+def solve_batch(
+    boards: Iterable[str],
+    routine: str,
+    heuristic: Optional[str] = None,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    ordered: bool = False,
+    pdb_dir: str = "pdb",
+    rows: int = 4,
+    cols: int = 4,
+) -> Iterator[Dict[str, Any]]:
+    """Solve many boards in parallel, yielding each result as it is ready.
+
+    Parameters:
+        boards (Iterable[str]): The starting states, one per item; blank
+            items are skipped. The iterable is consumed lazily.
+        routine (str): The search routine to use.
+        heuristic (str): The heuristic used by the informed routines.
+        workers (int): The number of worker processes; defaults to the
+            number of CPUs.
+        timeout (float): Seconds allowed for each board.
+        ordered (bool): Yield results in input order instead of completion
+            order.
+        pdb_dir (str): The directory holding the pattern tables.
+        rows (int): The number of rows of every board.
+        cols (int): The number of columns of every board.
+
+    Returns:
+        Iterator over the result dictionaries made by solve_board.
+    """
+    workers = workers or os.cpu_count() or 1
+    limit = workers * QUEUED_PER_WORKER
+
+    queued: Deque[Future] = deque()
+    running: Set[Future] = set()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(heuristic, pdb_dir)
+    ) as executor:
+        index = 0
+        for line in boards:
+            matrix_string = line.strip()
+            if not matrix_string:
+                continue
+
+            future = executor.submit(
+                solve_board,
+                index,
+                matrix_string,
+                routine,
+                heuristic,
+                timeout,
+                rows,
+                cols,
+            )
+            index += 1
+
+            if ordered:
+                queued.append(future)
+                if len(queued) >= limit:
+                    yield queued.popleft().result()
+                continue
+
+            running.add(future)
+            if len(running) >= limit:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for finished in done:
+                    yield finished.result()
+
+        while queued:
+            yield queued.popleft().result()
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for finished in done:
+                yield finished.result()
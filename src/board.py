@@ -1,13 +1,254 @@
 """This module contains the Board class structure and the goal state to reach."""
 
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
-GOAL_STATE = [
-    ["1", "2", "3", "4"],
-    ["5", "6", "7", "8"],
-    ["9", "10", "11", "12"],
-    ["13", "14", "15", "_"],
-]
+# The moves by integer code. A move and the move undoing it differ only in
+# the lowest bit, so the inverse of code is code ^ 1.
+MOVES = ("Up", "Down", "Left", "Right")
+UP, DOWN, LEFT, RIGHT = range(4)
+MOVE_CODES = {move.lower(): code for code, move in enumerate(MOVES)}
+
+# The move undoing each move.
+INVERSE_MOVES = {"Up": "Down", "Down": "Up", "Left": "Right", "Right": "Left"}
+
+
+def pack_state(matrix_list: List[str], tile_bits: int = 4) -> int:
+    """Pack a flat list of tiles into a single integer.
+
+    Parameters:
+        matrix_list (List[str]): Single list containing the board data.
+        tile_bits (int): The bits given to every tile.
+
+    Returns:
+        Integer holding tile_bits bits per tile, position 0 being the least
+        significant; the blank is stored as 0.
+    """
+    packed = 0
+    for index, elem in enumerate(matrix_list):
+        tile = 0 if elem == "_" else int(elem)
+        packed |= tile << (index * tile_bits)
+    return packed
+
+
+def unpack_state(packed: int, size: int = 16, tile_bits: int = 4) -> List[str]:
+    """Unpack an integer created by pack_state into a flat list of tiles.
+
+    Parameters:
+        packed (int): The packed board state.
+        size (int): The number of positions on the board.
+        tile_bits (int): The bits given to every tile.
+
+    Returns:
+        Single list containing the board data.
+    """
+    mask = (1 << tile_bits) - 1
+    tiles = []
+    for index in range(size):
+        tile = (packed >> (index * tile_bits)) & mask
+        tiles.append("_" if tile == 0 else str(tile))
+    return tiles
+
+
+def find_blank(packed: int, size: int = 16, tile_bits: int = 4) -> int:
+    """Find the blank of an integer created by pack_state.
+
+    Parameters:
+        packed (int): The packed board state.
+        size (int): The number of positions on the board.
+        tile_bits (int): The bits given to every tile.
+
+    Throws:
+        ValueError if the state has no blank.
+
+    Returns:
+        The flat index of the blank.
+    """
+    mask = (1 << tile_bits) - 1
+    for index in range(size):
+        if (packed >> (index * tile_bits)) & mask == 0:
+            return index
+    raise ValueError("State has no blank.")
+
+
+def slide(packed: int, blank: int, target: int, tile_bits: int = 4) -> int:
+    """Slide the tile at target into the blank at index blank.
+
+    Parameters:
+        packed (int): The packed board state.
+        blank (int): The flat index of the blank.
+        target (int): The flat index of the tile to slide.
+        tile_bits (int): The bits given to every tile.
+
+    Returns:
+        The packed state after the move; the blank now sits at target.
+    """
+    tile = (packed >> (target * tile_bits)) & ((1 << tile_bits) - 1)
+    return packed ^ (tile << (target * tile_bits)) ^ (tile << (blank * tile_bits))
+
+
+class Layout:
+    """Class holding the tables precomputed once for one board size.
+
+    Variables:
+        rows (int): The number of rows.
+        cols (int): The number of columns.
+        size (int): The number of positions, one of which is the blank.
+        tile_bits (int): The bits every tile takes in a packed state.
+        tile_mask (int): Mask selecting one tile of a packed state.
+        goal_state (List[List[str]]): The goal state, the blank being last.
+        goal_packed (int): The packed goal state.
+        goal_blank (int): The flat index of the blank in the goal state.
+        neighbors (Tuple[Tuple[Tuple[int, int], ...], ...]): For every blank
+            index, the (move code, target) pairs available in the order Up,
+            Down, Left, Right, where target is the flat index of the tile
+            that slides.
+        blank_moves (Tuple[Tuple[Tuple[str, int], ...], ...]): The same
+            table with the moves named.
+    """
+
+    def __init__(self, rows: int, cols: int) -> None:
+        """Default constructor for a Layout object; use get_layout to share
+        one Layout per size.
+
+        Parameters:
+            rows (int): The number of rows.
+            cols (int): The number of columns.
+
+        Throws:
+            AssertionError if the board is smaller than 2x2.
+        """
+        if rows < 2 or cols < 2:
+            raise AssertionError("Boards must have at least two rows and columns.")
+
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.tile_bits = max(1, (self.size - 1).bit_length())
+        self.tile_mask = (1 << self.tile_bits) - 1
+
+        goal_list = [str(tile) for tile in range(1, self.size)] + ["_"]
+        self.goal_state = [goal_list[x : x + cols] for x in range(0, self.size, cols)]
+        self.goal_packed = pack_state(goal_list, self.tile_bits)
+        self.goal_blank = self.size - 1
+        self.neighbors = tuple(self._moves_from(blank) for blank in range(self.size))
+        self.blank_moves = tuple(
+            tuple((MOVES[code], target) for code, target in moves)
+            for moves in self.neighbors
+        )
+
+    def __repr__(self) -> str:
+        """Return the size of this layout.
+
+        Returns:
+            String such as "Layout(4x4)".
+        """
+        return f"Layout({self.rows}x{self.cols})"
+
+    def _moves_from(self, blank: int) -> Tuple[Tuple[int, int], ...]:
+        """Build the moves available with the blank at the given index.
+
+        Parameters:
+            blank (int): The flat index of the blank.
+
+        Returns:
+            A tuple of (move code, target) pairs.
+        """
+        row, col = divmod(blank, self.cols)
+        moves = []
+
+        if row != self.rows - 1:
+            moves.append((UP, blank + self.cols))
+        if row != 0:
+            moves.append((DOWN, blank - self.cols))
+
+        if col != self.cols - 1:
+            moves.append((LEFT, blank + 1))
+        if col != 0:
+            moves.append((RIGHT, blank - 1))
+
+        return tuple(moves)
+
+    def pack(self, matrix_list: List[str]) -> int:
+        """Pack a flat list of tiles of this size.
+
+        Parameters:
+            matrix_list (List[str]): Single list containing the board data.
+
+        Returns:
+            The packed state.
+        """
+        return pack_state(matrix_list, self.tile_bits)
+
+    def unpack(self, packed: int) -> List[str]:
+        """Unpack a packed state of this size.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            Single list containing the board data.
+        """
+        return unpack_state(packed, self.size, self.tile_bits)
+
+
+@lru_cache(maxsize=None)
+def get_layout(rows: int = 4, cols: int = 4) -> Layout:
+    """Return the shared Layout of a board size.
+
+    Parameters:
+        rows (int): The number of rows.
+        cols (int): The number of columns.
+
+    Returns:
+        The Layout, built on first use.
+    """
+    return Layout(rows, cols)
+
+
+def parse_size(size: str) -> Layout:
+    """Parse a board size written as ROWSxCOLS, such as "3x3" or "5x5".
+
+    Parameters:
+        size (str): The size to parse.
+
+    Throws:
+        ValueError if the size is not written as ROWSxCOLS or is smaller
+        than 2x2.
+
+    Returns:
+        The Layout of that size.
+    """
+    rows, _, cols = size.lower().partition("x")
+    if not rows.isdigit() or not cols.isdigit():
+        raise ValueError(f"Invalid board size {size} (expected ROWSxCOLS).")
+    if int(rows) < 2 or int(cols) < 2:
+        raise ValueError(f"Invalid board size {size} (boards must be at least 2x2).")
+    return get_layout(int(rows), int(cols))
+
+
+# The standard 15-puzzle, used whenever no other size is requested.
+DEFAULT_LAYOUT = get_layout(4, 4)
+GOAL_STATE = DEFAULT_LAYOUT.goal_state
+GOAL_PACKED = DEFAULT_LAYOUT.goal_packed
+TILE_BITS = DEFAULT_LAYOUT.tile_bits
+TILE_MASK = DEFAULT_LAYOUT.tile_mask
+
+
+def get_blank_moves(
+    blank: int, layout: Layout = DEFAULT_LAYOUT
+) -> Tuple[Tuple[str, int], ...]:
+    """Return the moves available with the blank at the given index.
+
+    Parameters:
+        blank (int): The flat index of the blank.
+        layout (Layout): The size of the board.
+
+    Returns:
+        A tuple of (move, target) pairs in the order Up, Down, Left, Right,
+        where target is the flat index of the tile that slides.
+    """
+    return layout.blank_moves[blank]
 
 
 class Board:
@@ -16,29 +257,111 @@ class Board:
 
     Variables:
         current_state (List[List[str]]): The current state of this game.
+        packed (int): The current state packed into a single integer.
+        blank (int): The flat index of the blank space.
+        layout (Layout): The size of this board and its precomputed tables.
     """
 
-    def __init__(self, matrix_list: List[str]) -> None:
+    __slots__ = ("_packed", "_blank", "_layout")
+
+    def __init__(self, matrix_list: List[str], layout: Optional[Layout] = None) -> None:
         """The default constructor for a board object.
 
         Parameters:
             matrix_list (List[str]): Single list containing the board data.
-            The data is expected to contain the numbers 1-15 with a blank
-            space represented by "_" and will not be validated within
-            this class.
+            The data is expected to contain the numbers 1-15 (or up to
+            one less than the number of positions) with a blank space
+            represented by "_" and will not be validated within this class.
+            layout (Layout): The size of the board. Defaults to 4x4.
+        """
+        self._layout = DEFAULT_LAYOUT if layout is None else layout
+        self._packed = self._layout.pack(matrix_list)
+        self._blank = matrix_list.index("_") if "_" in matrix_list else -1
+
+    @classmethod
+    def from_packed(
+        cls, packed: int, blank: int, layout: Layout = DEFAULT_LAYOUT
+    ) -> "Board":
+        """Create a board directly from a packed state.
+
+        Parameters:
+            packed (int): The packed board state.
+            blank (int): The flat index of the blank in the packed state.
+            layout (Layout): The size of the board.
+
+        Returns:
+            A new Board holding the packed state.
+        """
+        board = cls.__new__(cls)
+        board._packed = packed
+        board._blank = blank
+        board._layout = layout
+        return board
+
+    def copy(self) -> "Board":
+        """Return an independent copy of this board.
+
+        Returns:
+            A new Board with the same state.
+        """
+        return Board.from_packed(self._packed, self._blank, self._layout)
+
+    @property
+    def layout(self) -> Layout:
+        """Get the size of this board and its precomputed tables.
+
+        Returns:
+            The shared Layout of this board's size.
+        """
+        return self._layout
+
+    @property
+    def packed(self) -> int:
+        """Get the packed representation of this board.
+
+        Returns:
+            Integer holding layout.tile_bits bits per tile.
+        """
+        return self._packed
+
+    @property
+    def blank(self) -> int:
+        """Get the flat index of the blank space.
+
+        Returns:
+            Index of the blank, counting along the rows from 0.
         """
-        self._current_state = [
-            matrix_list[x : x + 4] for x in range(0, len(matrix_list), 4)
-        ]
+        return self._blank
 
     @property
     def current_state(self) -> List[List[str]]:
         """Get the current state of this board.
 
         Returns:
-            Returns the 2d array representation of this board.
+            Returns the 2d array representation of this board. The list
+            is built from the packed state and edits to it are not kept.
+        """
+        tiles = self._layout.unpack(self._packed)
+        cols = self._layout.cols
+        return [tiles[x : x + cols] for x in range(0, len(tiles), cols)]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the states of two boards.
+
+        Returns:
+            True if both boards hold the same state; False otherwise.
         """
-        return self._current_state
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self._packed == other._packed and self._layout is other._layout
+
+    def __hash__(self) -> int:
+        """Hash this board by its packed state.
+
+        Returns:
+            The packed state.
+        """
+        return self._packed
 
     def __str__(self) -> str:
         """Return a formatted string representation of the current state.
@@ -46,7 +369,8 @@ class Board:
         Returns:
             String representation of the current state containing boarders.
         """
-        string = "|" + ("-" * 16) + "|\n"
+        border = "|" + ("-" * 4 * self._layout.cols) + "|\n"
+        string = border
 
         for rows in self.current_state:
             string += "|"
@@ -54,7 +378,7 @@ class Board:
                 string += f"{elem: <4}"
             string += "|\n"
 
-        string += "|" + ("-" * 16) + "|\n"
+        string += border
         return string
 
     def move(self, move: str) -> bool:
@@ -71,35 +395,25 @@ class Board:
         if move is None:
             return False
 
-        move = move.lower()
-        if move not in [action.lower() for action in self.get_valid_moves()]:
-            return False
+        code = MOVE_CODES.get(move.lower())
+        # Raises a ValueError when this board has no blank.
+        self.get_blank_spot()
+        for move_code, target in self._layout.neighbors[self._blank]:
+            if move_code == code:
+                self.slide_to(target)
+                return True
+
+        return False
 
-        row, col = self.get_blank_spot()
-
-        if move == "up":
-            self.current_state[row][col], self.current_state[row + 1][col] = (
-                self.current_state[row + 1][col],
-                self.current_state[row][col],
-            )
-        if move == "down":
-            self.current_state[row][col], self.current_state[row - 1][col] = (
-                self.current_state[row - 1][col],
-                self.current_state[row][col],
-            )
-
-        if move == "left":
-            self.current_state[row][col], self.current_state[row][col + 1] = (
-                self.current_state[row][col + 1],
-                self.current_state[row][col],
-            )
-        if move == "right":
-            self.current_state[row][col], self.current_state[row][col - 1] = (
-                self.current_state[row][col - 1],
-                self.current_state[row][col],
-            )
-
-        return True
+    def slide_to(self, target: int) -> None:
+        """Slide the tile at target into the blank without checking that
+        the two are neighbours; target should come from layout.neighbors.
+
+        Parameters:
+            target (int): The flat index of the tile to slide.
+        """
+        self._packed = slide(self._packed, self._blank, target, self._layout.tile_bits)
+        self._blank = target
 
     def get_valid_moves(self) -> Tuple[str, ...]:
         """Return the valid moves given the current state.
@@ -108,20 +422,9 @@ class Board:
             A tuple containing the valid moves. This will contain two or more
             directions the board can shift in the form of strings.
         """
-        row, col = self.get_blank_spot()
-        moves = []
-
-        if row != 3:
-            moves.append("Up")
-        if row != 0:
-            moves.append("Down")
-
-        if col != 3:
-            moves.append("Left")
-        if col != 0:
-            moves.append("Right")
-
-        return tuple(moves)
+        # Raises a ValueError when this board has no blank.
+        self.get_blank_spot()
+        return tuple(move for move, _ in self._layout.blank_moves[self._blank])
 
     def is_goal_state(self) -> bool:
         """Determine if the goal state has been reached.
@@ -130,11 +433,7 @@ class Board:
             True if the current state is equal to the goal state,
             False otherwise.
         """
-        for i, row in enumerate(self.current_state):
-            for j, elem in enumerate(row):
-                if elem != GOAL_STATE[i][j]:
-                    return False
-        return True
+        return self._packed == self._layout.goal_packed
 
     def get_blank_spot(self) -> Tuple[int, int]:
         """Get the location of the blank space.
@@ -145,8 +444,6 @@ class Board:
         Returns:
             Two-dimensional tuple containing the indices of the blank.
         """
-        for i, row in enumerate(self.current_state):
-            for j, elem in enumerate(row):
-                if elem == "_":
-                    return (i, j)
-        raise ValueError("No blank space found in this Board.")
+        if self._blank < 0:
+            raise ValueError("No blank space found in this Board.")
+        return divmod(self._blank, self._layout.cols)
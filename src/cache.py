@@ -0,0 +1,226 @@
+"""This module contains the persistent solution cache shared by solver runs.
+
+Solutions are stored in SQLite keyed by the board size and the packed state.
+Triggers keep a running count of the entries, so eviction never has to
+count the table.
+Reflecting a square board in its main diagonal keeps the goal state fixed, so
+a board and its reflection share one entry: the smaller of the two packed
+states is stored and the moves are reflected on the way in and out.
+"""
+
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+
+from src.board import MOVES, Board, Layout
+
+# The most entries kept before the least recently used are evicted.
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Seconds between updates of an entry's last use, so most hits only read.
+TOUCH_INTERVAL = 60.0
+
+# Seconds a process waits for another process holding the write lock.
+LOCK_TIMEOUT = 30.0
+
+# A move reflected in the main diagonal: rows become columns.
+_REFLECTED_MOVES = {"Up": "Left", "Down": "Right", "Left": "Up", "Right": "Down"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    state BLOB NOT NULL,
+    moves TEXT NOT NULL,
+    optimal INTEGER NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (rows, cols, state)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used);
+CREATE TABLE IF NOT EXISTS entry_count (entries INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS solutions_added AFTER INSERT ON solutions
+BEGIN
+    UPDATE entry_count SET entries = entries + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS solutions_removed AFTER DELETE ON solutions
+BEGIN
+    UPDATE entry_count SET entries = entries - 1;
+END;
+INSERT INTO entry_count
+SELECT COUNT(*) FROM solutions WHERE NOT EXISTS (SELECT 1 FROM entry_count);
+"""
+
+
+def reflect_state(packed: int, layout: Layout) -> int:
+    """Reflect a packed state of a square board in its main diagonal.
+
+    Parameters:
+        packed (int): The packed board state.
+        layout (Layout): The size of the board, which must be square.
+
+    Returns:
+        The packed reflected state, relabelled so the goal state maps to
+        itself.
+    """
+    side = layout.cols
+    bits = layout.tile_bits
+    reflected = 0
+    for pos in range(layout.size):
+        tile = (packed >> (pos * bits)) & layout.tile_mask
+        if tile:
+            home = tile - 1
+            tile = (home % side) * side + home // side + 1
+        row, col = divmod(pos, side)
+        reflected |= tile << ((col * side + row) * bits)
+    return reflected
+
+
+def _encode(packed: int, layout: Layout) -> bytes:
+    """Encode a packed state as a key for the database.
+
+    Parameters:
+        packed (int): The packed board state.
+        layout (Layout): The size of the board.
+
+    Returns:
+        The state as little-endian bytes.
+    """
+    return packed.to_bytes((layout.size * layout.tile_bits + 7) // 8, "little")
+
+
+class SolutionCache:
+    """Class storing solved boards in an SQLite database shared by every
+    process using the same file. Writers wait for each other through
+    SQLite's locking and readers never block in write-ahead log mode.
+
+    Variables:
+        path (str): The database file.
+        max_entries (int): The most entries kept.
+        hits (int): The lookups answered by this object.
+        misses (int): The lookups this object could not answer.
+    """
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Default constructor for a SolutionCache object. The database is
+        created if it does not exist.
+
+        Parameters:
+            path (str): The database file.
+            max_entries (int): The most entries kept before the least
+                recently used are evicted.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        """Return the number of entries.
+
+        Returns:
+            The number of stored solutions, from the running count.
+        """
+        return self._connection.execute("SELECT entries FROM entry_count").fetchone()[0]
+
+    @staticmethod
+    def _key(board: Board) -> Tuple[Tuple[int, int, bytes], bool]:
+        """Find the database key of a board.
+
+        Parameters:
+            board (Board): The board to look up.
+
+        Returns:
+            The key and whether it belongs to the board's reflection.
+        """
+        layout = board.layout
+        packed = board.packed
+        reflected = False
+        if layout.rows == layout.cols:
+            mirror = reflect_state(packed, layout)
+            if mirror < packed:
+                packed = mirror
+                reflected = True
+        return (layout.rows, layout.cols, _encode(packed, layout)), reflected
+
+    def get(self, board: Board, optimal: bool = False) -> Optional[List[str]]:
+        """Look up the solution of a board.
+
+        Parameters:
+            board (Board): The starting state.
+            optimal (bool): Only accept a solution known to be shortest.
+
+        Returns:
+            The moves solving the board; None if none is stored.
+        """
+        key, reflected = self._key(board)
+        row = self._connection.execute(
+            "SELECT moves, optimal, used FROM solutions "
+            "WHERE rows = ? AND cols = ? AND state = ?",
+            key,
+        ).fetchone()
+        if row is None or (optimal and not row[1]):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        now = time.time()
+        if now - row[2] > TOUCH_INTERVAL:
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE solutions SET used = ? "
+                    "WHERE rows = ? AND cols = ? AND state = ?",
+                    (now,) + key,
+                )
+
+        moves = [MOVES["UDLR".index(letter)] for letter in row[0]]
+        if reflected:
+            moves = [_REFLECTED_MOVES[move] for move in moves]
+        return moves
+
+    def put(self, board: Board, moves: List[str], optimal: bool = False) -> None:
+        """Store the solution of a board. An entry is only replaced by an
+        optimal solution or a shorter one.
+
+        Parameters:
+            board (Board): The starting state.
+            moves (List[str]): The moves solving the board.
+            optimal (bool): Whether the solution is known to be shortest.
+        """
+        key, reflected = self._key(board)
+        if reflected:
+            moves = [_REFLECTED_MOVES[move] for move in moves]
+        letters = "".join(move[0] for move in moves)
+
+        with self._connection:
+            self._connection.execute(
+                "INSERT INTO solutions VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (rows, cols, state) DO UPDATE SET "
+                "moves = excluded.moves, optimal = excluded.optimal, "
+                "used = excluded.used "
+                "WHERE excluded.optimal > solutions.optimal "
+                "OR (excluded.optimal = solutions.optimal "
+                "AND length(excluded.moves) < length(solutions.moves))",
+                key + (letters, int(optimal), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries beyond max_entries. Runs
+        inside the transaction of put."""
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM solutions WHERE (rows, cols, state) IN "
+                "(SELECT rows, cols, state FROM solutions ORDER BY used LIMIT ?)",
+                (excess,),
+            )
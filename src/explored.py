@@ -0,0 +1,331 @@
+"""This module contains the explored sets a Tree can record the packed
+states it has seen in.
+
+Every explored set supports add, in, len and clear, like the built-in set
+that is used by default. The built-in set is the fastest but stores each state as
+a Python int in a hash table, roughly 60 bytes per state on 64-bit builds.
+The other backends trade speed for memory:
+
+- "hash" is an open-addressing hash table over an array of 64-bit words,
+  11 to 22 bytes per state, for boards whose packed states fit in 64 bits;
+  10^8 states of the 15-puzzle take 1 GiB.
+- "rank" is a bitset indexed by the rank of every board's permutation, a
+  perfect hash taking one bit per possible board. It suits exhaustive work
+  on boards of up to 12 cells, such as the 3x3 and 3x4 puzzles.
+- "bloom" is a Bloom filter of fixed size. Sized for BLOOM_CAPACITY states
+  at BLOOM_ERROR_RATE, it takes about 1.8 bytes per state. A false positive
+  reports an unseen state as seen, so the search skips it and may return a
+  longer solution or none; the rate stays near BLOOM_ERROR_RATE up to the
+  capacity and grows beyond it.
+"""
+
+import math
+from array import array
+from typing import Any, Set, Union
+
+from src.board import Layout
+
+# The explored set backends selectable by name.
+EXPLORED_SETS = ("set", "hash", "rank", "bloom")
+
+# The slots of a new hash table; it doubles when three quarters full.
+HASH_CAPACITY = 1 << 16
+
+# The largest rank bitset allocated, in bits.
+RANK_LIMIT = 1 << 32
+
+# The states a Bloom filter is sized for and its false-positive rate there.
+BLOOM_CAPACITY = 10**7
+BLOOM_ERROR_RATE = 0.001
+
+# Odd 64-bit constants mixing the bits of a packed state.
+_MIX = 0x9E3779B97F4A7C15
+_MIX_SECOND = 0xC2B2AE3D27D4EB4F
+_MASK = (1 << 64) - 1
+
+
+class HashExploredSet:
+    """Class storing packed states in an open-addressing hash table with
+    linear probing. Zero marks an empty slot, which no packed state equals
+    since every board holds a non-zero tile.
+
+    Variables:
+        layout (Layout): The size of the boards stored.
+    """
+
+    def __init__(self, layout: Layout, capacity: int = HASH_CAPACITY) -> None:
+        """Default constructor for a HashExploredSet object.
+
+        Parameters:
+            layout (Layout): The size of the boards stored.
+            capacity (int): The initial number of slots, a power of two.
+
+        Throws:
+            AssertionError if packed states of this size exceed 64 bits.
+        """
+        if layout.size * layout.tile_bits > 64:
+            raise AssertionError("Hash explored set needs states of at most 64 bits")
+        self.layout = layout
+        self._slots = array("Q", [0]) * capacity
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self._size = 0
+
+    def _find(self, packed: int) -> int:
+        """Find the slot holding a state, or the empty slot it would take.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            The index of the slot.
+        """
+        slots = self._slots
+        mask = len(slots) - 1
+        index = ((packed * _MIX) & _MASK) >> self._shift
+        while slots[index] and slots[index] != packed:
+            index = (index + 1) & mask
+        return index
+
+    def add(self, packed: int) -> None:
+        """Add a state to the table, doubling it once three quarters full.
+
+        Parameters:
+            packed (int): The packed state.
+        """
+        index = self._find(packed)
+        if self._slots[index]:
+            return
+        self._slots[index] = packed
+        self._size += 1
+        if self._size * 4 > len(self._slots) * 3:
+            self._grow()
+
+    def _grow(self) -> None:
+        """Double the number of slots and reinsert every state."""
+        old = self._slots
+        self._slots = array("Q", [0]) * (len(old) * 2)
+        self._shift -= 1
+        for packed in old:
+            if packed:
+                self._slots[self._find(packed)] = packed
+
+    def __contains__(self, packed: Any) -> bool:
+        """Return whether a state has been added.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            True if the table holds the state.
+        """
+        return self._slots[self._find(packed)] != 0
+
+    def __len__(self) -> int:
+        """Return the number of states added."""
+        return self._size
+
+    def clear(self) -> None:
+        """Remove every state, keeping the slots allocated."""
+        memoryview(self._slots).cast("B")[:] = bytes(len(self._slots) * 8)
+        self._size = 0
+
+
+class RankExploredSet:
+    """Class storing one bit for every permutation of the tiles, indexed by
+    the permutation's lexicographic rank.
+
+    Variables:
+        layout (Layout): The size of the boards stored.
+    """
+
+    def __init__(self, layout: Layout) -> None:
+        """Default constructor for a RankExploredSet object. The whole
+        bitset is allocated here.
+
+        Parameters:
+            layout (Layout): The size of the boards stored.
+
+        Throws:
+            AssertionError if the bitset would exceed RANK_LIMIT bits.
+        """
+        permutations = math.factorial(layout.size)
+        if permutations > RANK_LIMIT:
+            raise AssertionError("Rank explored set is too large for this board size")
+        self.layout = layout
+        self._bits = bytearray((permutations + 7) // 8)
+        self._factorials = [math.factorial(n) for n in range(layout.size)]
+        self._size = 0
+
+    def rank(self, packed: int) -> int:
+        """Compute the lexicographic rank of a state's permutation.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            Index in the range 0 to size! - 1, unique to the state.
+        """
+        bits = self.layout.tile_bits
+        mask = self.layout.tile_mask
+        factorials = self._factorials
+        used = 0
+        rank = 0
+        for pos in range(self.layout.size - 1):
+            tile = (packed >> (pos * bits)) & mask
+            # The tiles smaller than this one not placed before it.
+            smaller = tile - bin(used & ((1 << tile) - 1)).count("1")
+            rank += smaller * factorials[self.layout.size - 1 - pos]
+            used |= 1 << tile
+        return rank
+
+    def add(self, packed: int) -> None:
+        """Set the bit of a state.
+
+        Parameters:
+            packed (int): The packed state.
+        """
+        index, bit = divmod(self.rank(packed), 8)
+        if not self._bits[index] >> bit & 1:
+            self._bits[index] |= 1 << bit
+            self._size += 1
+
+    def __contains__(self, packed: Any) -> bool:
+        """Return whether the bit of a state is set.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            True if the state has been added.
+        """
+        index, bit = divmod(self.rank(packed), 8)
+        return bool(self._bits[index] >> bit & 1)
+
+    def __len__(self) -> int:
+        """Return the number of states added."""
+        return self._size
+
+    def clear(self) -> None:
+        """Unset every bit, keeping the bitset allocated."""
+        self._bits[:] = bytes(len(self._bits))
+        self._size = 0
+
+
+class BloomExploredSet:
+    """Class recording states in a Bloom filter. States added are always
+    reported as seen; unseen states are reported as seen at the false
+    positive rate.
+
+    Variables:
+        capacity (int): The number of states the filter is sized for.
+        error_rate (float): The false-positive rate at capacity.
+        hash_count (int): The bits set for every state.
+    """
+
+    def __init__(
+        self,
+        layout: Layout,
+        capacity: int = BLOOM_CAPACITY,
+        error_rate: float = BLOOM_ERROR_RATE,
+    ) -> None:
+        """Default constructor for a BloomExploredSet object. The filter is
+        allocated here at its optimal size, -capacity * ln(error_rate) /
+        ln(2)^2 bits.
+
+        Parameters:
+            layout (Layout): The size of the boards stored.
+            capacity (int): The number of states to size the filter for.
+            error_rate (float): The false-positive rate wanted at capacity.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self._bit_count / capacity * math.log(2)))
+        self._bits = bytearray((self._bit_count + 7) // 8)
+        self._size = 0
+
+    def _positions(self, packed: int) -> range:
+        """Compute the bits of a state by double hashing.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            The bit positions, one per hash function.
+        """
+        first = ((packed * _MIX) & _MASK) % self._bit_count
+        # An odd step visits distinct bits while it is coprime to the size.
+        second = ((packed * _MIX_SECOND) & _MASK) % self._bit_count | 1
+        return range(first, first + self.hash_count * second, second)
+
+    def add(self, packed: int) -> None:
+        """Set the bits of a state.
+
+        Parameters:
+            packed (int): The packed state.
+        """
+        bits = self._bits
+        count = self._bit_count
+        new = False
+        for position in self._positions(packed):
+            index, bit = divmod(position % count, 8)
+            if not bits[index] >> bit & 1:
+                bits[index] |= 1 << bit
+                new = True
+        if new:
+            self._size += 1
+
+    def __contains__(self, packed: Any) -> bool:
+        """Return whether every bit of a state is set.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            True if the state was added, or for a false positive.
+        """
+        bits = self._bits
+        count = self._bit_count
+        for position in self._positions(packed):
+            index, bit = divmod(position % count, 8)
+            if not bits[index] >> bit & 1:
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of states added, less those lost to false
+        positives."""
+        return self._size
+
+    def clear(self) -> None:
+        """Unset every bit, keeping the filter allocated."""
+        self._bits[:] = bytes(len(self._bits))
+        self._size = 0
+
+
+ExploredSet = Union[Set[int], HashExploredSet, RankExploredSet, BloomExploredSet]
+
+
+def new_explored_set(name: str, layout: Layout) -> ExploredSet:
+    """Create an empty explored set.
+
+    Parameters:
+        name (str): The backend, one of EXPLORED_SETS.
+        layout (Layout): The size of the boards stored.
+
+    Throws:
+        AssertionError if the backend has not been implemented or does not
+        support this board size.
+
+    Returns:
+        The explored set.
+    """
+    if name == "set":
+        return set()
+    if name == "hash":
+        return HashExploredSet(layout)
+    if name == "rank":
+        return RankExploredSet(layout)
+    if name == "bloom":
+        return BloomExploredSet(layout)
+    raise AssertionError("Explored set requested has not been implemented")
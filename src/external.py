@@ -0,0 +1,307 @@
+"""This module contains the external-memory breadth-first search, which keeps
+its layers on disk instead of in memory.
+
+Every depth layer is a file of packed states sorted in increasing order,
+each written big-endian in the same number of bytes. The children of a
+layer are sorted in memory-sized runs spilled to disk, the runs are merged,
+and children already held by the layer itself or the one before it are
+dropped by a streaming merge against those two files. This delayed
+duplicate detection needs no explored set: on a sliding puzzle every
+neighbour of a state lies one layer above or below it. Files are written
+through large buffers and read through mmap, so memory use stays bounded by
+the run size however deep the search goes.
+"""
+
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from src.board import Layout, find_blank, slide
+
+# The children sorted in memory before a run is spilled to disk.
+DEFAULT_BUFFER_STATES = 1 << 20
+
+# The buffer size of every file written.
+BUFFER_BYTES = 1 << 20
+
+
+def _difference(states: Iterable[int], excluded: Iterable[int]) -> Iterator[int]:
+    """Stream the distinct states of a sorted stream that a second sorted
+    stream does not hold.
+
+    Parameters:
+        states (Iterable[int]): States in increasing order, with repeats.
+        excluded (Iterable[int]): States to drop, in increasing order.
+
+    Returns:
+        Iterator of the remaining states in increasing order.
+    """
+    excluded = iter(excluded)
+    skip = next(excluded, None)
+    previous = None
+    for state in states:
+        if state == previous:
+            continue
+        previous = state
+        while skip is not None and skip < state:
+            skip = next(excluded, None)
+        if state != skip:
+            yield state
+
+
+class ExternalBFS:
+    """Class running a breadth-first search whose layers are sorted files.
+    Every step writes the next layer.
+
+    Variables:
+        layout (Layout): The size of the board searched.
+        directory (str): The directory holding the layer files.
+        depth (int): The number of moves made by the states of the current
+            layer.
+        layer_sizes (List[int]): The number of states of every layer, which
+            is the number of states at each distance from the root.
+    """
+
+    def __init__(
+        self,
+        packed: int,
+        layout: Layout,
+        directory: Optional[str] = None,
+        buffer_states: int = DEFAULT_BUFFER_STATES,
+    ) -> None:
+        """Default constructor for an ExternalBFS object. The root is written
+        as the first layer.
+
+        Parameters:
+            packed (int): The packed root state.
+            layout (Layout): The size of the board searched.
+            directory (str): The directory to write the layers to, created if
+                needed and kept by close; None for a temporary directory
+                removed by close.
+            buffer_states (int): The children sorted in memory before a run
+                is spilled to disk.
+        """
+        self.layout = layout
+        self.depth = 0
+        self.layer_sizes = [1]
+        self._buffer_states = buffer_states
+        self._width = (layout.size * layout.tile_bits + 7) // 8
+        self._temporary = directory is None
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="extbfs-")
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._write(self.layer_path(0), [packed])
+
+    def __len__(self) -> int:
+        """Return the number of states in the current layer.
+
+        Returns:
+            The size of the current layer.
+        """
+        return self.layer_sizes[-1]
+
+    def layer_path(self, depth: int) -> str:
+        """Return the file path a layer is stored at.
+
+        Parameters:
+            depth (int): The depth of the layer.
+
+        Returns:
+            Path of the layer file.
+        """
+        return os.path.join(self.directory, f"layer-{depth:03d}.bin")
+
+    def step(self) -> Tuple[Optional[List[Tuple[int, int]]], int, int, int]:
+        """Expand every state of the current layer and write the children not
+        held by it or the layer before it as the next layer.
+
+        Throws:
+            IndexError if the current layer has no new children.
+
+        Returns:
+            The solution as (move code, target) pairs if the next layer holds
+            the goal state, otherwise None, then the states expanded,
+            generated and rejected as duplicates.
+        """
+        runs = []
+        buffer: List[int] = []
+        generated = 0
+        for packed in self._read(self.layer_path(self.depth)):
+            blank = find_blank(packed, self.layout.size, self.layout.tile_bits)
+            for _, target in self.layout.neighbors[blank]:
+                buffer.append(slide(packed, blank, target, self.layout.tile_bits))
+            if len(buffer) >= self._buffer_states:
+                generated += len(buffer)
+                runs.append(self._spill(buffer, len(runs)))
+                buffer = []
+        generated += len(buffer)
+        runs.append(self._spill(buffer, len(runs)))
+
+        excluded = [self._read(self.layer_path(self.depth))]
+        if self.depth > 0:
+            excluded.append(self._read(self.layer_path(self.depth - 1)))
+        children = heapq.merge(*(self._read(run) for run in runs))
+        fresh = _difference(children, heapq.merge(*excluded))
+
+        found = False
+        goal = self.layout.goal_packed
+
+        def watch(states: Iterable[int]) -> Iterator[int]:
+            nonlocal found
+            for state in states:
+                if state == goal:
+                    found = True
+                yield state
+
+        size = self._write(self.layer_path(self.depth + 1), watch(fresh))
+        for run in runs:
+            os.remove(run)
+
+        expanded = self.layer_sizes[-1]
+        if size == 0:
+            os.remove(self.layer_path(self.depth + 1))
+            raise IndexError("No solution found.")
+        self.depth += 1
+        self.layer_sizes.append(size)
+        duplicates = generated - size
+        path = self._path(goal) if found else None
+        return path, expanded, generated, duplicates
+
+    def read_layer(self, depth: int) -> Iterator[int]:
+        """Stream the states of a layer written so far.
+
+        Parameters:
+            depth (int): The depth of the layer.
+
+        Returns:
+            Iterator of the layer's packed states in increasing order.
+        """
+        return self._read(self.layer_path(depth))
+
+    def distance(self, packed: int) -> Optional[int]:
+        """Look a state up in the layers written so far.
+
+        Parameters:
+            packed (int): The packed state.
+
+        Returns:
+            The number of moves from the root to the state, or None if no
+            layer holds it.
+        """
+        for depth in range(self.depth + 1):
+            if self._contains(self.layer_path(depth), packed):
+                return depth
+        return None
+
+    def close(self) -> None:
+        """Remove the layer files if they were written to a temporary
+        directory."""
+        if self._temporary:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, packed: int) -> List[Tuple[int, int]]:
+        """Walk back from a state of the current layer to the root, finding
+        a parent of every state in the layer before it.
+
+        Parameters:
+            packed (int): A state of the current layer.
+
+        Returns:
+            The (move code, target) pairs leading from the root to the state.
+        """
+        path = []
+        for depth in reversed(range(self.depth)):
+            blank = find_blank(packed, self.layout.size, self.layout.tile_bits)
+            for _, target in self.layout.neighbors[blank]:
+                parent = slide(packed, blank, target, self.layout.tile_bits)
+                if self._contains(self.layer_path(depth), parent):
+                    break
+            # The move from the parent slides the tile at blank into target.
+            for code, moved in self.layout.neighbors[target]:
+                if moved == blank:
+                    path.append((code, blank))
+            packed = parent
+        path.reverse()
+        return path
+
+    def _spill(self, buffer: List[int], index: int) -> str:
+        """Sort a buffer of children and write it as a run.
+
+        Parameters:
+            buffer (List[int]): The children generated since the last run.
+            index (int): The number of runs written for this layer.
+
+        Returns:
+            Path of the run file.
+        """
+        path = os.path.join(self.directory, f"run-{self.depth + 1:03d}-{index}.bin")
+        self._write(path, sorted(set(buffer)))
+        return path
+
+    def _write(self, path: str, states: Iterable[int]) -> int:
+        """Write packed states to a file in the given order.
+
+        Parameters:
+            path (str): The file to write.
+            states (Iterable[int]): The states to write.
+
+        Returns:
+            The number of states written.
+        """
+        width = self._width
+        count = 0
+        with open(path, "wb", buffering=BUFFER_BYTES) as file:
+            for state in states:
+                file.write(state.to_bytes(width, "big"))
+                count += 1
+        return count
+
+    def _read(self, path: str) -> Iterator[int]:
+        """Stream the packed states of a file through mmap.
+
+        Parameters:
+            path (str): The file to read.
+
+        Returns:
+            Iterator of the states in file order.
+        """
+        width = self._width
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as states:
+                for offset in range(0, len(states), width):
+                    yield int.from_bytes(states[offset : offset + width], "big")
+
+    def _contains(self, path: str, packed: int) -> bool:
+        """Binary search a sorted file for a state.
+
+        Parameters:
+            path (str): The sorted file to search.
+            packed (int): The packed state.
+
+        Returns:
+            True if the file holds the state.
+        """
+        width = self._width
+        key = packed.to_bytes(width, "big")
+        with open(path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            if size == 0:
+                return False
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as states:
+                low, high = 0, size // width
+                while low < high:
+                    middle = (low + high) // 2
+                    offset = middle * width
+                    if states[offset : offset + width] < key:
+                        low = middle + 1
+                    else:
+                        high = middle
+                offset = low * width
+                return states[offset : offset + width] == key
@@ -0,0 +1,267 @@
+"""This module contains the frontiers holding the nodes waiting to be
+expanded by a Tree.
+
+Every frontier has the same interface. Items are put with an optional
+priority and tie-breaking value, lowest first; frontiers that ignore them
+return items in first-in first-out or last-in first-out order. Unlike the
+thread-safe classes of the queue module none of them takes a lock, and the
+priority frontiers never compare the items themselves.
+"""
+
+import abc
+import heapq
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Tuple, Type
+
+
+class Frontier(abc.ABC):
+    """Class describing the interface shared by every frontier."""
+
+    @abc.abstractmethod
+    def put(self, item: Any, priority: float = 0, tie: float = 0) -> None:
+        """Add an item to the frontier.
+
+        Parameters:
+            item (Any): The item, usually a Node.
+            priority (float): The priority of the item; lower comes first.
+            tie (float): Orders items of equal priority; lower comes first,
+                then the most recently added.
+        """
+
+    @abc.abstractmethod
+    def get(self) -> Any:
+        """Remove the next item from the frontier.
+
+        Throws:
+            IndexError if the frontier is empty.
+
+        Returns:
+            The next item.
+        """
+
+    @abc.abstractmethod
+    def peek(self) -> Any:
+        """Return the next item without removing it.
+
+        Throws:
+            IndexError if the frontier is empty.
+
+        Returns:
+            The item get would return.
+        """
+
+    def min_priority(self) -> float:
+        """Return the priority of the next item.
+
+        Returns:
+            The lowest priority waiting; infinity if the frontier is empty.
+        """
+        return 0 if self.qsize() else math.inf
+
+    def qsize(self) -> int:
+        """Return the number of items, as the queue module does.
+
+        Returns:
+            The number of items waiting.
+        """
+        return len(self)
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Return the number of items.
+
+        Returns:
+            The number of items waiting.
+        """
+
+    @abc.abstractmethod
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items in no particular order.
+
+        Returns:
+            Iterator of the items waiting.
+        """
+
+
+class FifoFrontier(Frontier):
+    """Class returning items in the order they were added; priorities are
+    ignored."""
+
+    def __init__(self) -> None:
+        """Default constructor for a FifoFrontier object."""
+        self._items: Deque[Any] = deque()
+
+    def put(self, item: Any, priority: float = 0, tie: float = 0) -> None:
+        """Add an item after every other item."""
+        self._items.append(item)
+
+    def get(self) -> Any:
+        """Remove the oldest item."""
+        return self._items.popleft()
+
+    def peek(self) -> Any:
+        """Return the oldest item."""
+        return self._items[0]
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items in no particular order."""
+        return iter(self._items)
+
+
+class LifoFrontier(Frontier):
+    """Class returning the most recently added item first; priorities are
+    ignored."""
+
+    def __init__(self) -> None:
+        """Default constructor for a LifoFrontier object."""
+        self._items: List[Any] = []
+
+    def put(self, item: Any, priority: float = 0, tie: float = 0) -> None:
+        """Add an item before every other item."""
+        self._items.append(item)
+
+    def get(self) -> Any:
+        """Remove the newest item."""
+        return self._items.pop()
+
+    def peek(self) -> Any:
+        """Return the newest item."""
+        return self._items[-1]
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items in no particular order."""
+        return iter(self._items)
+
+
+class HeapFrontier(Frontier):
+    """Class returning items by priority from a binary heap. Any numbers can
+    be priorities; every operation takes logarithmic time."""
+
+    def __init__(self) -> None:
+        """Default constructor for a HeapFrontier object."""
+        self._heap: List[Tuple[float, float, int, Any]] = []
+        # Decreasing insertion counter: newer items win ties and the items
+        # themselves are never compared.
+        self._counter = 0
+
+    def put(self, item: Any, priority: float = 0, tie: float = 0) -> None:
+        """Push an item onto the heap."""
+        self._counter -= 1
+        heapq.heappush(self._heap, (priority, tie, self._counter, item))
+
+    def get(self) -> Any:
+        """Pop the item with the lowest priority."""
+        return heapq.heappop(self._heap)[-1]
+
+    def peek(self) -> Any:
+        """Return the item with the lowest priority."""
+        return self._heap[0][-1]
+
+    def min_priority(self) -> float:
+        """Return the priority at the top of the heap."""
+        return self._heap[0][0] if self._heap else math.inf
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._heap)
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items in no particular order."""
+        return (entry[-1] for entry in self._heap)
+
+
+class BucketFrontier(Frontier):
+    """Class returning items by priority from a two-level bucket queue, one
+    list per priority and tie value. Priorities and tie values must be small
+    non-negative integers, such as the f-cost and heuristic value of a
+    node. Adding takes constant time and removing takes time proportional
+    to the buckets skipped, which stays small because the lowest priority
+    rarely decreases.
+    """
+
+    def __init__(self) -> None:
+        """Default constructor for a BucketFrontier object."""
+        self._buckets: List[List[List[Any]]] = []
+        self._counts: List[int] = []
+        self._size = 0
+        # No bucket below this priority holds an item.
+        self._minimum = 0
+
+    def put(self, item: Any, priority: float = 0, tie: float = 0) -> None:
+        """Append an item to the bucket of its priority and tie value."""
+        while len(self._buckets) <= priority:
+            self._buckets.append([])
+            self._counts.append(0)
+        ties = self._buckets[priority]
+        while len(ties) <= tie:
+            ties.append([])
+        ties[tie].append(item)
+        self._counts[priority] += 1
+        self._size += 1
+        if priority < self._minimum:
+            self._minimum = priority
+
+    def _lowest(self) -> List[Any]:
+        """Find the bucket holding the next item.
+
+        Throws:
+            IndexError if the frontier is empty.
+
+        Returns:
+            The non-empty list of the lowest priority and tie value.
+        """
+        if self._size == 0:
+            raise IndexError("get from an empty frontier")
+        counts = self._counts
+        priority = self._minimum
+        while counts[priority] == 0:
+            priority += 1
+        self._minimum = priority
+        for items in self._buckets[priority]:
+            if items:
+                return items
+        raise AssertionError("Bucket counts are out of step with the buckets")
+
+    def get(self) -> Any:
+        """Remove the newest item of the lowest bucket."""
+        items = self._lowest()
+        self._counts[self._minimum] -= 1
+        self._size -= 1
+        return items.pop()
+
+    def peek(self) -> Any:
+        """Return the newest item of the lowest bucket."""
+        return self._lowest()[-1]
+
+    def min_priority(self) -> float:
+        """Return the priority of the lowest non-empty bucket."""
+        if self._size == 0:
+            return math.inf
+        self._lowest()
+        return self._minimum
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over the items in no particular order."""
+        return (item for ties in self._buckets for items in ties for item in items)
+
+
+# The frontiers selectable by name.
+FRONTIERS: Dict[str, Type[Frontier]] = {
+    "fifo": FifoFrontier,
+    "lifo": LifoFrontier,
+    "heap": HeapFrontier,
+    "bucket": BucketFrontier,
+}
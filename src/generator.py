@@ -0,0 +1,253 @@
+"""This module contains the generator of random solvable boards used for
+load testing and benchmarks.
+
+Boards are drawn either uniformly from every solvable board of a size or by
+walking a fixed number of moves away from the goal state without undoing
+the previous move, and can be kept only when a heuristic value or the
+optimal solution length falls in a range. Every run is reproducible from
+its seed. Boards are produced as packed states and written either as
+matrix strings, one per line, or as packed binary records.
+"""
+
+import random
+from functools import lru_cache
+from typing import BinaryIO, Iterator, Optional, TextIO, Tuple
+
+from src.board import DEFAULT_LAYOUT, Board, Layout
+from src.heuristics import get_heuristic
+from src.tree import Node, Tree
+from src.utils import is_solvable_permutation
+
+# The ways boards can be drawn.
+GENERATOR_MODES = ("uniform", "walk")
+
+# The ways boards can be written.
+OUTPUT_FORMATS = ("text", "binary")
+
+# The moves of a walk unless another length is given.
+DEFAULT_WALK_LENGTH = 40
+
+
+def random_solvable(rng: random.Random, layout: Layout = DEFAULT_LAYOUT) -> int:
+    """Draw a board uniformly from every solvable board of a size. A random
+    permutation is drawn and, when it cannot reach the goal, two tiles are
+    swapped, which pairs every unsolvable board with one solvable board.
+
+    Parameters:
+        rng (random.Random): The source of randomness.
+        layout (Layout): The size of the board.
+
+    Returns:
+        The packed state.
+    """
+    tiles = list(range(layout.size))
+    rng.shuffle(tiles)
+    if not is_solvable_permutation(tiles, layout.rows, layout.cols):
+        first, second = [pos for pos, tile in enumerate(tiles) if tile != 0][:2]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+
+    packed = 0
+    for pos, tile in enumerate(tiles):
+        packed |= tile << (pos * layout.tile_bits)
+    return packed
+
+
+@lru_cache(maxsize=None)
+def get_walk_moves(layout: Layout) -> Tuple[Tuple[Tuple[int, int], ...], ...]:
+    """Return the moves a walk may make, indexed by blank * 5 + the code of
+    the previous move, or blank * 5 + 4 before the first move.
+
+    Parameters:
+        layout (Layout): The size of the board.
+
+    Returns:
+        For every index, the (target, next index) pairs of the moves that do
+        not undo the previous one, where target is the flat index of the
+        tile that slides.
+    """
+    return tuple(
+        tuple(
+            (target, target * 5 + code)
+            for code, target in layout.neighbors[blank]
+            if code != previous ^ 1
+        )
+        for blank in range(layout.size)
+        for previous in range(5)
+    )
+
+
+def random_walk(
+    rng: random.Random, length: int, layout: Layout = DEFAULT_LAYOUT
+) -> int:
+    """Walk randomly away from the goal state without undoing the previous
+    move. The tiles are moved in a list and packed once the walk ends.
+
+    Parameters:
+        rng (random.Random): The source of randomness.
+        length (int): The number of moves in the walk.
+        layout (Layout): The size of the board.
+
+    Returns:
+        The packed state reached, at most length moves from the goal.
+    """
+    walk_moves = get_walk_moves(layout)
+    tiles = list(range(1, layout.size)) + [0]
+    blank = layout.goal_blank
+    index = blank * 5 + 4
+    for _ in range(length):
+        moves = walk_moves[index]
+        target, index = moves[int(rng.random() * len(moves))]
+        tiles[blank] = tiles[target]
+        blank = target
+    tiles[blank] = 0
+
+    packed = 0
+    for pos, tile in enumerate(tiles):
+        packed |= tile << (pos * layout.tile_bits)
+    return packed
+
+
+def optimal_distance(packed: int, layout: Layout = DEFAULT_LAYOUT) -> int:
+    """Find the length of a shortest solution with idastar.
+
+    Parameters:
+        packed (int): The packed state.
+        layout (Layout): The size of the board.
+
+    Returns:
+        The number of moves of a shortest solution.
+    """
+    if packed == layout.goal_packed:
+        return 0
+    board = Board(layout.unpack(packed), layout)
+    return Tree(Node(board), "idastar").run()[0].depth_count
+
+
+def generate_boards(
+    count: int,
+    layout: Layout = DEFAULT_LAYOUT,
+    mode: str = "uniform",
+    seed: Optional[int] = None,
+    length: int = DEFAULT_WALK_LENGTH,
+    heuristic: str = "manhattan",
+    heuristic_range: Optional[Tuple[int, int]] = None,
+    distance_range: Optional[Tuple[int, int]] = None,
+) -> Iterator[int]:
+    """Generate random solvable boards other than the goal state.
+
+    Parameters:
+        count (int): The number of boards to generate.
+        layout (Layout): The size of the boards.
+        mode (str): "uniform" to draw from every solvable board, or "walk"
+            to walk length moves from the goal state.
+        seed (int): The seed making the boards reproducible; None for a
+            different run every time.
+        length (int): The number of moves of every walk.
+        heuristic (str): The heuristic heuristic_range applies to.
+        heuristic_range (Tuple[int, int]): The lowest and highest heuristic
+            value of a board kept, if limited.
+        distance_range (Tuple[int, int]): The lowest and highest optimal
+            solution length of a board kept, if limited. Every candidate is
+            solved with idastar, so this is far slower than the other
+            filters. Candidates are drawn until count are kept, so a range
+            no board can reach never ends.
+
+    Throws:
+        AssertionError if the mode or heuristic has not been implemented,
+        or a walk is too short to leave the goal or reach the distance
+        range.
+
+    Returns:
+        Iterator of packed states.
+    """
+    if mode not in GENERATOR_MODES:
+        raise AssertionError("Generator mode requested has not been implemented")
+    if mode == "walk" and length < 1:
+        raise AssertionError("Walks are too short to leave the goal state")
+    if mode == "walk" and distance_range is not None and distance_range[0] > length:
+        raise AssertionError("Walks are too short to reach the distance range")
+    estimate = get_heuristic(heuristic, layout)
+    rng = random.Random(seed)
+
+    produced = 0
+    while produced < count:
+        if mode == "uniform":
+            packed = random_solvable(rng, layout)
+        else:
+            packed = random_walk(rng, length, layout)
+
+        if packed == layout.goal_packed:
+            continue
+        if heuristic_range is not None:
+            low, high = heuristic_range
+            if not low <= estimate(packed) <= high:
+                continue
+        if distance_range is not None:
+            low, high = distance_range
+            if not low <= optimal_distance(packed, layout) <= high:
+                continue
+        produced += 1
+        yield packed
+
+
+def format_board(packed: int, layout: Layout = DEFAULT_LAYOUT) -> str:
+    """Write a board as a matrix string, as agent.py reads it.
+
+    Parameters:
+        packed (int): The packed state.
+        layout (Layout): The size of the board.
+
+    Returns:
+        The tiles separated by spaces, the blank being "_".
+    """
+    return " ".join(layout.unpack(packed))
+
+
+def record_width(layout: Layout = DEFAULT_LAYOUT) -> int:
+    """Return the bytes of one packed binary record.
+
+    Parameters:
+        layout (Layout): The size of the boards.
+
+    Returns:
+        The bytes needed for a packed state of this size.
+    """
+    return (layout.size * layout.tile_bits + 7) // 8
+
+
+def write_text(boards: Iterator[int], file: TextIO, layout: Layout) -> int:
+    """Write boards as matrix strings, one per line.
+
+    Parameters:
+        boards (Iterator[int]): The packed states.
+        file (TextIO): The file to write to.
+        layout (Layout): The size of the boards.
+
+    Returns:
+        The number of boards written.
+    """
+    count = 0
+    for packed in boards:
+        file.write(format_board(packed, layout) + "\n")
+        count += 1
+    return count
+
+
+def write_binary(boards: Iterator[int], file: BinaryIO, layout: Layout) -> int:
+    """Write boards as packed binary records of record_width bytes, each the
+    packed state in big-endian order, as the layers of src.external.
+
+    Parameters:
+        boards (Iterator[int]): The packed states.
+        file (BinaryIO): The file to write to.
+        layout (Layout): The size of the boards.
+
+    Returns:
+        The number of boards written.
+    """
+    width = record_width(layout)
+    count = 0
+    for packed in boards:
+        file.write(packed.to_bytes(width, "big"))
+        count += 1
+    return count
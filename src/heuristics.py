@@ -0,0 +1,382 @@
+"""This module contains the heuristic functions used by the informed search
+routines. Every heuristic takes a packed board state and returns an estimate
+of the number of moves left to reach the goal state.
+"""
+
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+from src.board import DEFAULT_LAYOUT, Layout, slide
+
+
+class LayoutHeuristics:
+    """Class holding the heuristics of one board size together with the
+    tables they share, built once per Layout.
+
+    Variables:
+        layout (Layout): The size of the boards these heuristics estimate.
+        functions (Dict[str, Callable[[int], int]]): The heuristics by name.
+        deltas (Dict[str, Callable[[int, int, int], int]]): The incremental
+            form of the heuristics that have one, by name.
+    """
+
+    def __init__(self, layout: Layout) -> None:
+        """Default constructor for a LayoutHeuristics object.
+
+        Parameters:
+            layout (Layout): The size of the boards to estimate.
+        """
+        self.layout = layout
+        self._size = layout.size
+        self._bits = layout.tile_bits
+        self._mask = layout.tile_mask
+        self._goal = layout.goal_packed
+        self._manhattan = self.distance_table(layout.goal_packed)
+        # The tile every position holds in the goal state.
+        self._goal_tiles = [
+            (layout.goal_packed >> (pos * self._bits)) & self._mask
+            for pos in range(self._size)
+        ]
+
+        self.functions: Dict[str, Callable[[int], int]] = {
+            "misplaced": self.misplaced_tiles,
+            "manhattan": self.manhattan_distance,
+            "linear": self.manhattan_linear_conflict,
+        }
+        self.deltas: Dict[str, Callable[[int, int, int], int]] = {
+            "misplaced": self.misplaced_delta,
+            "manhattan": self.manhattan_delta,
+            "linear": self.linear_conflict_delta,
+        }
+
+    def distance_table(self, target: int) -> List[List[int]]:
+        """Build the Manhattan distance of every tile from every position to
+        its position in the target state. Tile 0 (the blank) never counts
+        towards the total.
+
+        Parameters:
+            target (int): The packed state the distances are measured to.
+
+        Returns:
+            Table indexed by tile and then by position.
+        """
+        cols = self.layout.cols
+        homes = [0] * self._size
+        for pos in range(self._size):
+            homes[(target >> (pos * self._bits)) & self._mask] = pos
+
+        return [
+            [
+                (
+                    abs(pos // cols - homes[tile] // cols)
+                    + abs(pos % cols - homes[tile] % cols)
+                    if tile
+                    else 0
+                )
+                for pos in range(self._size)
+            ]
+            for tile in range(self._size)
+        ]
+
+    def misplaced_tiles(self, packed: int) -> int:
+        """Count the tiles that are not in their goal position.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            Integer representing the number of misplaced tiles compared to
+            the goal state; the blank is counted as a tile, so the estimate
+            is not admissible.
+        """
+        diff = packed ^ self._goal
+        counter = 0
+        while diff:
+            if diff & self._mask:
+                counter += 1
+            diff >>= self._bits
+        return counter
+
+    def manhattan_distance(self, packed: int) -> int:
+        """Sum the grid distance of every tile from its goal position.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            Integer representing the total Manhattan distance of the board.
+        """
+        table = self._manhattan
+        bits = self._bits
+        mask = self._mask
+        distance = 0
+        for pos in range(self._size):
+            distance += table[(packed >> (pos * bits)) & mask][pos]
+        return distance
+
+    def manhattan_to(self, target: int) -> Callable[[int], int]:
+        """Build a Manhattan distance heuristic towards an arbitrary state,
+        as used by the backward half of a bidirectional search.
+
+        Parameters:
+            target (int): The packed state to estimate the distance to.
+
+        Returns:
+            Heuristic function of a packed state.
+        """
+        table = self.distance_table(target)
+        size = self._size
+        bits = self._bits
+        mask = self._mask
+
+        def heuristic(packed: int) -> int:
+            distance = 0
+            for pos in range(size):
+                distance += table[(packed >> (pos * bits)) & mask][pos]
+            return distance
+
+        return heuristic
+
+    def _row_conflicts(self, packed: int, row: int) -> int:
+        """Count the conflicting tiles of one row.
+
+        Parameters:
+            packed (int): The packed board state.
+            row (int): The row to inspect.
+
+        Returns:
+            Number of tiles that must leave the row.
+        """
+        cols = self.layout.cols
+        goals = []
+        for pos in range(row * cols, row * cols + cols):
+            tile = (packed >> (pos * self._bits)) & self._mask
+            if tile != 0 and (tile - 1) // cols == row:
+                goals.append((tile - 1) % cols)
+        return _line_conflicts(goals)
+
+    def _column_conflicts(self, packed: int, col: int) -> int:
+        """Count the conflicting tiles of one column.
+
+        Parameters:
+            packed (int): The packed board state.
+            col (int): The column to inspect.
+
+        Returns:
+            Number of tiles that must leave the column.
+        """
+        cols = self.layout.cols
+        goals = []
+        for pos in range(col, self._size, cols):
+            tile = (packed >> (pos * self._bits)) & self._mask
+            if tile != 0 and (tile - 1) % cols == col:
+                goals.append((tile - 1) // cols)
+        return _line_conflicts(goals)
+
+    def linear_conflict(self, packed: int) -> int:
+        """Calculate the extra moves forced by tiles blocking each other in
+        their goal row or column.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            Integer representing two moves for every tile that has to step
+            out of its line to let the others pass.
+        """
+        conflicts = 0
+        for row in range(self.layout.rows):
+            conflicts += self._row_conflicts(packed, row)
+        for col in range(self.layout.cols):
+            conflicts += self._column_conflicts(packed, col)
+        return 2 * conflicts
+
+    def manhattan_linear_conflict(self, packed: int) -> int:
+        """Combine Manhattan distance with linear conflicts. This heuristic
+        is admissible and is the default for the optimal routines.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            Integer estimate of the moves left to reach the goal state.
+        """
+        return self.manhattan_distance(packed) + self.linear_conflict(packed)
+
+    def misplaced_delta(self, packed: int, blank: int, target: int) -> int:
+        """Return the change in misplaced tiles when the tile at target
+        slides into the blank.
+
+        Parameters:
+            packed (int): The packed board state before the move.
+            blank (int): The flat index of the blank.
+            target (int): The flat index of the tile to slide.
+
+        Returns:
+            The heuristic value after the move minus the value before it.
+        """
+        goal_tiles = self._goal_tiles
+        tile = (packed >> (target * self._bits)) & self._mask
+        return (
+            (tile != goal_tiles[blank])
+            + (goal_tiles[target] != 0)
+            - (tile != goal_tiles[target])
+            - (goal_tiles[blank] != 0)
+        )
+
+    def manhattan_delta(self, packed: int, blank: int, target: int) -> int:
+        """Return the change in Manhattan distance when the tile at target
+        slides into the blank; only that tile's distance changes.
+
+        Parameters:
+            packed (int): The packed board state before the move.
+            blank (int): The flat index of the blank.
+            target (int): The flat index of the tile to slide.
+
+        Returns:
+            The heuristic value after the move minus the value before it.
+        """
+        distances = self._manhattan[(packed >> (target * self._bits)) & self._mask]
+        return distances[blank] - distances[target]
+
+    def linear_conflict_delta(self, packed: int, blank: int, target: int) -> int:
+        """Return the change in Manhattan distance plus linear conflicts
+        when the tile at target slides into the blank. A sideways move keeps
+        the order of its row, so only the two columns involved are
+        recounted, and an upward or downward move only changes its two rows.
+
+        Parameters:
+            packed (int): The packed board state before the move.
+            blank (int): The flat index of the blank.
+            target (int): The flat index of the tile to slide.
+
+        Returns:
+            The heuristic value after the move minus the value before it.
+        """
+        cols = self.layout.cols
+        moved = slide(packed, blank, target, self._bits)
+        if blank // cols == target // cols:
+            first, second = blank % cols, target % cols
+            count = self._column_conflicts
+        else:
+            first, second = blank // cols, target // cols
+            count = self._row_conflicts
+        before = count(packed, first) + count(packed, second)
+        after = count(moved, first) + count(moved, second)
+        return self.manhattan_delta(packed, blank, target) + 2 * (after - before)
+
+
+def _line_conflicts(goals: List[int]) -> int:
+    """Count the tiles that must leave a line for the rest to be in order.
+
+    Parameters:
+        goals (List[int]): Goal offsets of the tiles sitting in their goal
+            line, in the order they currently appear.
+
+    Returns:
+        Number of tiles outside the longest increasing run of goals.
+    """
+    if len(goals) < 2:
+        return 0
+
+    longest = [1] * len(goals)
+    for i in range(1, len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return len(goals) - max(longest)
+
+
+@lru_cache(maxsize=None)
+def get_layout_heuristics(layout: Layout) -> LayoutHeuristics:
+    """Return the shared heuristics of a board size.
+
+    Parameters:
+        layout (Layout): The size of the board.
+
+    Returns:
+        The LayoutHeuristics, built on first use.
+    """
+    return LayoutHeuristics(layout)
+
+
+_DEFAULT = get_layout_heuristics(DEFAULT_LAYOUT)
+
+# The heuristics of the standard 4x4 board.
+misplaced_tiles = _DEFAULT.functions["misplaced"]
+manhattan_distance = _DEFAULT.functions["manhattan"]
+linear_conflict = _DEFAULT.linear_conflict
+manhattan_linear_conflict = _DEFAULT.functions["linear"]
+
+
+def manhattan_to(target: int, layout: Optional[Layout] = None) -> Callable[[int], int]:
+    """Build a Manhattan distance heuristic towards an arbitrary state, as
+    used by the backward half of a bidirectional search.
+
+    Parameters:
+        target (int): The packed state to estimate the distance to.
+        layout (Layout): The size of the board; defaults to 4x4.
+
+    Returns:
+        Heuristic function of a packed state.
+    """
+    return get_layout_heuristics(layout or DEFAULT_LAYOUT).manhattan_to(target)
+
+
+# The 4x4 heuristics; pattern database heuristics are registered here too.
+HEURISTICS: Dict[str, Callable[[int], int]] = _DEFAULT.functions
+
+# Heuristics that can overestimate the moves left: misplaced counts the blank.
+INADMISSIBLE_HEURISTICS = ("misplaced",)
+
+# Heuristics that can be updated from the parent's value after one move.
+HEURISTIC_DELTAS: Dict[str, Callable[[int, int, int], int]] = _DEFAULT.deltas
+
+
+def get_heuristic_delta(
+    name: str, layout: Optional[Layout] = None
+) -> Optional[Callable[[int, int, int], int]]:
+    """Look up the incremental form of a heuristic by name.
+
+    Parameters:
+        name (str): The name of the heuristic.
+        layout (Layout): The size of the board; defaults to 4x4.
+
+    Returns:
+        Function of the packed state before a move, the blank index and the
+        index of the sliding tile giving the change in the heuristic; None
+        if the heuristic must be recalculated after every move.
+    """
+    return get_layout_heuristics(layout or DEFAULT_LAYOUT).deltas.get(name)
+
+
+def register_heuristic(name: str, heuristic: Callable[[int], int]) -> None:
+    """Make a 4x4 heuristic selectable by name, for example one backed by
+    pattern databases that must be loaded first.
+
+    Parameters:
+        name (str): The name to register the heuristic under.
+        heuristic (Callable[[int], int]): Function of a packed state.
+    """
+    HEURISTICS[name] = heuristic
+    HEURISTIC_DELTAS.pop(name, None)
+
+
+def get_heuristic(name: str, layout: Optional[Layout] = None) -> Callable[[int], int]:
+    """Look up a heuristic function by name.
+
+    Parameters:
+        name (str): The name of the heuristic, a key of HEURISTICS.
+        layout (Layout): The size of the board; defaults to 4x4. Registered
+            heuristics are only available for 4x4 boards.
+
+    Throws:
+        AssertionError if the heuristic has not been implemented.
+
+    Returns:
+        The heuristic function.
+    """
+    functions = get_layout_heuristics(layout or DEFAULT_LAYOUT).functions
+    if name not in functions:
+        raise AssertionError("Heuristic requested has not been implemented")
+    return functions[name]
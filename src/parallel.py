@@ -0,0 +1,395 @@
+"""This module contains the parallel form of the idastar routine.
+
+Every iteration expands the top of the search tree in the main process until
+there are several subtrees for every worker, then hands the subtrees to a
+process pool. Idle workers take the next waiting subtree, so uneven subtrees
+balance themselves. Once any worker reaches the goal within the bound, the
+others are told to stop and the waiting subtrees are cancelled.
+"""
+
+import logging
+import math
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from src.board import Layout, get_layout, slide
+from src.heuristics import HEURISTICS, get_heuristic, get_heuristic_delta
+from src.patterns import PARTITIONS, PatternHeuristic, load_pattern_heuristic
+from src.pruning import PRUNED, get_move_automaton
+
+# Returned once the goal state has been reached, as by Tree.
+FOUND = -1
+
+# Returned by a worker told to stop before finishing its subtree.
+STOPPED = -2
+
+# Subtrees prepared for every worker so that fast workers find more work.
+TASKS_PER_WORKER = 16
+
+# Expansions between checks of the stop signal.
+STOP_CHECK_INTERVAL = 1024
+
+# Seconds between checks of the interrupt while waiting on the workers.
+STOP_POLL_SECONDS = 0.1
+
+# A subtree root: packed state, blank index, depth, move pruning state,
+# heuristic value and the (move code, target) pairs leading to it.
+Task = Tuple[int, int, int, int, int, List[Tuple[int, int]]]
+
+# A subtree outcome: FOUND, STOPPED or the smallest f-cost over the bound,
+# the full path when found, and the nodes expanded and generated.
+Outcome = Tuple[float, List[Tuple[int, int]], int, int]
+
+
+class _Stopped(Exception):
+    """Raised inside a worker's search once the stop signal is set."""
+
+
+class SubtreeSearch:
+    """Class running the bounded depth-first search of single subtrees.
+
+    Variables:
+        layout (Layout): The size of the board searched.
+        expanded (int): The nodes expanded in the current subtree.
+        generated (int): The nodes generated in the current subtree.
+    """
+
+    def __init__(
+        self,
+        heuristic: Callable[[int], int],
+        delta: Optional[Callable[[int, int, int], int]],
+        layout: Layout,
+        stop: Any = None,
+    ) -> None:
+        """Default constructor for a SubtreeSearch object.
+
+        Parameters:
+            heuristic (Callable[[int], int]): The heuristic of a packed state.
+            delta (Callable): The incremental form of the heuristic, if any.
+            layout (Layout): The size of the board searched.
+            stop (multiprocessing.Event): Set when the search should stop.
+        """
+        self.layout = layout
+        self.expanded = 0
+        self.generated = 0
+        self._heuristic = heuristic
+        self._delta = delta
+        self._stop = stop
+        self._transitions = get_move_automaton().transitions
+        self._bound = 0
+
+    def run(self, task: Task, bound: int) -> Outcome:
+        """Search one subtree within a bound.
+
+        Parameters:
+            task (Task): The root of the subtree.
+            bound (int): The f-cost no path may exceed.
+
+        Returns:
+            The Outcome of the subtree.
+        """
+        packed, blank, depth, state, h_value, prefix = task
+        self.expanded = 0
+        self.generated = 0
+        self._bound = bound
+
+        path = list(prefix)
+        try:
+            result = self._search(packed, blank, depth, state, h_value, path)
+        except _Stopped:
+            return STOPPED, [], self.expanded, self.generated
+
+        return result, path if result == FOUND else [], self.expanded, self.generated
+
+    def _search(
+        self,
+        packed: int,
+        blank: int,
+        depth: int,
+        state: int,
+        h_value: int,
+        path: List[Tuple[int, int]],
+    ) -> float:
+        """Recursively search below a state within the bound, as
+        Tree._bounded_search does.
+
+        Parameters:
+            packed (int): The packed state to search from.
+            blank (int): The flat index of the blank in the state.
+            depth (int): The number of moves made to reach the state.
+            state (int): The move pruning machine's state for the moves made.
+            h_value (int): The heuristic value of the state.
+            path (List[Tuple[int, int]]): The moves made so far.
+
+        Throws:
+            _Stopped if the stop signal is set.
+
+        Returns:
+            FOUND if the goal was reached, otherwise the smallest f-cost that
+            exceeded the bound.
+        """
+        f_value = depth + h_value
+        if f_value > self._bound:
+            return f_value
+        if packed == self.layout.goal_packed:
+            return FOUND
+
+        self.expanded += 1
+        if (
+            self._stop is not None
+            and self.expanded % STOP_CHECK_INTERVAL == 0
+            and self._stop.is_set()
+        ):
+            raise _Stopped()
+
+        minimum = math.inf
+        transitions = self._transitions[state]
+        for code, target in self.layout.neighbors[blank]:
+            next_state = transitions[code]
+            if next_state == PRUNED:
+                continue
+
+            moved = slide(packed, blank, target, self.layout.tile_bits)
+            self.generated += 1
+            if self._delta is None:
+                new_h_value = self._heuristic(moved)
+            else:
+                new_h_value = h_value + self._delta(packed, blank, target)
+
+            path.append((code, target))
+            result = self._search(
+                moved, target, depth + 1, next_state, new_h_value, path
+            )
+            if result == FOUND:
+                return FOUND
+            minimum = min(minimum, result)
+            path.pop()
+
+        return minimum
+
+
+# The search of a worker process, made by _init_worker.
+_worker_search: Optional[SubtreeSearch] = None
+
+
+def _init_worker(
+    heuristic: str, rows: int, cols: int, pdb_dir: Optional[str], stop: Any
+) -> None:
+    """Prepare the heuristic and move tables once in every worker process.
+
+    Parameters:
+        heuristic (str): The name of the heuristic.
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
+        pdb_dir (str): The directory holding the pattern tables, if the
+            heuristic uses them.
+        stop (multiprocessing.Event): Set when the search should stop.
+    """
+    global _worker_search
+
+    if heuristic in PARTITIONS and pdb_dir is not None:
+        load_pattern_heuristic(heuristic, pdb_dir)
+    layout = get_layout(rows, cols)
+    _worker_search = SubtreeSearch(
+        get_heuristic(heuristic, layout),
+        get_heuristic_delta(heuristic, layout),
+        layout,
+        stop,
+    )
+
+
+def _run_task(task: Task, bound: int) -> Outcome:
+    """Search one subtree in a worker process.
+
+    Parameters:
+        task (Task): The root of the subtree.
+        bound (int): The f-cost no path may exceed.
+
+    Returns:
+        The Outcome of the subtree.
+    """
+    return _worker_search.run(task, bound)
+
+
+class ParallelIDAStar:
+    """Class spreading the iterations of idastar over a process pool. The
+    pool is started by the first iteration and kept until close is called.
+
+    Variables:
+        workers (int): The number of worker processes.
+        layout (Layout): The size of the board searched.
+        heuristic (str): The name of the heuristic.
+    """
+
+    def __init__(self, heuristic: str, layout: Layout, workers: int) -> None:
+        """Default constructor for a ParallelIDAStar object.
+
+        Parameters:
+            heuristic (str): The name of the heuristic, which must already be
+                available through get_heuristic.
+            layout (Layout): The size of the board searched.
+            workers (int): The number of worker processes.
+        """
+        self.workers = workers
+        self.layout = layout
+        self.heuristic = heuristic
+        self._heuristic = get_heuristic(heuristic, layout)
+        self._delta = get_heuristic_delta(heuristic, layout)
+        self._transitions = get_move_automaton().transitions
+        self._stop = multiprocessing.Event()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting it on first use.
+
+        Returns:
+            The ProcessPoolExecutor running the subtrees.
+        """
+        if self._executor is None:
+            # Workers load pattern tables from the directory they came from.
+            function = HEURISTICS.get(self.heuristic)
+            pdb_dir = None
+            if isinstance(function, PatternHeuristic):
+                pdb_dir = function.directory
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(
+                    self.heuristic,
+                    self.layout.rows,
+                    self.layout.cols,
+                    pdb_dir,
+                    self._stop,
+                ),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._stop.set()
+            self._executor.shutdown()
+            self._executor = None
+
+    def split(
+        self, packed: int, blank: int, h_value: int, bound: int
+    ) -> Tuple[float, List[Task], int, int]:
+        """Expand the top of the tree breadth-first until there are enough
+        subtrees for every worker.
+
+        Parameters:
+            packed (int): The packed root state.
+            blank (int): The flat index of the blank in the root state.
+            h_value (int): The heuristic value of the root state.
+            bound (int): The f-cost no path may exceed.
+
+        Returns:
+            The smallest f-cost over the bound met while splitting, or FOUND,
+            the subtree roots, and the nodes expanded and generated while
+            splitting; when FOUND the only task holds the path.
+        """
+        minimum = math.inf
+        expanded = generated = 0
+        tasks: List[Task] = [(packed, blank, 0, 0, h_value, [])]
+        target_count = self.workers * TASKS_PER_WORKER
+        while 0 < len(tasks) < target_count:
+            next_tasks: List[Task] = []
+            for task in tasks:
+                packed, blank, depth, state, h_value, path = task
+                if depth + h_value > bound:
+                    minimum = min(minimum, depth + h_value)
+                    continue
+                if packed == self.layout.goal_packed:
+                    return FOUND, [task], expanded, generated
+
+                expanded += 1
+                for code, target in self.layout.neighbors[blank]:
+                    next_state = self._transitions[state][code]
+                    if next_state == PRUNED:
+                        continue
+                    moved = slide(packed, blank, target, self.layout.tile_bits)
+                    if self._delta is None:
+                        new_h_value = self._heuristic(moved)
+                    else:
+                        new_h_value = h_value + self._delta(packed, blank, target)
+                    generated += 1
+                    next_tasks.append(
+                        (
+                            moved,
+                            target,
+                            depth + 1,
+                            next_state,
+                            new_h_value,
+                            path + [(code, target)],
+                        )
+                    )
+            tasks = next_tasks
+
+        return minimum, tasks, expanded, generated
+
+    def iterate(
+        self,
+        packed: int,
+        blank: int,
+        h_value: int,
+        bound: int,
+        interrupted: Optional[Callable[[], bool]] = None,
+    ) -> Tuple[float, List[Tuple[int, int]], int, int]:
+        """Run one idastar iteration across the worker processes.
+
+        Parameters:
+            packed (int): The packed root state.
+            blank (int): The flat index of the blank in the root state.
+            h_value (int): The heuristic value of the root state.
+            bound (int): The f-cost no path may exceed.
+            interrupted (Callable[[], bool]): Checked every STOP_POLL_SECONDS
+                while the workers run; once it returns True they are told to
+                stop.
+
+        Returns:
+            FOUND, STOPPED if interrupted, or the smallest f-cost over the
+            bound, the solution path of (move code, target) pairs when
+            found, and the nodes expanded and generated by the workers.
+        """
+        minimum, tasks, expanded, generated = self.split(packed, blank, h_value, bound)
+        if minimum == FOUND:
+            return FOUND, tasks[0][5], expanded, generated
+
+        self._stop.clear()
+        executor = self._pool()
+        running: Set[Future] = {
+            executor.submit(_run_task, task, bound) for task in tasks
+        }
+        logging.debug("Split bound %s into %s subtrees", bound, len(running))
+
+        path: List[Tuple[int, int]] = []
+        timeout = None if interrupted is None else STOP_POLL_SECONDS
+        stopped = False
+        while running:
+            done, running = wait(running, timeout, FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                result, found_path, task_expanded, task_generated = future.result()
+                expanded += task_expanded
+                generated += task_generated
+                if result == FOUND and minimum != FOUND:
+                    minimum = FOUND
+                    path = found_path
+                    # Stop the running subtrees and drop the waiting ones.
+                    self._stop.set()
+                    for waiting in running:
+                        waiting.cancel()
+                elif result != STOPPED and minimum != FOUND:
+                    minimum = min(minimum, result)
+
+            if not stopped and minimum != FOUND and interrupted and interrupted():
+                stopped = True
+                self._stop.set()
+                for waiting in running:
+                    waiting.cancel()
+
+        if stopped and minimum != FOUND:
+            return STOPPED, [], expanded, generated
+        return minimum, path, expanded, generated
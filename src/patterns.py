@@ -0,0 +1,308 @@
+"""This module contains the additive pattern database heuristics.
+
+A pattern database stores, for every placement of a group of tiles, the
+number of moves of those tiles needed to bring them home. The databases of
+a partition are disjoint so their values can be added. Tables are built by
+a retrograde breadth-first search from the goal state, saved as raw byte
+arrays, and loaded through mmap so several processes share one copy.
+"""
+
+import logging
+import mmap
+import os
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.board import TILE_BITS, TILE_MASK, get_blank_moves
+from src.heuristics import register_heuristic
+
+PARTITIONS: Dict[str, Tuple[Tuple[int, ...], ...]] = {
+    "pdb555": ((1, 2, 5, 6, 9), (3, 4, 7, 8, 12), (10, 11, 13, 14, 15)),
+    "pdb663": ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+_MAGIC = b"PDB1"
+_UNSEEN = 255
+
+# Reflecting the board in its main diagonal keeps the goal state fixed, so a
+# state and its reflection are the same number of moves from the goal.
+_TRANSPOSE = [(pos % 4) * 4 + pos // 4 for pos in range(16)]
+_MIRROR = [0] + [_TRANSPOSE[tile - 1] + 1 for tile in range(1, 16)]
+
+
+def table_size(tile_count: int) -> int:
+    """Return the number of entries needed for a pattern of tile_count tiles.
+
+    Parameters:
+        tile_count (int): The number of tiles in the pattern.
+
+    Returns:
+        The number of ordered placements of the tiles on 16 positions.
+    """
+    size = 1
+    for i in range(tile_count):
+        size *= 16 - i
+    return size
+
+
+def rank_positions(positions: Sequence[int]) -> int:
+    """Map the positions of a pattern's tiles to a dense table index.
+
+    Parameters:
+        positions (Sequence[int]): Distinct flat positions of the tiles.
+
+    Returns:
+        Index in the range 0 to table_size(len(positions)) - 1.
+    """
+    index = 0
+    for i, pos in enumerate(positions):
+        smaller = 0
+        for prev in positions[:i]:
+            if prev < pos:
+                smaller += 1
+        index = index * (16 - i) + pos - smaller
+    return index
+
+
+def unrank_positions(index: int, tile_count: int) -> List[int]:
+    """Invert rank_positions.
+
+    Parameters:
+        index (int): The table index.
+        tile_count (int): The number of tiles in the pattern.
+
+    Returns:
+        The flat positions of the pattern's tiles.
+    """
+    digits = []
+    for i in reversed(range(tile_count)):
+        index, digit = divmod(index, 16 - i)
+        digits.append(digit)
+
+    positions: List[int] = []
+    for digit in reversed(digits):
+        for pos in range(16):
+            if pos in positions:
+                continue
+            if digit == 0:
+                positions.append(pos)
+                break
+            digit -= 1
+    return positions
+
+
+def build_pattern_table(pattern: Sequence[int]) -> bytearray:
+    """Build the table of a pattern by breadth-first search backwards from
+    the goal state. Only moves of the pattern's tiles are counted, which
+    keeps the tables of a disjoint partition additive.
+
+    Parameters:
+        pattern (Sequence[int]): The tiles of this pattern.
+
+    Returns:
+        Byte array holding the move count of every placement.
+    """
+    tile_count = len(pattern)
+    size = table_size(tile_count)
+    table = bytearray([_UNSEEN]) * size
+    # States are the placement index and the blank position.
+    seen = bytearray(size * 16)
+
+    cost = 0
+    layer = array("L", [rank_positions([tile - 1 for tile in pattern]) * 16 + 15])
+    while len(layer) > 0:
+        next_layer = array("L")
+        # Moves of other tiles are free, so they extend the current layer.
+        i = 0
+        while i < len(layer):
+            code = layer[i]
+            i += 1
+            if seen[code]:
+                continue
+            seen[code] = 1
+
+            index, blank = divmod(code, 16)
+            if table[index] > cost:
+                table[index] = cost
+
+            positions = unrank_positions(index, tile_count)
+            for _, target in get_blank_moves(blank):
+                if target in positions:
+                    moved = list(positions)
+                    moved[positions.index(target)] = blank
+                    new_code = rank_positions(moved) * 16 + target
+                    if not seen[new_code]:
+                        next_layer.append(new_code)
+                else:
+                    new_code = index * 16 + target
+                    if not seen[new_code]:
+                        layer.append(new_code)
+
+        logging.debug("Pattern %s cost %s complete", pattern, cost)
+        layer = next_layer
+        cost += 1
+
+    return table
+
+
+def pattern_path(directory: str, pattern: Sequence[int]) -> str:
+    """Return the file path a pattern's table is stored at.
+
+    Parameters:
+        directory (str): The directory holding the tables.
+        pattern (Sequence[int]): The tiles of the pattern.
+
+    Returns:
+        Path of the table file.
+    """
+    return os.path.join(directory, "pattern-" + "-".join(map(str, pattern)) + ".pdb")
+
+
+def save_pattern_table(path: str, pattern: Sequence[int], table: bytes) -> None:
+    """Write a pattern table to disk.
+
+    Parameters:
+        path (str): The file to write.
+        pattern (Sequence[int]): The tiles of the pattern.
+        table (bytes): The table built by build_pattern_table.
+    """
+    with open(path, "wb") as file:
+        file.write(_MAGIC + bytes([len(pattern)]) + bytes(pattern))
+        file.write(table)
+
+
+class PatternDatabase:
+    """Class holding one memory-mapped pattern table.
+
+    Variables:
+        pattern (Tuple[int, ...]): The tiles of this pattern.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map a table written by save_pattern_table into memory.
+
+        Parameters:
+            path (str): The table file to load.
+
+        Throws:
+            ValueError if the file is not a pattern table.
+        """
+        with open(path, "rb") as file:
+            self._table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._table[:4] != _MAGIC:
+            raise ValueError(f"{path} is not a pattern database.")
+        tile_count = self._table[4]
+        self._pattern = tuple(self._table[5 : 5 + tile_count])
+        self._offset = 5 + tile_count
+
+        if len(self._table) - self._offset != table_size(tile_count):
+            raise ValueError(f"{path} has the wrong size for its pattern.")
+
+    @property
+    def pattern(self) -> Tuple[int, ...]:
+        """Return the tiles of this pattern.
+
+        Returns:
+            Tuple of tile numbers.
+        """
+        return self._pattern
+
+    def lookup(self, positions: Sequence[int]) -> int:
+        """Return the stored move count for a placement.
+
+        Parameters:
+            positions (Sequence[int]): Flat position of every tile, indexed by
+                tile number.
+
+        Returns:
+            The number of pattern moves left to reach the goal.
+        """
+        index = rank_positions([positions[tile] for tile in self._pattern])
+        return self._table[self._offset + index]
+
+
+class PatternHeuristic:
+    """Callable heuristic summing the databases of a disjoint partition. The
+    reflected state is looked up in the same tables and the larger sum is
+    used.
+
+    Variables:
+        databases (List[PatternDatabase]): The tables of the partition.
+        directory (str): The directory the tables were loaded from, so that
+            other processes can load them too; None if unknown.
+    """
+
+    def __init__(
+        self, databases: List[PatternDatabase], directory: Optional[str] = None
+    ) -> None:
+        """Default constructor for a PatternHeuristic object.
+
+        Parameters:
+            databases (List[PatternDatabase]): The tables of a partition.
+            directory (str): The directory the tables were loaded from.
+        """
+        self.databases = databases
+        self.directory = directory
+
+    def __call__(self, packed: int) -> int:
+        """Estimate the moves left for a packed state.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            The larger of the partition sums of the state and its reflection.
+        """
+        positions = [0] * 16
+        mirrored = [0] * 16
+        for pos in range(16):
+            tile = (packed >> (pos * TILE_BITS)) & TILE_MASK
+            positions[tile] = pos
+            mirrored[_MIRROR[tile]] = _TRANSPOSE[pos]
+
+        value = 0
+        mirror_value = 0
+        for database in self.databases:
+            value += database.lookup(positions)
+            mirror_value += database.lookup(mirrored)
+        return max(value, mirror_value)
+
+
+def build_partition(name: str, directory: str) -> None:
+    """Build and save every table of a named partition.
+
+    Parameters:
+        name (str): The partition, a key of PARTITIONS.
+        directory (str): The directory to write the tables to.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for pattern in PARTITIONS[name]:
+        path = pattern_path(directory, pattern)
+        if os.path.exists(path):
+            continue
+        logging.info("Building pattern %s", pattern)
+        save_pattern_table(path, pattern, build_pattern_table(pattern))
+
+
+def load_pattern_heuristic(name: str, directory: str) -> PatternHeuristic:
+    """Load the tables of a named partition and register the heuristic so
+    Node and Tree can select it by name.
+
+    Parameters:
+        name (str): The partition, a key of PARTITIONS.
+        directory (str): The directory holding the tables.
+
+    Throws:
+        FileNotFoundError if a table has not been built.
+
+    Returns:
+        The registered heuristic.
+    """
+    databases = [
+        PatternDatabase(pattern_path(directory, pattern))
+        for pattern in PARTITIONS[name]
+    ]
+    heuristic = PatternHeuristic(databases, directory)
+    register_heuristic(name, heuristic)
+    return heuristic
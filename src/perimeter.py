@@ -0,0 +1,231 @@
+"""This module contains the perimeter database of every state within a few
+moves of the goal state.
+
+The database is built once by a breadth-first search backwards from the
+goal state, run by the external-memory search of src.external so that deep
+perimeters need little memory. Every state is stored once with its exact
+distance from the goal in a file sorted by packed state, which is loaded
+through mmap and searched by bisection, so several processes share one
+copy. A search reaching any state of the perimeter can stop there and
+splice in the stored path to the goal, and every state outside it is known
+to be more than the perimeter's depth from the goal, which sharpens the
+heuristic near the goal.
+"""
+
+import heapq
+import logging
+import mmap
+import os
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from src.board import Layout, find_blank, get_layout, slide
+from src.external import ExternalBFS
+
+# The depth of a perimeter unless another is given.
+DEFAULT_PERIMETER_DEPTH = 12
+
+_MAGIC = b"PER1"
+_HEADER_SIZE = 8
+
+
+def perimeter_path(directory: str, layout: Layout) -> str:
+    """Return the file path the perimeter of a board size is stored at.
+
+    Parameters:
+        directory (str): The directory holding the database.
+        layout (Layout): The size of the board.
+
+    Returns:
+        Path of the database file.
+    """
+    return os.path.join(directory, f"perimeter-{layout.rows}x{layout.cols}.db")
+
+
+def build_perimeter(
+    path: str, layout: Layout, depth: int = DEFAULT_PERIMETER_DEPTH
+) -> List[int]:
+    """Build the perimeter of a board size and write it to disk.
+
+    Parameters:
+        path (str): The file to write.
+        layout (Layout): The size of the board.
+        depth (int): The most moves from the goal of a state stored, at most
+            255.
+
+    Throws:
+        AssertionError if the depth is not between 0 and 255.
+
+    Returns:
+        The number of states at each distance from the goal.
+    """
+    if not 0 <= depth <= 255:
+        raise AssertionError("Perimeter depth must be between 0 and 255")
+
+    width = (layout.size * layout.tile_bits + 7) // 8
+    with tempfile.TemporaryDirectory(prefix="perimeter-") as directory:
+        search = ExternalBFS(layout.goal_packed, layout, directory)
+        try:
+            while search.depth < depth:
+                search.step()
+                logging.info("Perimeter depth %s complete", search.depth)
+        except IndexError:
+            logging.info("Every state is within %s moves of the goal", search.depth)
+
+        def tagged(distance: int) -> Iterator[Tuple[int, int]]:
+            for packed in search.read_layer(distance):
+                yield packed, distance
+
+        layers = [tagged(distance) for distance in range(search.depth + 1)]
+        with open(path, "wb", buffering=1 << 20) as file:
+            file.write(_MAGIC + bytes([layout.rows, layout.cols, depth, width]))
+            for packed, distance in heapq.merge(*layers):
+                file.write(packed.to_bytes(width, "big") + bytes([distance]))
+    return search.layer_sizes
+
+
+class PerimeterDatabase:
+    """Class holding one memory-mapped perimeter.
+
+    Variables:
+        layout (Layout): The size of the boards stored.
+        depth (int): The most moves from the goal of a state stored; every
+            other state is further.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Map a database written by build_perimeter into memory.
+
+        Parameters:
+            path (str): The database file to load.
+
+        Throws:
+            ValueError if the file is not a perimeter database.
+        """
+        with open(path, "rb") as file:
+            self._table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._table[:4] != _MAGIC:
+            raise ValueError(f"{path} is not a perimeter database.")
+        rows, cols, depth, width = self._table[4:_HEADER_SIZE]
+        self.layout = get_layout(rows, cols)
+        self.depth = depth
+        self._width = width
+        self._record = width + 1
+
+        if (len(self._table) - _HEADER_SIZE) % self._record != 0:
+            raise ValueError(f"{path} has a truncated table.")
+
+    def __len__(self) -> int:
+        """Return the number of states stored.
+
+        Returns:
+            The number of states within depth moves of the goal.
+        """
+        return (len(self._table) - _HEADER_SIZE) // self._record
+
+    def distance(self, packed: int) -> Optional[int]:
+        """Look up the distance of a state from the goal.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            The exact number of moves to the goal, or None if the state is
+            outside the perimeter.
+        """
+        table = self._table
+        width = self._width
+        record = self._record
+        key = packed.to_bytes(width, "big")
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            offset = _HEADER_SIZE + middle * record
+            if table[offset : offset + width] < key:
+                low = middle + 1
+            else:
+                high = middle
+        offset = _HEADER_SIZE + low * record
+        if table[offset : offset + width] != key:
+            return None
+        return table[offset + width]
+
+    def tail(self, packed: int) -> Optional[List[Tuple[int, int]]]:
+        """Find a shortest path from a state to the goal by moving to a
+        neighbour one move closer until the goal is reached.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            The (move code, target) pairs leading to the goal, or None if the
+            state is outside the perimeter.
+        """
+        distance = self.distance(packed)
+        if distance is None:
+            return None
+
+        layout = self.layout
+        path = []
+        blank = find_blank(packed, layout.size, layout.tile_bits)
+        while distance > 0:
+            for code, target in layout.neighbors[blank]:
+                moved = slide(packed, blank, target, layout.tile_bits)
+                if self.distance(moved) == distance - 1:
+                    break
+            path.append((code, target))
+            packed, blank = moved, target
+            distance -= 1
+        return path
+
+
+class PerimeterHeuristic:
+    """Callable heuristic using exact distances inside a perimeter. Outside
+    it, no state is closer than one move beyond the perimeter's depth, or
+    two when the parity of the blank's distance from its goal cell rules one
+    out, so the base heuristic is raised to that if lower. The result is
+    admissible whenever the base heuristic is.
+
+    Variables:
+        base (Callable[[int], int]): The heuristic sharpened.
+        database (PerimeterDatabase): The perimeter consulted.
+    """
+
+    def __init__(self, base: Callable[[int], int], database: PerimeterDatabase) -> None:
+        """Default constructor for a PerimeterHeuristic object.
+
+        Parameters:
+            base (Callable[[int], int]): An admissible heuristic function.
+            database (PerimeterDatabase): The perimeter of the board size.
+        """
+        self.base = base
+        self.database = database
+
+    def __call__(self, packed: int) -> int:
+        """Estimate the moves left for a packed state.
+
+        Parameters:
+            packed (int): The packed board state.
+
+        Returns:
+            The exact distance inside the perimeter, otherwise the larger of
+            the base estimate and one more than the perimeter's depth.
+        """
+        value = self.base(packed)
+        depth = self.database.depth
+        if value > depth:
+            # No state this far can be in the perimeter.
+            return value
+        distance = self.database.distance(packed)
+        if distance is not None:
+            return distance
+
+        # Every move shifts the blank one cell, so the distance has the
+        # parity of the blank's distance from its goal cell.
+        layout = self.database.layout
+        blank = find_blank(packed, layout.size, layout.tile_bits)
+        row, col = divmod(blank, layout.cols)
+        goal_row, goal_col = divmod(layout.goal_blank, layout.cols)
+        parity = (abs(row - goal_row) + abs(col - goal_col)) % 2
+        return depth + 1 + (depth + 1 + parity) % 2
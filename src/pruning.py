@@ -0,0 +1,218 @@
+"""This module contains the move pruning used by the depth-first searches.
+
+Different sequences of moves often leave the board in the same state, such as
+a move followed by its inverse, or the blank circling a 2x2 block one way
+instead of the other. A search without an explored set regenerates every one
+of those states. For each group of equivalent sequences only the shortest,
+then alphabetically first by move code, is kept; the others are forbidden and
+compiled into a finite state machine that tracks the moves of the current
+path and rejects any move completing a forbidden sequence.
+"""
+
+from collections import defaultdict
+from functools import lru_cache
+from typing import DefaultDict, Dict, Iterable, List, Sequence, Set, Tuple
+
+from src.board import DOWN, LEFT, RIGHT, UP
+
+# The longest move sequences compared when building the machine.
+FSM_MAX_LENGTH = 8
+
+# Returned by the machine for a move that completes a forbidden sequence.
+PRUNED = -1
+
+# The change in blank row and column made by every move code.
+_STEPS = {UP: (1, 0), DOWN: (-1, 0), LEFT: (0, 1), RIGHT: (0, -1)}
+
+_Path = Tuple[int, ...]
+_Box = Tuple[int, int, int, int]
+_Tiles = Dict[Tuple[int, int], Tuple[int, int]]
+
+
+def _extend(
+    blank: Tuple[int, int], tiles: _Tiles, box: _Box, code: int
+) -> Tuple[Tuple[int, int], _Tiles, _Box]:
+    """Play one move on an unbounded board whose tiles are named after the
+    position they started at, the blank starting at the origin.
+
+    Parameters:
+        blank (Tuple[int, int]): The position of the blank.
+        tiles (Dict): The tile at every position that has changed.
+        box (Tuple[int, int, int, int]): The bounding box (top, bottom,
+            left, right) of the blank's path so far.
+        code (int): The move code to play.
+
+    Returns:
+        The blank, tiles and bounding box after the move.
+    """
+    step = _STEPS[code]
+    target = (blank[0] + step[0], blank[1] + step[1])
+    tiles = dict(tiles)
+    tiles[blank] = tiles.get(target, target)
+    tiles[target] = (0, 0)
+    box = (
+        min(box[0], target[0]),
+        max(box[1], target[0]),
+        min(box[2], target[1]),
+        max(box[3], target[1]),
+    )
+    return target, tiles, box
+
+
+def _inside(inner: _Box, outer: _Box) -> bool:
+    """Check that one bounding box lies within another.
+
+    Parameters:
+        inner (Tuple[int, int, int, int]): The box that should be inside.
+        outer (Tuple[int, int, int, int]): The enclosing box.
+
+    Returns:
+        True if inner is within outer.
+    """
+    return (
+        outer[0] <= inner[0]
+        and inner[1] <= outer[1]
+        and outer[2] <= inner[2]
+        and inner[3] <= outer[3]
+    )
+
+
+def find_duplicate_paths(max_length: int = FSM_MAX_LENGTH) -> List[_Path]:
+    """Find the move sequences that can be replaced by a shorter or
+    alphabetically earlier sequence reaching the same state. Replacements
+    must keep the blank within the original's bounding box so that they fit
+    on any board the original fits on. Only the minimal forbidden sequences
+    are returned; none contains another.
+
+    Parameters:
+        max_length (int): The longest sequences to compare.
+
+    Returns:
+        The forbidden sequences of move codes.
+    """
+    forbidden = [(code, code ^ 1) for code in _STEPS]
+    forbidden_set: Set[_Path] = set(forbidden)
+    seen: DefaultDict[Tuple, List[_Box]] = defaultdict(list)
+
+    # Only sequences free of forbidden parts are extended. Sequences leaving
+    # the same blank position and tiles have the same key.
+    layer: List[Tuple[_Path, Tuple[int, int], _Tiles, _Box]] = [
+        ((), (0, 0), {}, (0, 0, 0, 0))
+    ]
+    for _ in range(max_length):
+        groups: DefaultDict[Tuple, List] = defaultdict(list)
+        for path, blank, tiles, box in layer:
+            for code in _STEPS:
+                extended = path + (code,)
+                if any(extended[i:] in forbidden_set for i in range(len(path))):
+                    continue
+                moved = _extend(blank, tiles, box, code)
+                changed = frozenset(
+                    (pos, tile) for pos, tile in moved[1].items() if pos != tile
+                )
+                groups[(moved[0], changed)].append((extended,) + moved)
+
+        layer = []
+        for key, paths in groups.items():
+            boxes = seen[key]
+            for entry in sorted(paths, key=lambda entry: entry[0]):
+                box = entry[3]
+                if any(_inside(other, box) for other in boxes):
+                    forbidden.append(entry[0])
+                    forbidden_set.add(entry[0])
+                else:
+                    layer.append(entry)
+                boxes.append(box)
+
+    return forbidden
+
+
+class MoveAutomaton:
+    """Finite state machine rejecting the moves that complete a forbidden
+    sequence, built as an Aho-Corasick automaton over the move codes.
+
+    Variables:
+        transitions (Tuple[Tuple[int, ...], ...]): For every state, the next
+            state after each move code, or PRUNED.
+        start (int): The state of a path without moves.
+    """
+
+    start = 0
+
+    def __init__(self, forbidden: Iterable[Sequence[int]]) -> None:
+        """Default constructor for a MoveAutomaton object.
+
+        Parameters:
+            forbidden (Iterable[Sequence[int]]): The move sequences to reject.
+        """
+        children: List[Dict[int, int]] = [{}]
+        terminal = [False]
+        for path in forbidden:
+            state = 0
+            for code in path:
+                if code not in children[state]:
+                    children[state][code] = len(children)
+                    children.append({})
+                    terminal.append(False)
+                state = children[state][code]
+            terminal[state] = True
+
+        # Breadth-first order makes every fallback state complete before use.
+        fallback = [0] * len(children)
+        goto = [[0] * len(_STEPS) for _ in children]
+        order = [0]
+        for state in order:
+            for code in _STEPS:
+                child = children[state].get(code)
+                if child is None:
+                    goto[state][code] = goto[fallback[state]][code] if state else 0
+                    continue
+                fallback[child] = goto[fallback[state]][code] if state else 0
+                terminal[child] = terminal[child] or terminal[fallback[child]]
+                goto[state][code] = child
+                order.append(child)
+
+        # States that have completed a forbidden sequence are never entered.
+        live = [state for state in order if not terminal[state]]
+        number = {state: index for index, state in enumerate(live)}
+        self.transitions = tuple(
+            tuple(PRUNED if terminal[nxt] else number[nxt] for nxt in goto[state])
+            for state in live
+        )
+
+    def __len__(self) -> int:
+        """Return the number of states.
+
+        Returns:
+            The number of states of this machine.
+        """
+        return len(self.transitions)
+
+    def walk(self, path: Iterable[int], state: int = 0) -> int:
+        """Follow a sequence of move codes.
+
+        Parameters:
+            path (Iterable[int]): The move codes to follow.
+            state (int): The state to start from.
+
+        Returns:
+            The state reached, or PRUNED if the sequence is rejected.
+        """
+        for code in path:
+            state = self.transitions[state][code]
+            if state == PRUNED:
+                break
+        return state
+
+
+@lru_cache(maxsize=None)
+def get_move_automaton(max_length: int = FSM_MAX_LENGTH) -> MoveAutomaton:
+    """Return the shared machine pruning sequences up to a length.
+
+    Parameters:
+        max_length (int): The longest sequences compared.
+
+    Returns:
+        The MoveAutomaton, built on first use.
+    """
+    return MoveAutomaton(find_duplicate_paths(max_length))
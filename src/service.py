@@ -0,0 +1,496 @@
+"""This module contains the solver service answering requests sent as lines
+of JSON over TCP.
+
+Requests wait in a bounded queue and are dispatched to a pool of worker
+processes started once, so every request reuses warm pattern tables and
+move tables. A full queue rejects new requests straight away instead of
+letting the wait grow. Deadlines and cancellations are checked while a
+search runs, also within the iterations of idastar and iddfs.
+
+Every request is one JSON object on its own line, answered by one line:
+
+    {"op": "solve", "id": 1, "board": "1 _ 2 ...", "routine": "astar",
+     "heuristic": null, "size": "4x4", "deadline": 5.0}
+    {"op": "cancel", "id": 1}
+    {"op": "stats"}
+
+A solve is answered with the result of src.batch.solve_board and its id
+once it finishes, so answers may arrive out of order. The status is
+"busy" when the queue is full and "cancelled" or "timeout" when the
+request was stopped.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+from src.batch import QUEUED_PER_WORKER, solve_board
+from src.board import parse_size
+from src.heuristics import HEURISTICS
+from src.patterns import PARTITIONS, load_pattern_heuristic
+from src.pruning import get_move_automaton
+
+# Latencies kept for the percentiles reported by stats.
+LATENCY_WINDOW = 1000
+
+# The percentiles of request latency reported by stats.
+PERCENTILES = (50, 90, 99)
+
+# The cancellation flag of every dispatch slot, shared with the workers.
+_cancel_flags: Optional[Any] = None
+
+# The directory the workers load pattern tables from.
+_pdb_dir = "pdb"
+
+
+def _init_worker(heuristics: Sequence[str], pdb_dir: str, flags: Any) -> None:
+    """Load the tables every request may need once in a worker process.
+
+    Parameters:
+        heuristics (Sequence[str]): Pattern database heuristics to load.
+        pdb_dir (str): The directory holding the pattern tables.
+        flags (multiprocessing.RawArray): The cancellation flags.
+    """
+    global _cancel_flags, _pdb_dir
+
+    _cancel_flags = flags
+    _pdb_dir = pdb_dir
+    for heuristic in heuristics:
+        load_pattern_heuristic(heuristic, pdb_dir)
+    get_move_automaton()
+
+
+def _valid_id(job_id: Any) -> bool:
+    """Check that a request id is a string or an integer, so it can key
+    the requests of the service.
+
+    Parameters:
+        job_id (Any): The id of the request.
+
+    Returns:
+        True if the id is valid.
+    """
+    return isinstance(job_id, (str, int)) and not isinstance(job_id, bool)
+
+
+def _warm_up() -> None:
+    """Do nothing; submitted once per worker so the pool starts them all."""
+
+
+def _solve_job(slot: int, request: Dict[str, Any], timeout: Optional[float]) -> Any:
+    """Solve one request in a worker process.
+
+    Parameters:
+        slot (int): The dispatch slot whose flag cancels this request.
+        request (Dict[str, Any]): The solve request.
+        timeout (float): Seconds left before the request's deadline.
+
+    Returns:
+        The result dictionary made by solve_board.
+    """
+    heuristic = request.get("heuristic")
+    if heuristic in PARTITIONS and heuristic not in HEURISTICS:
+        load_pattern_heuristic(heuristic, _pdb_dir)
+    layout = parse_size(request.get("size", "4x4"))
+    return solve_board(
+        request["id"],
+        request["board"],
+        request.get("routine", "astar"),
+        heuristic,
+        timeout,
+        layout.rows,
+        layout.cols,
+        lambda: _cancel_flags[slot] != 0,
+    )
+
+
+class _Job:
+    """Class holding one solve request while it is queued and running.
+
+    Variables:
+        request (Dict[str, Any]): The solve request.
+        received (float): The time the request arrived.
+        deadline (float): The time the request must finish by, if any.
+        slot (int): The dispatch slot running the request, if any.
+        cancelled (bool): Whether the client cancelled the request.
+        timer (asyncio.TimerHandle): Answers "timeout" at the deadline if
+            the request is still queued then.
+        result (asyncio.Future): Resolved with the answer.
+    """
+
+    def __init__(self, request: Dict[str, Any], deadline: Optional[float]) -> None:
+        """Default constructor for a _Job object.
+
+        Parameters:
+            request (Dict[str, Any]): The solve request.
+            deadline (float): Seconds the request may take, if limited.
+        """
+        self.request = request
+        self.received = time.perf_counter()
+        self.deadline = None if deadline is None else self.received + deadline
+        self.slot: Optional[int] = None
+        self.cancelled = False
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.result: "asyncio.Future[Dict[str, Any]]" = (
+            asyncio.get_event_loop().create_future()
+        )
+
+
+class SolverService:
+    """Class running the queue and worker pool of the solver service.
+
+    Variables:
+        workers (int): The number of worker processes.
+        max_queue (int): The most requests waiting for a worker.
+        deadline (float): Seconds a request may take unless it asks for
+            another deadline; None for no limit.
+        completed (int): The requests answered after running or waiting.
+        rejected (int): The requests refused because the queue was full.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        max_queue: Optional[int] = None,
+        deadline: Optional[float] = None,
+        heuristics: Sequence[str] = (),
+        pdb_dir: str = "pdb",
+    ) -> None:
+        """Default constructor for a SolverService object. Call start before
+        submitting requests and close when done.
+
+        Parameters:
+            workers (int): The number of worker processes.
+            max_queue (int): The most requests waiting for a worker;
+                defaults to QUEUED_PER_WORKER per worker.
+            deadline (float): Seconds a request may take unless it asks for
+                another deadline; None for no limit.
+            heuristics (Sequence[str]): Pattern database heuristics every
+                worker loads on start; others are loaded on first use.
+            pdb_dir (str): The directory holding the pattern tables.
+        """
+        self.workers = workers
+        self.max_queue = max_queue or workers * QUEUED_PER_WORKER
+        self.deadline = deadline
+        self.completed = 0
+        self.rejected = 0
+        self._heuristics = tuple(heuristics)
+        self._pdb_dir = pdb_dir
+        self._jobs: Dict[Any, _Job] = {}
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._next_id = 0
+        self._flags = multiprocessing.RawArray("b", workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: "Optional[asyncio.Queue[_Job]]" = None
+        self._dispatchers: List["asyncio.Task[None]"] = []
+        self._running = 0
+
+    async def start(self) -> None:
+        """Start the worker processes and wait until all are ready."""
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._heuristics, self._pdb_dir, self._flags),
+        )
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _warm_up)
+                for _ in range(self.workers)
+            )
+        )
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._dispatchers = [
+            asyncio.ensure_future(self._dispatch(slot)) for slot in range(self.workers)
+        ]
+        logging.info("Solver service started with %s workers", self.workers)
+
+    async def close(self) -> None:
+        """Cancel every request and stop the worker processes."""
+        for job in list(self._jobs.values()):
+            self.cancel(job.request["id"])
+            if not job.result.done():
+                job.result.set_result({"id": job.request["id"], "status": "cancelled"})
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a solve request and wait for its answer.
+
+        Parameters:
+            request (Dict[str, Any]): The solve request. An id is assigned
+                if it has none.
+
+        Returns:
+            The answer: the solve_board result, or a status of "invalid"
+            for a malformed request, "busy" when the queue is full,
+            "cancelled" or "timeout".
+        """
+        request = dict(request)
+        if request.get("id") is None:
+            self._next_id += 1
+            request["id"] = f"job-{self._next_id}"
+        job_id = request["id"]
+        deadline = request.get("deadline", self.deadline)
+
+        if not _valid_id(job_id):
+            return {"id": job_id, "status": "invalid", "error": "Bad id."}
+        if deadline is not None and (
+            not isinstance(deadline, (int, float))
+            or isinstance(deadline, bool)
+            or deadline < 0
+        ):
+            return {"id": job_id, "status": "invalid", "error": "Bad deadline."}
+        if not isinstance(request.get("board"), str):
+            return {"id": job_id, "status": "invalid", "error": "No board given."}
+        if job_id in self._jobs:
+            return {"id": job_id, "status": "invalid", "error": "Duplicate id."}
+        size = request.get("size", "4x4")
+        if not isinstance(size, str):
+            return {"id": job_id, "status": "invalid", "error": "Bad size."}
+        try:
+            parse_size(size)
+        except ValueError as error:
+            return {"id": job_id, "status": "invalid", "error": str(error)}
+
+        job = _Job(request, deadline)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return {"id": job_id, "status": "busy"}
+
+        if job.deadline is not None:
+            loop = asyncio.get_event_loop()
+            job.timer = loop.call_at(
+                loop.time() + job.deadline - time.perf_counter(), self._expire, job
+            )
+        self._jobs[job_id] = job
+        try:
+            return await asyncio.shield(job.result)
+        except asyncio.CancelledError:
+            # Nobody is waiting for the answer any more.
+            self.cancel(job_id)
+            raise
+        finally:
+            if job.timer is not None:
+                job.timer.cancel()
+            del self._jobs[job_id]
+
+    def cancel(self, job_id: Any) -> bool:
+        """Cancel a queued or running request. A queued request is answered
+        straight away; a running one once its search stops.
+
+        Parameters:
+            job_id (Any): The id of the request.
+
+        Returns:
+            True if the request was found and had not finished.
+        """
+        if not _valid_id(job_id):
+            return False
+        job = self._jobs.get(job_id)
+        if job is None or job.result.done():
+            return False
+        job.cancelled = True
+        if job.slot is not None:
+            self._flags[job.slot] = 1
+        else:
+            self._answer_queued(job, "cancelled")
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Describe the load of the service.
+
+        Returns:
+            Dictionary of queue depth, running, completed and rejected
+            requests and the latency percentiles in milliseconds over the
+            latest LATENCY_WINDOW requests.
+        """
+        latencies = sorted(self._latencies)
+        percentiles = {}
+        for percentile in PERCENTILES:
+            value = None
+            if latencies:
+                index = min(len(latencies) - 1, len(latencies) * percentile // 100)
+                value = round(latencies[index] * 1000, 3)
+            percentiles[f"p{percentile}"] = value
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "latency_ms": percentiles,
+        }
+
+    async def _dispatch(self, slot: int) -> None:
+        """Feed queued requests to the worker pool one at a time.
+
+        Parameters:
+            slot (int): The index of this dispatcher's cancellation flag.
+        """
+        loop = asyncio.get_event_loop()
+        while True:
+            job = await self._queue.get()
+            if job.result.done():
+                # Cancelled or timed out while it waited.
+                continue
+            job_id = job.request["id"]
+            timeout = None
+            if job.deadline is not None:
+                timeout = job.deadline - time.perf_counter()
+
+            if timeout is not None and timeout <= 0:
+                result = {"id": job_id, "status": "timeout"}
+            else:
+                self._flags[slot] = 0
+                job.slot = slot
+                self._running += 1
+                try:
+                    result = await loop.run_in_executor(
+                        self._executor, _solve_job, slot, job.request, timeout
+                    )
+                except Exception as error:  # pylint: disable=broad-except
+                    result = {"id": job_id, "status": "failed", "error": str(error)}
+                finally:
+                    self._running -= 1
+                    job.slot = None
+                result = dict(result, id=job_id)
+                result.pop("index", None)
+
+            self.completed += 1
+            self._latencies.append(time.perf_counter() - job.received)
+            if not job.result.done():
+                job.result.set_result(result)
+
+    def _expire(self, job: _Job) -> None:
+        """Answer a request whose deadline passed while it was queued.
+
+        Parameters:
+            job (_Job): The request.
+        """
+        if job.slot is None and not job.result.done():
+            self._answer_queued(job, "timeout")
+
+    def _answer_queued(self, job: _Job, status: str) -> None:
+        """Answer a request that never reached a worker.
+
+        Parameters:
+            job (_Job): The request.
+            status (str): The status answered, "cancelled" or "timeout".
+        """
+        self.completed += 1
+        self._latencies.append(time.perf_counter() - job.received)
+        job.result.set_result({"id": job.request["id"], "status": status})
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the requests of one connection until it closes. Solves
+        run concurrently and are answered as they finish.
+
+        Parameters:
+            reader (asyncio.StreamReader): The incoming lines.
+            writer (asyncio.StreamWriter): The outgoing lines.
+        """
+        pending = set()
+
+        async def answer(request: Dict[str, Any]) -> None:
+            await self._send(writer, await self.submit(request))
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    op = request.get("op", "solve")
+                except (ValueError, AttributeError):
+                    await self._send(
+                        writer, {"status": "invalid", "error": "Bad JSON."}
+                    )
+                    continue
+
+                if op == "solve":
+                    task = asyncio.ensure_future(answer(request))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                elif op == "cancel":
+                    job_id = request.get("id")
+                    if not _valid_id(job_id):
+                        await self._send(
+                            writer,
+                            {
+                                "op": "cancel",
+                                "id": job_id,
+                                "status": "invalid",
+                                "error": "Bad id.",
+                            },
+                        )
+                        continue
+                    await self._send(
+                        writer,
+                        {
+                            "op": "cancel",
+                            "id": job_id,
+                            "cancelled": self.cancel(job_id),
+                        },
+                    )
+                elif op == "stats":
+                    await self._send(writer, dict(self.stats(), op="stats"))
+                else:
+                    await self._send(
+                        writer, {"status": "invalid", "error": f"Unknown op {op!r}."}
+                    )
+        finally:
+            # Requests of a closed connection have no one to answer.
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        """Write one answer line, waiting while the client is slow to read.
+
+        Parameters:
+            writer (asyncio.StreamWriter): The outgoing lines.
+            message (Dict[str, Any]): The answer.
+        """
+        if writer.is_closing():
+            return
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+
+async def serve(
+    service: SolverService, host: str = "127.0.0.1", port: int = 8765
+) -> None:
+    """Run a service on a TCP port until cancelled.
+
+    Parameters:
+        service (SolverService): The service answering requests.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+    """
+    await service.start()
+    server = await asyncio.start_server(service.handle_client, host, port)
+    logging.info("Listening on %s", server.sockets[0].getsockname())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
@@ -0,0 +1,219 @@
+"""This module contains the SearchStats class recording the counters, peaks
+and phase timings of a search.
+"""
+
+import logging
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+# The phases timed when timing is enabled. "expand" is the whole time spent
+# in Tree.expand and includes the other phases.
+PHASES = ("expand", "heuristic", "duplicate_check", "frontier")
+
+# Expansions between checks of the progress report clock.
+REPORT_CHECK_INTERVAL = 1024
+
+
+def log_progress(stats: Dict[str, Any]) -> None:
+    """Default progress reporter writing a summary to the info log.
+
+    Parameters:
+        stats (Dict[str, Any]): The dictionary made by SearchStats.as_dict.
+    """
+    logging.info(
+        "Progress: %s expanded, %s generated, %s duplicates, frontier %s, "
+        "%.0f nodes/s",
+        stats["expanded"],
+        stats["generated"],
+        stats["duplicates"],
+        stats["frontier"],
+        stats["nodes_per_sec"],
+    )
+
+
+class SearchStats:
+    """Class recording counters, peaks and phase timings of a Tree search.
+
+    Variables:
+        generated (int): The number of nodes created.
+        expanded (int): The number of nodes expanded.
+        duplicates (int): The number of nodes rejected as already seen.
+        frontier (int): The latest frontier size.
+        peak_frontier (int): The largest frontier size; for idastar the
+            deepest path searched.
+        peak_explored (int): The largest explored set size.
+        peak_allocation (int): The peak traced allocation in bytes, when
+            memory tracing is enabled.
+        phase_times (Dict[str, float]): Seconds spent in every phase, when
+            timing is enabled.
+        timed (bool): Whether the phases are timed.
+        trace_memory (bool): Whether allocations are traced.
+    """
+
+    def __init__(
+        self,
+        timed: bool = False,
+        trace_memory: bool = False,
+        report_interval: Optional[float] = None,
+        reporter: Callable[[Dict[str, Any]], None] = log_progress,
+    ) -> None:
+        """Default constructor for a SearchStats object. The counters are
+        always kept; timing and memory tracing cost extra and are optional.
+
+        Parameters:
+            timed (bool): Time the phases of every expansion.
+            trace_memory (bool): Trace allocations with tracemalloc.
+            report_interval (float): Seconds between progress reports; None
+                for no reports.
+            reporter (Callable): Function receiving the as_dict summary.
+        """
+        self.timed = timed
+        self.trace_memory = trace_memory
+        self._report_interval = report_interval
+        self._reporter = reporter
+
+        self.generated = 0
+        self.expanded = 0
+        self.duplicates = 0
+        self.frontier = 0
+        self.peak_frontier = 0
+        self.peak_explored = 0
+        self.peak_allocation = 0
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+        self._next_report = 0.0
+        self._tracing = False
+
+    @property
+    def elapsed(self) -> float:
+        """Return the wall time since the first expansion.
+
+        Returns:
+            Seconds from the first expansion to the latest one, or to now
+            while the search is running.
+        """
+        if self._started_at is None:
+            return 0.0
+        end = time.perf_counter() if self._stopped_at is None else self._stopped_at
+        return end - self._started_at
+
+    @property
+    def nodes_per_sec(self) -> float:
+        """Return the expansion rate.
+
+        Returns:
+            Expanded nodes per second of elapsed time.
+        """
+        elapsed = self.elapsed
+        return self.expanded / elapsed if elapsed > 0 else 0.0
+
+    def start(self) -> None:
+        """Start the clock and, if enabled, allocation tracing. Calling it
+        again while running has no effect.
+        """
+        if self._started_at is not None and self._stopped_at is None:
+            return
+
+        now = time.perf_counter()
+        if self._started_at is None:
+            self._started_at = now
+        else:
+            # Resuming keeps the time spent stopped out of the rate.
+            self._started_at += now - self._stopped_at
+        self._stopped_at = None
+
+        if self._report_interval is not None:
+            self._next_report = now + self._report_interval
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def stop(self) -> None:
+        """Stop the clock and any allocation tracing started by start."""
+        if self._started_at is None or self._stopped_at is not None:
+            return
+
+        self._stopped_at = time.perf_counter()
+        self.update_allocation()
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def update_allocation(self) -> None:
+        """Record the traced allocation peak if tracing is active."""
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            if peak > self.peak_allocation:
+                self.peak_allocation = peak
+
+    def record_frontier(self, size: int) -> None:
+        """Record the frontier size after an expansion.
+
+        Parameters:
+            size (int): The number of nodes waiting in the frontier.
+        """
+        self.frontier = size
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    def record_explored(self, size: int) -> None:
+        """Record the explored set size after an expansion.
+
+        Parameters:
+            size (int): The number of states in the explored set.
+        """
+        if size > self.peak_explored:
+            self.peak_explored = size
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Add time to one of the PHASES.
+
+        Parameters:
+            phase (str): The phase the time was spent in.
+            seconds (float): The time spent.
+        """
+        self.phase_times[phase] += seconds
+
+    def count_expansion(self) -> None:
+        """Count one expansion, checking once every REPORT_CHECK_INTERVAL
+        expansions whether a progress report is due.
+        """
+        self.expanded += 1
+        if self.expanded % REPORT_CHECK_INTERVAL == 0:
+            self.report_if_due()
+
+    def report_if_due(self) -> None:
+        """Send a progress report if the report interval has passed since
+        the last one. Tree.expand calls it after every expansion, so routines
+        that add to the counters directly are reported too.
+        """
+        if self._report_interval is None:
+            return
+
+        now = time.perf_counter()
+        if now >= self._next_report:
+            self._next_report = now + self._report_interval
+            self.update_allocation()
+            self._reporter(self.as_dict())
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return every statistic in a form ready to be written as JSON.
+
+        Returns:
+            Dictionary of counters, peaks, rates and phase timings.
+        """
+        return {
+            "generated": self.generated,
+            "expanded": self.expanded,
+            "duplicates": self.duplicates,
+            "frontier": self.frontier,
+            "peak_frontier": self.peak_frontier,
+            "peak_explored": self.peak_explored,
+            "peak_allocation": self.peak_allocation if self.trace_memory else None,
+            "elapsed": self.elapsed,
+            "nodes_per_sec": self.nodes_per_sec,
+            "phase_times": dict(self.phase_times) if self.timed else None,
+        }
@@ -2,11 +2,99 @@
 """
 
 import logging
-from copy import deepcopy
-from queue import LifoQueue, PriorityQueue, SimpleQueue
-from typing import Deque, List, Set, Tuple
-
-from src.board import GOAL_STATE, Board
+import math
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import psutil
+
+from src.board import INVERSE_MOVES, MOVES, Board, slide
+from src.explored import ExploredSet, new_explored_set
+from src.external import ExternalBFS
+from src.frontier import (
+    BucketFrontier,
+    FifoFrontier,
+    Frontier,
+    HeapFrontier,
+    LifoFrontier,
+)
+from src.heuristics import (
+    INADMISSIBLE_HEURISTICS,
+    get_heuristic,
+    get_heuristic_delta,
+    manhattan_to,
+)
+from src.parallel import STOP_CHECK_INTERVAL, STOPPED, ParallelIDAStar
+from src.perimeter import PerimeterDatabase, PerimeterHeuristic
+from src.pruning import PRUNED, get_move_automaton
+from src.stats import SearchStats
+from src.vectorized import DEFAULT_BEAM_WIDTH, BeamSearch
+
+ROUTINES = (
+    "bfs",
+    "dfs",
+    "iddfs",
+    "ish",
+    "astar",
+    "idastar",
+    "bibfs",
+    "biastar",
+    "arastar",
+    "beam",
+    "extbfs",
+)
+
+# The routines whose solutions are shortest; the informed ones rely on an
+# admissible heuristic.
+OPTIMAL_ROUTINES = (
+    "bfs",
+    "iddfs",
+    "astar",
+    "idastar",
+    "bibfs",
+    "biastar",
+    "extbfs",
+)
+
+# The routines that only accept heuristics outside INADMISSIBLE_HEURISTICS,
+# as their shortest solutions or arastar's bounds depend on it.
+ADMISSIBLE_ROUTINES = ("astar", "idastar", "biastar", "arastar")
+
+# The heuristic a search falling back to idastar switches to when its own
+# heuristic is inadmissible.
+FALLBACK_HEURISTIC = "manhattan"
+
+# Returned by the idastar search once the goal state has been reached.
+FOUND = -1
+
+# The frontiers ish, astar and biastar can order their nodes with.
+PRIORITY_QUEUES = {"bucket": BucketFrontier, "heap": HeapFrontier}
+
+# The deepest node bfs, dfs and ish expand unless another limit is given.
+DEFAULT_DEPTH_LIMIT = 16
+
+# The first and the smallest decrease of the arastar weight.
+ARASTAR_WEIGHT = 3.0
+ARASTAR_WEIGHT_STEP = 0.5
+
+# The routines that can stop at a perimeter database and splice in its path.
+PERIMETER_ROUTINES = ("bfs", "dfs", "iddfs", "ish", "astar", "idastar")
+
+# The routines whose search can continue past a goal to find other paths.
+RESUMABLE_ROUTINES = ("bfs", "dfs", "ish", "astar")
+
+# Why Tree.solve_iter stopped: the routine finished, no path is left, the
+# requested solutions were found, or a cap was reached.
+DONE_REASONS = ("finished", "exhausted", "solutions", "max_expansions", "time_limit")
+
+# Expansions between resident memory checks and the share of the memory
+# budget that triggers the idastar fallback.
+MEMORY_CHECK_INTERVAL = 1024
+MEMORY_THRESHOLD = 0.9
+
+
+class _Interrupted(Exception):
+    """Raised inside an idastar or iddfs iteration once the search must stop."""
 
 
 class Node:
@@ -17,11 +105,29 @@ class Node:
         parent_node (Node): The parent node for this node.
         current_board (Board): The state this node holds.
         action_used (list[str]): The actions used on the parent to reach this state.
+        last_action (str): The action used on the parent to reach this node.
         depth_count (int): The amount of moves that have led to this node.
-        children (List[Node]): A list of nodes created from this node.
+        h_value (int): The heuristic value cached by the searching Tree; None
+            until assigned.
+        f_value (int): The depth plus the cached heuristic value; None until
+            assigned.
     """
 
-    def __init__(self, state: Board, action: str = None, parent: "Node" = None) -> None:
+    __slots__ = (
+        "_parent_node",
+        "_current_board",
+        "_last_action",
+        "depth_count",
+        "h_value",
+        "f_value",
+    )
+
+    def __init__(
+        self,
+        state: Board,
+        action: Optional[str] = None,
+        parent: Optional["Node"] = None,
+    ) -> None:
         """Default constructor for a Node object. This is intended to be used
         for the creation of root nodes; all children nodes should ideally be
         created through public methods.
@@ -29,35 +135,40 @@ class Node:
         Parameters:
             input_state (Board): The state this node will hold.
             action (str): The valid move of this object. This move will
-                be applied to a deep copy of the state's current
+                be applied to a copy of the state's current
                 board and stored in this nodes current board.
             parent (Node): The parent node for this Node.
         """
         self._parent_node = None if parent is None else parent
-        self._current_board = deepcopy(state)
+        self._current_board = state.copy()
 
-        self._action_used = [] if parent is None else deepcopy(parent.action_used)
-        if action is not None:
-            self.action_used.append(action)
+        self._last_action = action
         self.depth_count = 0 if parent is None else parent.depth_count
         self._apply_action(action)
 
-        self.children = []
+        self.h_value = None
+        self.f_value = None
 
     def __lt__(self, other: "Node") -> bool:
-        """Compare two Node's heuristic value.
+        """Compare two Node's heuristic value, using the cached values when
+        both Nodes have one.
 
         Returns:
             True if left Node is less than; False otherwise.
         """
+        if self.h_value is not None and other.h_value is not None:
+            return self.h_value < other.h_value
         return self.calculate_heuristic() < other.calculate_heuristic()
 
     def __eq__(self, other: "Node") -> bool:
-        """Compare two Node's heurisitic value.
+        """Compare two Node's heurisitic value, using the cached values when
+        both Nodes have one.
 
         Returns:
             True if the values are equal; False otherwise.
         """
+        if self.h_value is not None and other.h_value is not None:
+            return self.h_value == other.h_value
         return self.calculate_heuristic() == other.calculate_heuristic()
 
     @property
@@ -78,15 +189,32 @@ class Node:
         """
         return self._current_board
 
+    @property
+    def last_action(self) -> str:
+        """Return the action used on the parent to reach this node.
+
+        Returns:
+            String representation of a move; None for a root without one.
+        """
+        return self._last_action
+
     @property
     def action_used(self) -> List[str]:
-        """Return the string representation of the move used to achieve
-        the current state from the parent.
+        """Return the string representation of the moves used to achieve
+        the current state from the root. Only the last move is stored on
+        each node, so the list is rebuilt from the parent nodes.
 
         Returns:
             List of string representations of a move.
         """
-        return self._action_used
+        actions = []
+        node = self
+        while node is not None:
+            if node.last_action is not None:
+                actions.append(node.last_action)
+            node = node.parent_node
+        actions.reverse()
+        return actions
 
     def get_parent_array(self) -> List[List[str]]:
         """Return the parent state of this array.
@@ -112,6 +240,14 @@ class Node:
         """
         return str(self.current_board)
 
+    def get_current_key(self) -> int:
+        """Return the packed state of this Node for use in sets and queues.
+
+        Returns:
+            Integer representation of this Node's state.
+        """
+        return self.current_board.packed
+
     def get_moves(self) -> Tuple[str]:
         """Wrapper function to get the moves of this node based on state.
 
@@ -121,7 +257,9 @@ class Node:
         return self.current_board.get_valid_moves()
 
     def move_board(self, action: str) -> "Node":
-        """Make a new Node by moving the current state.
+        """Make a new Node by moving the current state. Children are not
+        tracked by their parent, so a searched tree only keeps the frontier
+        and the parent links back to the root alive.
 
         Parameters:
             action (str): The valid action to apply.
@@ -129,14 +267,52 @@ class Node:
         Returns:
             A newly created node.
         """
-        new_node = Node(self.current_board, action, self)
-        self.children.append(new_node)
-        return new_node
+        return Node(self.current_board, action, self)
+
+    def move_child(self, code: int, target: int) -> "Node":
+        """Make a new Node by sliding one tile, skipping the move name
+        parsing and validation of move_board. This is the expansion path
+        used by Tree.
+
+        Parameters:
+            code (int): The move code, taken with target from the board's
+                layout.neighbors table.
+            target (int): The flat index of the tile to slide.
+
+        Returns:
+            A newly created node.
+        """
+        board = self._current_board
+        layout = board.layout
+        packed = slide(board.packed, board.blank, target, layout.tile_bits)
+
+        node = Node.__new__(Node)
+        node._parent_node = self
+        node._current_board = Board.from_packed(packed, target, layout)
+        node._last_action = MOVES[code]
+        node.depth_count = self.depth_count + 1
+        node.h_value = None
+        node.f_value = None
+        return node
+
+    def get_child_moves(self) -> Tuple[Tuple[int, int], ...]:
+        """Return the moves worth making from this node: every neighbour of
+        the blank except the one undoing the move that made this node.
+
+        Returns:
+            A tuple of (move code, target) pairs for move_child.
+        """
+        board = self._current_board
+        moves = board.layout.neighbors[board.blank]
+        if self._parent_node is None:
+            return moves
+        previous = self._parent_node.current_board.blank
+        return tuple(move for move in moves if move[1] != previous)
 
     def _apply_action(self, action: str) -> None:
         """Apply a valid move to the current state of this node. Invalid
         moves will be discarded. This function also presumes this
-        node's current_state variable is a deep copy.
+        node's current board is a copy.
 
         Parameters:
             action (str): The valid action to apply.
@@ -156,21 +332,47 @@ class Node:
         """
         return self.current_board.is_goal_state()
 
-    def calculate_heuristic(self) -> int:
+    def calculate_heuristic(self, heuristic: str = "misplaced") -> int:
         """Calculate the heuristic value of this state.
 
+        Parameters:
+            heuristic (str): The name of the heuristic to use, one of the
+                keys of src.heuristics.HEURISTICS.
+
         Returns:
-            Integer representing the number of misplaced titles on the current
-            board compared to the goal state.
+            Integer estimate of the moves left to reach the goal state. The
+            default counts the misplaced tiles compared to the goal state.
+        """
+        layout = self.current_board.layout
+        return get_heuristic(heuristic, layout)(self.get_current_key())
+
+    def assign_heuristic(self, h_value: int) -> None:
+        """Cache the heuristic value of this Node and its f-cost.
+
+        Parameters:
+            h_value (int): The heuristic value of this Node's state.
         """
-        goal = GOAL_STATE
-        counter = 0
-        # TODO: Could probably make this better
-        for row in range(4):
-            for col in range(4):
-                if self.get_current_array()[row][col] != goal[row][col]:
-                    counter += 1
-        return counter
+        self.h_value = h_value
+        self.f_value = self.depth_count + h_value
+
+
+class SearchEvent(NamedTuple):
+    """Event yielded by Tree.solve_iter.
+
+    Variables:
+        kind (str): "solution" for every goal Node found, "progress" for a
+            periodic snapshot, and "done" once as the last event.
+        node (Node): The goal Node of a solution; None otherwise.
+        stats (Dict[str, Any]): The SearchStats.as_dict snapshot when the
+            event was made.
+        reason (str): For the done event, one of DONE_REASONS; None
+            otherwise.
+    """
+
+    kind: str
+    node: Optional[Node]
+    stats: Dict[str, Any]
+    reason: Optional[str] = None
 
 
 class Tree:
@@ -180,40 +382,219 @@ class Tree:
     Variables:
         root (Node): The root node for this Tree.
         expand_count (int): The number of nodes this tree has expanded.
-        explored_set (List[str]): The collection of states that have already been
-            seen by this tree.
-        frontier (deque[Node]): The collection of all unexpanded nodes.
+        explored_set (ExploredSet): The collection of packed states that
+            have already been seen by this tree.
+        frontier (Frontier): The collection of all unexpanded nodes.
         goal_states(List[Node]): The list of goal state nodes found.
         routine (str): The routine used for this search tree.
+        heuristic (str): The heuristic used by the informed routines; the
+            backward half of biastar always uses Manhattan distance.
+        bound (int): The current f-cost threshold of the idastar routine, or
+            depth limit of the iddfs routine.
+        depth_limit (float): The deepest node expanded by bfs, dfs and ish,
+            or the longest solution searched by iddfs.
+        max_memory (int): The resident memory budget in bytes, if any.
+        stats (SearchStats): The counters, peaks and timings of the search.
+        workers (int): The worker processes sharing each idastar iteration.
+        weight (float): The heuristic weight of the current arastar pass.
+        time_budget (float): Seconds the search may run, if limited.
+        finished (bool): Whether the search has ended.
+        bounds (List[float]): For every arastar solution in goal_states, the
+            proven bound on its length over the optimal length.
+        suboptimality (float): The latest bound for the best solution.
+        beam_width (int): The most boards kept in every beam layer.
+        priority_queue (str): The frontier ordering ish, astar and biastar.
+        spill_dir (str): The directory extbfs writes its layers to; None for
+            a temporary directory.
+        explored_backend (str): The kind of explored set used.
+        perimeter (PerimeterDatabase): The states near the goal the search
+            stops at, if any.
     """
 
-    def __init__(self, root: Node, routine: str) -> None:
+    def __init__(
+        self,
+        root: Node,
+        routine: str,
+        heuristic: Optional[str] = None,
+        max_memory: Optional[int] = None,
+        stats: Optional[SearchStats] = None,
+        workers: Optional[int] = None,
+        weight: Optional[float] = None,
+        time_budget: Optional[float] = None,
+        depth_limit: Optional[int] = None,
+        beam_width: Optional[int] = None,
+        priority_queue: Optional[str] = None,
+        spill_dir: Optional[str] = None,
+        explored_backend: Optional[str] = None,
+        perimeter: Optional[PerimeterDatabase] = None,
+        interrupt: Optional[Callable[[], bool]] = None,
+    ) -> None:
         """Default constructor for a Tree object.
 
         Parameters:
             root (Node): The root node of this tree.
             routine (str): The routine used for this search tree.
+            heuristic (str): The heuristic used by the informed routines.
+                Defaults to "misplaced" for ish, "manhattan" for arastar,
+                whose bounds need a consistent heuristic, and for beam,
+                which evaluates boards in batches, and "linear" otherwise.
+            max_memory (int): The resident memory budget of the process in
+                bytes. Once it is nearly reached the stored frontier is
+                dropped and the search continues as idastar.
+            stats (SearchStats): The statistics to record into; by default
+                only the counters and peaks are kept.
+            workers (int): The number of processes sharing every idastar
+                iteration; None or 1 searches in this process. Only idastar
+                accepts more than one. Call close to stop the processes if
+                the search is abandoned.
+            weight (float): The heuristic weight of the first arastar pass,
+                which is weighted A*; defaults to ARASTAR_WEIGHT.
+            time_budget (float): Seconds from the first expansion after
+                which the search is finished, keeping the best solution
+                found; None for no limit. idastar and iddfs also check it
+                every STOP_CHECK_INTERVAL expansions of an iteration.
+            depth_limit (int): The deepest node expanded by bfs, dfs and ish,
+                DEFAULT_DEPTH_LIMIT by default, or the longest solution
+                searched by iddfs, unlimited by default.
+            beam_width (int): The most boards kept in every layer of the
+                beam routine; defaults to DEFAULT_BEAM_WIDTH.
+            priority_queue (str): The frontier of ish, astar and biastar, a
+                key of PRIORITY_QUEUES: "bucket", the default, for a bucket
+                queue over the small integer heuristic values, or "heap" for
+                a binary heap. arastar always uses a heap.
+            spill_dir (str): The directory the extbfs routine writes its
+                sorted layer files to, where they are kept as a table of
+                distances from the root; None for a temporary directory
+                removed by close.
+            explored_backend (str): The explored set, one of EXPLORED_SETS
+                of src.explored: "set", the default, for a built-in set,
+                "hash" for a compact hash table, "rank" for a bitset over
+                every board of a small size, or "bloom" for a Bloom filter
+                that may wrongly skip states.
+            perimeter (PerimeterDatabase): The states within a few moves of
+                the goal. A search reaching one stops and splices in the
+                stored path to the goal, and the heuristic is sharpened with
+                the exact distances. Only the routines of PERIMETER_ROUTINES
+                support it, in a single process; the optimal ones still
+                return shortest solutions.
+            interrupt (Callable[[], bool]): Checked after every expansion
+                and every STOP_CHECK_INTERVAL expansions of an idastar or
+                iddfs iteration; once it returns True the search is
+                finished, as when the time budget is used up.
+
+        Throws:
+            AssertionError if the routine, heuristic, priority queue or
+            explored set has not been implemented, the heuristic is not
+            admissible for an ADMISSIBLE_ROUTINES routine, several workers
+            are requested for a routine other than idastar, the explored set or
+            perimeter does not support the board size, or the routine does
+            not support the perimeter.
+            ImportError if the beam routine is used without NumPy.
         """
         self._root = root
+        self._stats = SearchStats() if stats is None else stats
+        self._max_memory = max_memory
+        self._memory_countdown = 1
+        self._workers = workers or 1
+        self._parallel: Optional[ParallelIDAStar] = None
         self.expand_count = 0
-        self._explored_set = set()
         self._goal_states = []
-
-        if routine not in ("bfs", "dfs", "ish"):
+        self._weight = ARASTAR_WEIGHT if weight is None else weight
+        self._time_budget = time_budget
+        self._deadline: Optional[float] = None
+        self._interrupt = interrupt
+        self._finished = False
+        self._bounds: List[float] = []
+        self._suboptimality = math.inf
+        if depth_limit is None:
+            self._depth_limit = math.inf if routine == "iddfs" else DEFAULT_DEPTH_LIMIT
+        else:
+            self._depth_limit = depth_limit
+        self._beam_width = beam_width or DEFAULT_BEAM_WIDTH
+        self._priority_queue = priority_queue or "bucket"
+        self._spill_dir = spill_dir
+        self._explored_backend = explored_backend or "set"
+        self._perimeter = perimeter
+        if self.priority_queue not in PRIORITY_QUEUES:
+            raise AssertionError("Priority queue requested has not been implemented")
+
+        if routine not in ROUTINES:
             raise AssertionError("Routine requested has not been implemented")
 
+        if heuristic is None:
+            heuristic = {
+                "ish": "misplaced",
+                "arastar": "manhattan",
+                "beam": "manhattan",
+            }.get(routine, "linear")
+        if heuristic in INADMISSIBLE_HEURISTICS and routine in ADMISSIBLE_ROUTINES:
+            raise AssertionError("Heuristic requested is not admissible")
+        if self.workers > 1 and routine != "idastar":
+            raise AssertionError("Routine requested cannot use several workers")
+        # Every state of a search shares the root's size and move tables.
+        self._layout = root.current_board.layout
+        self._explored_set = new_explored_set(self.explored_backend, self._layout)
+        if perimeter is not None:
+            if routine not in PERIMETER_ROUTINES or self.workers > 1:
+                raise AssertionError("Routine requested cannot use a perimeter")
+            if perimeter.layout is not self._layout:
+                raise AssertionError("Perimeter was built for another board size")
+        self._use_heuristic(heuristic)
+
         self._routine = routine
+        priority_frontier = PRIORITY_QUEUES[self.priority_queue]
+        self._frontier: Frontier
         if routine == "bfs":
-            self._frontier = SimpleQueue()
+            self._frontier = FifoFrontier()
         elif routine == "dfs":
-            self._frontier = LifoQueue()
-        elif routine == "ish":
-            self._frontier = PriorityQueue()
+            self._frontier = LifoFrontier()
+        elif routine in ("ish", "astar"):
+            self._frontier = priority_frontier()
+        elif routine == "arastar":
+            # Weighted priorities are fractional.
+            self._frontier = HeapFrontier()
+        elif routine in ("idastar", "iddfs"):
+            # Each iteration searches from the root without storing nodes.
+            self._frontier = LifoFrontier()
+        elif routine == "beam":
+            # The beam is held in arrays by the BeamSearch.
+            self._frontier = FifoFrontier()
+        elif routine == "extbfs":
+            # The layers are held in files by the ExternalBFS.
+            self._frontier = FifoFrontier()
+        elif routine == "bibfs":
+            self._frontier = FifoFrontier()
+            self._backward_frontier: Optional[Frontier] = FifoFrontier()
+        elif routine == "biastar":
+            self._frontier = priority_frontier()
+            self._backward_frontier = priority_frontier()
 
         if root.is_goal_state():
             raise AssertionError("Root is already in goal state.")
 
-        self._frontier.put(self.root)
+        self._evaluate(root)
+        self._bound = root.h_value
+        if routine == "iddfs":
+            # Every move shifts the blank one cell, so the solution length
+            # has the parity of the blank's distance from its goal cell.
+            board = root.current_board
+            row, col = divmod(board.blank, self._layout.cols)
+            goal_row, goal_col = divmod(self._layout.goal_blank, self._layout.cols)
+            self._bound = abs(row - goal_row) + abs(col - goal_col)
+        if routine in ("bibfs", "biastar"):
+            self._init_bidirectional()
+        elif routine == "arastar":
+            self._init_anytime()
+        elif routine == "beam":
+            self._beam: Optional[BeamSearch] = BeamSearch(
+                root.get_current_key(), heuristic, self._layout, self.beam_width
+            )
+        elif routine == "extbfs":
+            self._external = ExternalBFS(
+                root.get_current_key(), self._layout, self.spill_dir
+            )
+        else:
+            self._push(self._frontier, self.root)
         logging.info("Creating new tree with %s", root.get_current_array())
 
     @property
@@ -226,16 +607,16 @@ class Tree:
         return self._root
 
     @property
-    def explored_set(self) -> Set[str]:
+    def explored_set(self) -> ExploredSet:
         """Return the explored set of this Tree.
 
         Returns:
-            Set of strings containing the states seen by this Tree.
+            Set of packed states seen by this Tree.
         """
         return self._explored_set
 
     @property
-    def frontier(self) -> Deque[Node]:
+    def frontier(self) -> Frontier:
         """Return the current frontier of this Tree.
 
         Returns:
@@ -261,6 +642,155 @@ class Tree:
         """
         return self._routine
 
+    @property
+    def heuristic(self) -> str:
+        """Return the heuristic used by the informed routines.
+
+        Returns:
+            String name of the heuristic used.
+        """
+        return self._heuristic
+
+    @property
+    def bound(self) -> int:
+        """Return the f-cost threshold of the next idastar iteration.
+
+        Returns:
+            Integer threshold no path may exceed during the iteration.
+        """
+        return self._bound
+
+    @property
+    def depth_limit(self) -> float:
+        """Return the depth limit of the search.
+
+        Returns:
+            The deepest node expanded by bfs, dfs and ish, or the longest
+            solution searched by iddfs; infinity for no limit.
+        """
+        return self._depth_limit
+
+    @property
+    def beam_width(self) -> int:
+        """Return the width of the beam routine.
+
+        Returns:
+            The most boards kept in every beam layer.
+        """
+        return self._beam_width
+
+    @property
+    def priority_queue(self) -> str:
+        """Return the name of the frontier ordering ish, astar and biastar.
+
+        Returns:
+            A key of PRIORITY_QUEUES.
+        """
+        return self._priority_queue
+
+    @property
+    def spill_dir(self) -> Optional[str]:
+        """Return the directory the extbfs routine writes its layers to.
+
+        Returns:
+            The directory given; None for a temporary one.
+        """
+        return self._spill_dir
+
+    @property
+    def explored_backend(self) -> str:
+        """Return the kind of explored set used.
+
+        Returns:
+            One of EXPLORED_SETS of src.explored.
+        """
+        return self._explored_backend
+
+    @property
+    def perimeter(self) -> Optional[PerimeterDatabase]:
+        """Return the perimeter database the search stops at.
+
+        Returns:
+            The PerimeterDatabase; None if the search runs to the goal.
+        """
+        return self._perimeter
+
+    @property
+    def max_memory(self) -> Optional[int]:
+        """Return the resident memory budget of this Tree.
+
+        Returns:
+            The budget in bytes; None if memory is not limited.
+        """
+        return self._max_memory
+
+    @property
+    def workers(self) -> int:
+        """Return the number of processes sharing every idastar iteration.
+
+        Returns:
+            The number of worker processes; 1 for a single-process search.
+        """
+        return self._workers
+
+    @property
+    def weight(self) -> float:
+        """Return the heuristic weight of the current arastar pass.
+
+        Returns:
+            The weight multiplying the heuristic in the priority.
+        """
+        return self._weight
+
+    @property
+    def time_budget(self) -> Optional[float]:
+        """Return the seconds the search may run.
+
+        Returns:
+            The budget in seconds; None if time is not limited.
+        """
+        return self._time_budget
+
+    @property
+    def finished(self) -> bool:
+        """Return whether the search has ended, either because a goal was
+        found, arastar proved its best solution optimal, or the time budget
+        ran out. Further calls to expand do nothing.
+
+        Returns:
+            True once the search has ended.
+        """
+        return self._finished
+
+    @property
+    def bounds(self) -> List[float]:
+        """Return the suboptimality bound of every arastar solution.
+
+        Returns:
+            For every goal state, the factor its length is proven to be
+            within of the optimal length when it was found.
+        """
+        return self._bounds
+
+    @property
+    def suboptimality(self) -> float:
+        """Return the latest proven bound for the best solution.
+
+        Returns:
+            The factor the best solution is within of the optimal length;
+            infinity before a solution is found and 1 once it is optimal.
+        """
+        return self._suboptimality
+
+    @property
+    def stats(self) -> SearchStats:
+        """Return the statistics of this Tree's search.
+
+        Returns:
+            The SearchStats recording this search.
+        """
+        return self._stats
+
     def expand(self) -> None:
         """Expand the current node to create new nodes based on valid moves.
         The node selected will be pulled from the frontier.
@@ -271,41 +801,875 @@ class Tree:
         Returns:
             Return the Node if a goal state has been reached; None otherwise.
         """
+        if self.finished:
+            return
+        if self._deadline is None and self.time_budget is not None:
+            self._deadline = time.perf_counter() + self.time_budget
+
+        goal_count = len(self.goal_states)
+        self.stats.start()
+        start = self._clock()
+        try:
+            self._expand()
+        except IndexError:
+            self.stats.stop()
+            raise
+        finally:
+            self._lap("expand", start)
+            self.stats.record_explored(len(self.explored_set))
+            if self.routine not in ("idastar", "iddfs"):
+                self.stats.record_frontier(self._frontier_size())
+            self.stats.report_if_due()
+
+        if len(self.goal_states) > goal_count:
+            self.stats.stop()
+            if self.routine != "arastar":
+                self._finished = True
+        if self._interrupted():
+            logging.info("Search interrupted after %s expansions", self.expand_count)
+            self._finished = True
+            self.stats.stop()
+            self.close()
+
+    def solve_iter(
+        self,
+        solutions: Optional[int] = None,
+        max_expansions: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        progress_interval: Optional[float] = None,
+    ) -> Iterator[SearchEvent]:
+        """Drive the search, yielding every solution as it is found and
+        progress snapshots while it runs. The caller may stop iterating at
+        any time; the search can be continued by a later call, so its
+        worker processes and extbfs layer files are only released once it
+        finishes. Call close to release them from a search left unfinished.
+
+        Parameters:
+            solutions (int): The number of goal Nodes to find before
+                stopping. bfs, dfs, ish and astar keep searching past a goal
+                for other paths to it; the other routines stop when they
+                finish. None stops when the routine finishes, after its
+                first goal or, for arastar, once no better one can exist.
+            max_expansions (int): Stop once expand_count reaches this.
+            time_limit (float): Stop after this many seconds of this call.
+            progress_interval (float): Seconds between progress events;
+                None for none.
+
+        Returns:
+            Iterator of SearchEvent, ending with one done event.
+        """
+        start = time.perf_counter()
+        next_progress = math.inf
+        if progress_interval is not None:
+            next_progress = start + progress_interval
+        reported = len(self.goal_states)
+        found = 0
+
+        reason = None
+        try:
+            while True:
+                now = time.perf_counter()
+                if solutions is not None and found >= solutions:
+                    reason = "solutions"
+                    break
+                if self.finished and solutions is not None:
+                    # Carry on past the goal for the next solution.
+                    resumable = self.routine in RESUMABLE_ROUTINES
+                    if self.goal_states and resumable and not self._interrupted():
+                        self._finished = False
+                if self.finished:
+                    reason = "finished"
+                    break
+                if max_expansions is not None and self.expand_count >= max_expansions:
+                    reason = "max_expansions"
+                    break
+                if time_limit is not None and now - start >= time_limit:
+                    reason = "time_limit"
+                    break
+                if now >= next_progress:
+                    next_progress = now + progress_interval
+                    yield SearchEvent("progress", None, self.stats.as_dict())
+
+                try:
+                    self.expand()
+                except IndexError:
+                    reason = "exhausted"
+                    break
+
+                while reported < len(self.goal_states):
+                    found += 1
+                    node = self.goal_states[reported]
+                    reported += 1
+                    yield SearchEvent("solution", node, self.stats.as_dict())
+        finally:
+            # A capped or abandoned search keeps what a later call needs.
+            if self.finished or reason == "exhausted":
+                self.close()
+
+        logging.info("Search stopped: %s", reason)
+        yield SearchEvent("done", None, self.stats.as_dict(), reason)
+
+    def run(
+        self,
+        solutions: Optional[int] = None,
+        max_expansions: Optional[int] = None,
+        time_limit: Optional[float] = None,
+    ) -> List[Node]:
+        """Search until solve_iter stops, without raising when no solution
+        is found.
+
+        Parameters:
+            solutions (int): The number of goal Nodes to find, as for
+                solve_iter.
+            max_expansions (int): Stop once expand_count reaches this.
+            time_limit (float): Stop after this many seconds.
+
+        Returns:
+            The goal Nodes found by this call, possibly none.
+        """
+        return [
+            event.node
+            for event in self.solve_iter(solutions, max_expansions, time_limit)
+            if event.kind == "solution"
+        ]
+
+    def _expand(self) -> None:
+        """Expand one node, or run one iteration for idastar and iddfs."""
+        if self.routine == "idastar":
+            self._expand_iteration()
+            return
+
+        if self.routine == "iddfs":
+            self._deepening_iteration()
+            return
+
+        if self._memory_exhausted():
+            self._fall_back_to_idastar()
+            self._expand_iteration()
+            return
+
+        if self.routine in ("bibfs", "biastar"):
+            self._expand_bidirectional()
+            return
+
+        if self.routine == "arastar":
+            self._expand_anytime()
+            return
+
+        if self.routine == "beam":
+            self._expand_beam()
+            return
+
+        if self.routine == "extbfs":
+            self._expand_external()
+            return
+
         if self.frontier.qsize() == 0:
             raise IndexError("No solution found.")
 
-        node = None
+        start = self._clock()
         node = self.frontier.get()
+        self._lap("frontier", start)
 
-        if isinstance(node, tuple):
-            node = node[1]
-            logging.debug("Node: %s", node)
-
+        if self.perimeter is not None:
+            node = self._splice(node)
         if node.is_goal_state() is True:
             logging.info("New goal state found.")
             self.goal_states.append(node)
             return
 
-        if self._add_to_set(node) is True and node.depth_count <= 16:
+        within_depth = self.routine == "astar" or node.depth_count <= self.depth_limit
+        if self._add_to_set(node) is True and within_depth:
             self._add_moves_to_frontier(node)
 
         self._increment_expand_counter()
 
+    def _splice(self, node: Node) -> Node:
+        """Complete the path of a Node inside the perimeter with the stored
+        path to the goal. Nodes are taken in the order bfs and astar prove
+        shortest, so the path completed is a shortest one for them.
+
+        Parameters:
+            node (Node): The node taken from the frontier.
+
+        Returns:
+            The goal Node reached from it if it lies inside the perimeter,
+            otherwise the node itself.
+        """
+        h_value = node.h_value
+        if h_value is not None and h_value > self.perimeter.depth:
+            # The sharpened heuristic is only this low inside the perimeter.
+            return node
+        tail = self.perimeter.tail(node.get_current_key())
+        if tail is None:
+            return node
+        for code, target in tail:
+            node = node.move_child(code, target)
+        return node
+
     def _add_moves_to_frontier(self, node: Node) -> None:
         """Add new unexplored nodes to the frontier.
 
         Parameters:
             node (Node): The node to expand.
         """
-        for moves in node.get_moves():
-            new_node = node.move_board(moves)
+        for code, target in node.get_child_moves():
+            new_node = node.move_child(code, target)
+            self.stats.generated += 1
 
-            if self.routine == "ish":
-                self._frontier.put((new_node.calculate_heuristic(), new_node))
-                continue
-            self._frontier.put(new_node)
+            if self.routine in ("ish", "astar"):
+                self._evaluate(new_node, node)
+            self._push(self._frontier, new_node)
             logging.debug("New node added to frontier with depth %s", node.depth_count)
 
+    def _push(self, frontier: Frontier, node: Node) -> None:
+        """Add a Node to a frontier. ish orders nodes by heuristic value,
+        astar and biastar by f-cost and then by heuristic value, preferring
+        deeper nodes, and arastar by its weighted priority. Remaining ties
+        go to the most recent node.
+
+        Parameters:
+            frontier (Frontier): The frontier to add to.
+            node (Node): The Node, evaluated if the routine is informed.
+        """
+        start = self._clock()
+        if self.routine == "ish":
+            frontier.put(node, node.h_value)
+        elif self.routine in ("astar", "biastar"):
+            frontier.put(node, node.f_value, node.h_value)
+        elif self.routine == "arastar":
+            frontier.put(node, self._priority(node), node.h_value)
+        else:
+            frontier.put(node)
+        self._lap("frontier", start)
+
+    def _use_heuristic(self, heuristic: str) -> None:
+        """Set the heuristic evaluating new nodes, wrapped by the perimeter
+        if the search has one.
+
+        Parameters:
+            heuristic (str): The name of the heuristic.
+        """
+        self._heuristic = heuristic
+        self._heuristic_function = get_heuristic(heuristic, self._layout)
+        self._heuristic_delta = get_heuristic_delta(heuristic, self._layout)
+        if self._perimeter is not None:
+            self._heuristic_function = PerimeterHeuristic(
+                self._heuristic_function, self._perimeter
+            )
+            # Exact distances cannot be updated from the parent's value.
+            self._heuristic_delta = None
+
+    def _evaluate(self, node: Node, parent: Optional[Node] = None) -> None:
+        """Cache the heuristic value of a Node. When the parent's value is
+        known and the heuristic supports it, only the change caused by the
+        one sliding tile is calculated.
+
+        Parameters:
+            node (Node): The Node to evaluate.
+            parent (Node): The Node it was created from, if any.
+        """
+        start = self._clock()
+        if parent is None or parent.h_value is None or self._heuristic_delta is None:
+            h_value = self._heuristic_function(node.get_current_key())
+        else:
+            board = parent.current_board
+            target = node.current_board.blank
+            h_value = parent.h_value
+            if target != board.blank:
+                h_value += self._heuristic_delta(board.packed, board.blank, target)
+        node.assign_heuristic(h_value)
+        self._lap("heuristic", start)
+
+    def _expand_iteration(self) -> None:
+        """Run one idastar iteration, a depth-first search from the root that
+        prunes every path whose f-cost exceeds the current bound. Only the
+        moves of the current path are kept in memory, and the move pruning
+        machine of src.pruning skips paths duplicating a preferred one. An
+        interrupted iteration leaves the bound unchanged.
+
+        Throws:
+            IndexError if no path can exceed the bound.
+        """
+        board = self.root.current_board
+        try:
+            if self.workers > 1:
+                next_bound, path = self._parallel_iteration()
+            else:
+                self._transitions = get_move_automaton().transitions
+                path: List[Tuple[int, int]] = []
+                next_bound = self._bounded_search(
+                    board.packed, board.blank, 0, 0, path, self.root.h_value
+                )
+        except _Interrupted:
+            logging.info("Interrupted the idastar iteration at bound %s", self.bound)
+            return
+
+        if next_bound == FOUND:
+            logging.info("New goal state found.")
+            self.close()
+            node = self.root
+            for code, target in path:
+                node = node.move_child(code, target)
+            self.goal_states.append(node)
+            return
+
+        if next_bound == math.inf:
+            self.close()
+            raise IndexError("No solution found.")
+
+        logging.info("Raising idastar bound from %s to %s", self.bound, next_bound)
+        self._bound = next_bound
+
+    def _deepening_iteration(self) -> None:
+        """Run one iddfs iteration, a depth-first search from the root to the
+        current depth limit. Only the moves of the current path are kept in
+        memory and, as for idastar, the move pruning machine of src.pruning
+        skips paths duplicating a preferred one. Limits that cannot match
+        the solution's parity are skipped. An interrupted iteration leaves
+        the limit unchanged.
+
+        Throws:
+            IndexError if no path reaches the limit or the limit exceeds
+            depth_limit.
+        """
+        if self.bound > self.depth_limit:
+            raise IndexError(f"No solution found within {self.depth_limit} moves.")
+
+        board = self.root.current_board
+        self._transitions = get_move_automaton().transitions
+        path: List[Tuple[int, int]] = []
+        try:
+            result = self._depth_limited_search(board.packed, board.blank, 0, path)
+        except _Interrupted:
+            logging.info("Interrupted the iddfs iteration at limit %s", self.bound)
+            return
+
+        if result == FOUND:
+            logging.info("New goal state found.")
+            node = self.root
+            for code, target in path:
+                node = node.move_child(code, target)
+            self.goal_states.append(node)
+            return
+
+        if result == math.inf:
+            raise IndexError("No solution found.")
+
+        logging.info("Raising iddfs limit from %s to %s", self.bound, self.bound + 2)
+        self._bound += 2
+
+    def _depth_limited_search(
+        self, packed: int, blank: int, state: int, path: List[Tuple[int, int]]
+    ) -> float:
+        """Recursively search below a state until the path reaches the
+        current depth limit.
+
+        Parameters:
+            packed (int): The packed state to search from.
+            blank (int): The flat index of the blank in the state.
+            state (int): The move pruning machine's state for the moves made.
+            path (List[Tuple[int, int]]): The (move code, target) pairs made
+                so far; on success it holds the full solution.
+
+        Throws:
+            _Interrupted if the time budget is used up or the search is
+            interrupted.
+
+        Returns:
+            FOUND if the goal was reached, the limit plus one if a path was
+            cut off at the limit, otherwise infinity.
+        """
+        if packed == self._layout.goal_packed:
+            return FOUND
+        if self.perimeter is not None:
+            tail = self.perimeter.tail(packed)
+            if tail is not None:
+                path.extend(tail)
+                return FOUND
+        depth = len(path)
+        if depth == self.bound:
+            return depth + 1
+
+        self._increment_expand_counter()
+        if self.expand_count % STOP_CHECK_INTERVAL == 0 and self._interrupted():
+            raise _Interrupted()
+        self.stats.record_frontier(depth)
+        minimum = math.inf
+        transitions = self._transitions[state]
+        for code, target in self._layout.neighbors[blank]:
+            next_state = transitions[code]
+            if next_state == PRUNED:
+                continue
+
+            moved = slide(packed, blank, target, self._layout.tile_bits)
+            self.stats.generated += 1
+            path.append((code, target))
+            result = self._depth_limited_search(moved, target, next_state, path)
+            if result == FOUND:
+                return FOUND
+            minimum = min(minimum, result)
+            path.pop()
+
+        return minimum
+
+    def _parallel_iteration(self) -> Tuple[float, List[Tuple[int, int]]]:
+        """Run one idastar iteration across the worker processes.
+
+        Throws:
+            _Interrupted if the time budget is used up or the search is
+            interrupted.
+
+        Returns:
+            FOUND or the smallest f-cost that exceeded the bound, and the
+            (move code, target) pairs of the solution when found.
+        """
+        if self._parallel is None:
+            self._parallel = ParallelIDAStar(self.heuristic, self._layout, self.workers)
+
+        board = self.root.current_board
+        next_bound, path, expanded, generated = self._parallel.iterate(
+            board.packed, board.blank, self.root.h_value, self.bound, self._interrupted
+        )
+        self.expand_count += expanded
+        self.stats.expanded += expanded
+        self.stats.generated += generated
+        self.stats.record_frontier(len(path))
+        if next_bound == STOPPED:
+            raise _Interrupted()
+        return next_bound, path
+
+    def close(self) -> None:
+        """Stop the worker processes of a parallel idastar search and remove
+        the temporary layer files of extbfs. This is done automatically once
+        the search finishes; an extbfs search cannot be continued after."""
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+        if self.routine == "extbfs":
+            self._external.close()
+
+    def _bounded_search(
+        self,
+        packed: int,
+        blank: int,
+        depth: int,
+        state: int,
+        path: List[Tuple[int, int]],
+        h_value: int,
+    ) -> float:
+        """Recursively search below a state within the current bound.
+
+        Parameters:
+            packed (int): The packed state to search from.
+            blank (int): The flat index of the blank in the state.
+            depth (int): The number of moves made to reach the state.
+            state (int): The move pruning machine's state for the moves made.
+            path (List[Tuple[int, int]]): The (move code, target) pairs made
+                so far; on success it holds the full solution.
+            h_value (int): The heuristic value of the state.
+
+        Throws:
+            _Interrupted if the time budget is used up or the search is
+            interrupted.
+
+        Returns:
+            FOUND if the goal was reached, otherwise the smallest f-cost that
+            exceeded the bound.
+        """
+        f_value = depth + h_value
+        if f_value > self.bound:
+            return f_value
+        if packed == self._layout.goal_packed:
+            return FOUND
+        if self.perimeter is not None and h_value <= self.perimeter.depth:
+            # Within the bound, so the stored path completes a shortest one.
+            path.extend(self.perimeter.tail(packed))
+            return FOUND
+
+        self._increment_expand_counter()
+        if self.expand_count % STOP_CHECK_INTERVAL == 0 and self._interrupted():
+            raise _Interrupted()
+        self.stats.record_frontier(depth)
+        minimum = math.inf
+        transitions = self._transitions[state]
+        for code, target in self._layout.neighbors[blank]:
+            next_state = transitions[code]
+            if next_state == PRUNED:
+                continue
+
+            moved = slide(packed, blank, target, self._layout.tile_bits)
+            self.stats.generated += 1
+            start = self._clock()
+            if self._heuristic_delta is None:
+                new_h_value = self._heuristic_function(moved)
+            else:
+                new_h_value = h_value + self._heuristic_delta(packed, blank, target)
+            self._lap("heuristic", start)
+
+            path.append((code, target))
+            result = self._bounded_search(
+                moved, target, depth + 1, next_state, path, new_h_value
+            )
+            if result == FOUND:
+                return FOUND
+            minimum = min(minimum, result)
+            path.pop()
+
+        return minimum
+
+    def _init_bidirectional(self) -> None:
+        """Seed the forward frontier with the root and the backward frontier
+        with the goal state. The backward search estimates its distance to
+        the root with Manhattan distance.
+        """
+        layout = self._layout
+        goal = Node(Board.from_packed(layout.goal_packed, layout.goal_blank, layout))
+        self._backward_heuristic = manhattan_to(self.root.get_current_key(), layout)
+        self._backward_explored = new_explored_set(self.explored_backend, layout)
+        self._forward_seen = {self.root.get_current_key(): self.root}
+        self._backward_seen = {layout.goal_packed: goal}
+        self._meeting: Optional[Tuple[Node, Node]] = None
+        self._best_cost = math.inf
+
+        if self.routine == "biastar":
+            goal.assign_heuristic(self._backward_heuristic(layout.goal_packed))
+        self._push(self._frontier, self.root)
+        self._push(self._backward_frontier, goal)
+
+    def _expand_bidirectional(self) -> None:
+        """Expand one node from the smaller of the forward and backward
+        frontiers. bibfs stops at the first state generated by both
+        searches; biastar keeps the cheapest meeting until neither frontier
+        can hold a cheaper path.
+
+        Throws:
+            IndexError if both frontiers are empty without a meeting.
+        """
+        forward_size = self.frontier.qsize()
+        backward_size = self._backward_frontier.qsize()
+
+        if self.routine == "biastar" and self._meeting is not None:
+            lower_bound = max(
+                self.frontier.min_priority(), self._backward_frontier.min_priority()
+            )
+            if self._best_cost <= lower_bound:
+                self._join_meeting()
+                return
+
+        if forward_size == 0 and backward_size == 0:
+            raise IndexError("No solution found.")
+
+        forward = backward_size == 0 or 0 < forward_size <= backward_size
+        if forward:
+            frontier, explored = self.frontier, self.explored_set
+            seen, other_seen = self._forward_seen, self._backward_seen
+        else:
+            frontier, explored = self._backward_frontier, self._backward_explored
+            seen, other_seen = self._backward_seen, self._forward_seen
+
+        start = self._clock()
+        node = frontier.get()
+        self._lap("frontier", start)
+
+        start = self._clock()
+        closed = node.get_current_key() in explored
+        explored.add(node.get_current_key())
+        self._lap("duplicate_check", start)
+        if closed:
+            self.stats.duplicates += 1
+            return
+
+        for code, target in node.get_child_moves():
+            new_node = node.move_child(code, target)
+            key = new_node.get_current_key()
+            self.stats.generated += 1
+
+            start = self._clock()
+            previous = seen.get(key)
+            duplicate = (
+                previous is not None and previous.depth_count <= new_node.depth_count
+            )
+            if not duplicate:
+                seen[key] = new_node
+            self._lap("duplicate_check", start)
+            if duplicate:
+                self.stats.duplicates += 1
+                continue
+
+            if key in other_seen:
+                cost = new_node.depth_count + other_seen[key].depth_count
+                if cost < self._best_cost:
+                    self._best_cost = cost
+                    pair = (new_node, other_seen[key])
+                    self._meeting = pair if forward else pair[::-1]
+                if self.routine == "bibfs":
+                    self._join_meeting()
+                    return
+
+            if self.routine == "biastar" and forward:
+                self._evaluate(new_node, node)
+            elif self.routine == "biastar":
+                start = self._clock()
+                new_node.assign_heuristic(self._backward_heuristic(key))
+                self._lap("heuristic", start)
+            self._push(frontier, new_node)
+
+        self._increment_expand_counter()
+
+    def _expand_beam(self) -> None:
+        """Expand every board of the beam in one batch and keep the best
+        beam_width children by heuristic value.
+
+        Throws:
+            IndexError if every board of the beam is a dead end.
+        """
+        path, expanded, generated, duplicates = self._beam.step()
+        self.expand_count += expanded
+        self.stats.expanded += expanded
+        self.stats.generated += generated
+        self.stats.duplicates += duplicates
+        if path is None:
+            return
+
+        logging.info("New goal state found.")
+        node = self.root
+        for code, target in path:
+            node = node.move_child(code, target)
+        self.goal_states.append(node)
+
+    def _expand_external(self) -> None:
+        """Write the next breadth-first layer to disk, dropping children
+        already held by the current or previous layer.
+
+        Throws:
+            IndexError if every state reachable from the root has been seen.
+        """
+        path, expanded, generated, duplicates = self._external.step()
+        self.expand_count += expanded
+        self.stats.expanded += expanded
+        self.stats.generated += generated
+        self.stats.duplicates += duplicates
+        if path is None:
+            return
+
+        logging.info("New goal state found.")
+        node = self.root
+        for code, target in path:
+            node = node.move_child(code, target)
+        self.goal_states.append(node)
+
+    def _init_anytime(self) -> None:
+        """Seed the arastar frontier with the root. The explored set holds
+        the states expanded during the current pass.
+        """
+        root = self.root
+        key = root.get_current_key()
+        self._best_nodes = {key: root}
+        self._inconsistent = {}
+        self._incumbent: Optional[Node] = None
+        self._push(self._frontier, root)
+
+    def _priority(self, node: Node) -> float:
+        """Return the arastar priority of a Node.
+
+        Parameters:
+            node (Node): A Node with a cached heuristic value.
+
+        Returns:
+            The depth plus the weighted heuristic value.
+        """
+        return node.depth_count + self.weight * node.h_value
+
+    def _expand_anytime(self) -> None:
+        """Expand one node of the current arastar pass, a weighted A* search
+        that does not reopen the states it has expanded. Improved paths to
+        those states are set aside for the next pass. The pass ends once no
+        waiting node can lead to a shorter solution than the best one.
+
+        Throws:
+            IndexError if the board has no solution.
+        """
+        frontier = self._frontier
+        while frontier.qsize() > 0 and not self._is_open(frontier.peek()):
+            # Superseded by a shorter path to the same state.
+            frontier.get()
+
+        cost = math.inf if self._incumbent is None else self._incumbent.depth_count
+        if frontier.min_priority() >= cost:
+            self._finish_anytime_pass()
+            return
+
+        start = self._clock()
+        node = frontier.get()
+        self._lap("frontier", start)
+        self.explored_set.add(node.get_current_key())
+
+        goal = self._layout.goal_packed
+        for code, target in node.get_child_moves():
+            new_node = node.move_child(code, target)
+            new_key = new_node.get_current_key()
+            self.stats.generated += 1
+
+            start = self._clock()
+            previous = self._best_nodes.get(new_key)
+            duplicate = (
+                previous is not None and previous.depth_count <= new_node.depth_count
+            )
+            if not duplicate:
+                self._best_nodes[new_key] = new_node
+            self._lap("duplicate_check", start)
+            if duplicate:
+                self.stats.duplicates += 1
+                continue
+
+            if new_key == goal:
+                self._incumbent = new_node
+                continue
+            self._evaluate(new_node, node)
+            if new_key in self.explored_set:
+                self._inconsistent[new_key] = new_node
+                continue
+            self._push(frontier, new_node)
+
+        self._increment_expand_counter()
+
+    def _is_open(self, node: Node) -> bool:
+        """Check that an arastar frontier Node is still to be expanded.
+
+        Parameters:
+            node (Node): A Node taken from the frontier.
+
+        Returns:
+            True unless a shorter path to its state was found or the state
+            was already expanded in this pass.
+        """
+        key = node.get_current_key()
+        return self._best_nodes[key] is node and key not in self.explored_set
+
+    def _finish_anytime_pass(self) -> None:
+        """Publish the best solution with its suboptimality bound, then
+        lower the weight and start the next pass from the waiting and set
+        aside nodes, or finish once the solution is proven optimal.
+
+        Throws:
+            IndexError if the board has no solution.
+        """
+        if self._incumbent is None:
+            raise IndexError("No solution found.")
+
+        waiting = [node for node in self._frontier if self._is_open(node)]
+        waiting.extend(self._inconsistent.values())
+
+        # Every shorter solution passes through a waiting node.
+        cost = self._incumbent.depth_count
+        lower = min((node.f_value for node in waiting), default=math.inf)
+        bound = 1.0 if lower >= cost else min(self.weight, cost / lower)
+        if self.goal_states and self.goal_states[-1] is self._incumbent:
+            # No shorter solution, but a tighter proof for the same one.
+            bound = min(bound, self._bounds[-1])
+            self._bounds[-1] = bound
+        else:
+            self.goal_states.append(self._incumbent)
+            self._bounds.append(bound)
+        self._suboptimality = bound
+        logging.info(
+            "Solution of %s moves with weight %s is within %.3f of optimal",
+            cost,
+            self.weight,
+            bound,
+        )
+
+        if bound <= 1.0 or self.weight <= 1.0:
+            self._finished = True
+            return
+
+        self._weight = max(1.0, self.weight - ARASTAR_WEIGHT_STEP)
+        self._frontier = HeapFrontier()
+        for node in waiting:
+            self._push(self._frontier, node)
+        self._inconsistent = {}
+        self._explored_set.clear()
+
+    def _join_meeting(self) -> None:
+        """Join the forward and backward halves of the meeting into one
+        goal Node by undoing the backward moves from the forward Node.
+        """
+        node, backward_node = self._meeting
+        for move in reversed(backward_node.action_used):
+            node = node.move_board(INVERSE_MOVES[move])
+
+        logging.info("New goal state found.")
+        self.goal_states.append(node)
+
+    def _interrupted(self) -> bool:
+        """Check whether the time budget has been used up or the interrupt
+        asks the search to stop.
+
+        Returns:
+            True if the search must stop, False otherwise.
+        """
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            return True
+        return self._interrupt is not None and self._interrupt()
+
+    def _memory_exhausted(self) -> bool:
+        """Check the resident memory of this process against the budget
+        once every MEMORY_CHECK_INTERVAL expansions.
+
+        Returns:
+            True if the budget is nearly reached, False otherwise.
+        """
+        if self.max_memory is None:
+            return False
+
+        self._memory_countdown -= 1
+        if self._memory_countdown > 0:
+            return False
+        self._memory_countdown = MEMORY_CHECK_INTERVAL
+
+        rss = psutil.Process().memory_info().rss
+        return rss >= self.max_memory * MEMORY_THRESHOLD
+
+    def _fall_back_to_idastar(self) -> None:
+        """Release the stored frontier and explored states and continue the
+        search as idastar, whose memory only grows with the solution depth.
+        An inadmissible heuristic is replaced by FALLBACK_HEURISTIC, since
+        idastar needs an admissible one to bound its iterations.
+        """
+        heuristic = self.heuristic
+        if heuristic in INADMISSIBLE_HEURISTICS:
+            heuristic = FALLBACK_HEURISTIC
+        logging.warning(
+            "Memory budget of %s bytes nearly reached; falling back from %s "
+            "with %s to idastar with %s",
+            self.max_memory,
+            self.routine,
+            self.heuristic,
+            heuristic,
+        )
+        if self.routine in ("bibfs", "biastar"):
+            self._backward_frontier = None
+            self._backward_explored = set()
+            self._forward_seen = {}
+            self._backward_seen = {}
+
+        if self.routine == "arastar":
+            self._best_nodes = {}
+            self._inconsistent = {}
+        if self.routine == "beam":
+            self._beam = None
+        if self.routine == "extbfs":
+            self._external.close()
+
+        self._routine = "idastar"
+        self._frontier = LifoFrontier()
+        self._explored_set = new_explored_set(self.explored_backend, self._layout)
+        if heuristic != self.heuristic:
+            self._use_heuristic(heuristic)
+            self._evaluate(self.root)
+            self._bound = self.root.h_value
+
     def _add_to_set(self, state: Node) -> bool:
         """Add the node's state to the set if it has not already been seen.
 
@@ -315,12 +1679,51 @@ class Tree:
         Returns:
             True if the state was sucessfully added, False otherwise.
         """
-        if state.get_current_string() in self.explored_set:
-            return False
-
-        self.explored_set.add(state.get_current_string())
-        return True
+        start = self._clock()
+        key = state.get_current_key()
+        added = key not in self.explored_set
+        if added:
+            self.explored_set.add(key)
+        else:
+            self.stats.duplicates += 1
+        self._lap("duplicate_check", start)
+        return added
 
     def _increment_expand_counter(self) -> None:
         """Increment the number of expanded nodes by one."""
         self.expand_count += 1
+        self.stats.count_expansion()
+
+    def _frontier_size(self) -> int:
+        """Return the number of nodes waiting to be expanded.
+
+        Returns:
+            The size of the frontier, both frontiers for the bidirectional
+            routines.
+        """
+        if self.routine == "beam":
+            return len(self._beam)
+        if self.routine == "extbfs":
+            return len(self._external)
+        size = self.frontier.qsize()
+        if self.routine in ("bibfs", "biastar"):
+            size += self._backward_frontier.qsize()
+        return size
+
+    def _clock(self) -> float:
+        """Read the clock for a phase timing if timing is enabled.
+
+        Returns:
+            The current time, or 0.0 when phases are not timed.
+        """
+        return time.perf_counter() if self.stats.timed else 0.0
+
+    def _lap(self, phase: str, start: float) -> None:
+        """Add the time since start to a phase if timing is enabled.
+
+        Parameters:
+            phase (str): The phase the time was spent in.
+            start (float): The value returned by _clock.
+        """
+        if self.stats.timed:
+            self.stats.add_time(phase, time.perf_counter() - start)
@@ -1,4 +1,4 @@
-"""This module contains utility functions for the 15-puzzle solver.
+"""This module contains utility functions for the sliding puzzle solver.
 """
 
 from typing import List
@@ -19,12 +19,14 @@ def convert_string_to_list(matrix_string: str) -> List[str]:
     return matrix_list
 
 
-def validate_list(matrix_list: List[str]) -> bool:
+def validate_list(matrix_list: List[str], rows: int = 4, cols: int = 4) -> bool:
     """Validates the list to ensure the program can be started with the
     provided state.
 
     Parameters:
         matrix_list (List[str]): The list of characters to be analyzed.
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
 
     Throws:
         AssertionError for wrong number of character or improper
@@ -34,15 +36,71 @@ def validate_list(matrix_list: List[str]) -> bool:
         Return True if the above checks are passed, throw an above
         exception otherwise.
     """
-    expectations = "(expected 1-15 & '_' character)"
-    if len(matrix_list) != 16:
+    size = rows * cols
+    expectations = f"(expected 1-{size - 1} & '_' character)"
+    if len(matrix_list) != size:
         raise AssertionError(f"Invalid number of characters {expectations}.")
 
-    for num in range(1, 16):
+    for num in range(1, size):
         if str(num) not in matrix_list:
             raise AssertionError(f"Invalid numbers {expectations}.")
 
     if "_" not in matrix_list:
-        raise AssertionError("No blank provided {expectations}.")
+        raise AssertionError(f"No blank provided {expectations}.")
 
     return True
+
+
+def is_solvable(matrix_list: List[str], rows: int = 4, cols: int = 4) -> bool:
+    """Determine if the goal state can be reached from a validated list.
+
+    Parameters:
+        matrix_list (List[str]): The list of characters to be analyzed,
+            already checked by validate_list.
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
+
+    Returns:
+        True if the state is solvable, False otherwise.
+    """
+    tiles = [0 if elem == "_" else int(elem) for elem in matrix_list]
+    return is_solvable_permutation(tiles, rows, cols)
+
+
+def is_solvable_permutation(tiles: List[int], rows: int = 4, cols: int = 4) -> bool:
+    """Determine if the goal state can be reached from a board of tiles.
+
+    A slide swaps the blank with a tile, flipping the parity of the
+    permutation and of the blank's distance from its goal corner together.
+    The goal is therefore reachable exactly when both parities match, which
+    is the inversion count and blank row rule for a 4x4 board, and holds
+    for any number of rows and columns. The permutation parity is taken
+    from its cycles in linear time.
+
+    Parameters:
+        tiles (List[int]): The tile at every position, 0 being the blank.
+        rows (int): The number of rows of the board.
+        cols (int): The number of columns of the board.
+
+    Returns:
+        True if the state is solvable, False otherwise.
+    """
+    size = len(tiles)
+    targets = [size - 1 if tile == 0 else tile - 1 for tile in tiles]
+
+    swaps = 0
+    seen = [False] * size
+    for start in range(size):
+        if seen[start]:
+            continue
+        # A cycle of length k takes k - 1 swaps to sort.
+        pos = targets[start]
+        seen[start] = True
+        while pos != start:
+            seen[pos] = True
+            pos = targets[pos]
+            swaps += 1
+
+    row, col = divmod(tiles.index(0), cols)
+    distance = (rows - 1 - row) + (cols - 1 - col)
+    return swaps % 2 == distance % 2
@@ -0,0 +1,281 @@
+"""This module contains the NumPy backend evaluating boards in batches and
+the beam search routine built on it.
+
+A batch of boards is a uint8 array with one row per board and one column per
+position, holding the tile at every position. Heuristics are looked up for
+every tile of every board at once in tables precomputed per board size, and
+duplicate boards are removed with sorted set operations on whole rows.
+
+NumPy is optional; without it the module still imports but BatchHeuristic
+and BeamSearch raise ImportError.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from src.board import Layout
+from src.heuristics import get_layout_heuristics
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised without NumPy
+    np = None
+
+# The heuristics that can be evaluated in batches.
+BATCH_HEURISTICS = ("misplaced", "manhattan")
+
+# The boards kept in every layer of a beam search unless another width is given.
+DEFAULT_BEAM_WIDTH = 1000
+
+
+def _require_numpy() -> None:
+    """Check that NumPy is installed.
+
+    Throws:
+        ImportError if NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Batch evaluation and the beam routine need NumPy.")
+
+
+def unpack_boards(packed: Sequence[int], layout: Layout) -> "np.ndarray":
+    """Convert packed states into a batch of boards.
+
+    Parameters:
+        packed (Sequence[int]): The packed board states.
+        layout (Layout): The size of the boards.
+
+    Throws:
+        ImportError if NumPy is not installed.
+
+    Returns:
+        A uint8 array holding one board per row.
+    """
+    _require_numpy()
+    bits = layout.tile_bits
+    mask = layout.tile_mask
+    return np.array(
+        [
+            [(state >> (pos * bits)) & mask for pos in range(layout.size)]
+            for state in packed
+        ],
+        dtype=np.uint8,
+    ).reshape(len(packed), layout.size)
+
+
+def board_keys(boards: "np.ndarray") -> "np.ndarray":
+    """View every board of a batch as one opaque value so that boards can
+    be sorted, compared and used in set operations as a whole.
+
+    Parameters:
+        boards (np.ndarray): A batch of boards.
+
+    Returns:
+        One value per board; equal boards have equal values.
+    """
+    boards = np.ascontiguousarray(boards)
+    return boards.view(np.dtype((np.void, boards.shape[1]))).ravel()
+
+
+class BatchHeuristic:
+    """Class evaluating a heuristic for a batch of boards at once.
+
+    Variables:
+        name (str): The name of the heuristic.
+        layout (Layout): The size of the boards evaluated.
+    """
+
+    def __init__(self, name: str, layout: Layout) -> None:
+        """Default constructor for a BatchHeuristic object. The lookup table
+        giving every tile's cost at every position is built here.
+
+        Parameters:
+            name (str): The name of the heuristic, one of BATCH_HEURISTICS.
+            layout (Layout): The size of the boards to evaluate.
+
+        Throws:
+            AssertionError if the heuristic cannot be evaluated in batches.
+            ImportError if NumPy is not installed.
+        """
+        _require_numpy()
+        if name not in BATCH_HEURISTICS:
+            raise AssertionError("Heuristic requested cannot be evaluated in batches")
+
+        self.name = name
+        self.layout = layout
+        goal = unpack_boards([layout.goal_packed], layout)[0]
+        if name == "manhattan":
+            table = get_layout_heuristics(layout).distance_table(layout.goal_packed)
+            self._table = np.array(table, dtype=np.uint8)
+        else:
+            # A tile costs one anywhere but its goal position; so does the blank.
+            tiles = np.arange(layout.size)
+            self._table = (tiles[:, None] != goal[None, :]).astype(np.uint8)
+        self._positions = np.arange(layout.size)
+
+    def __call__(self, boards: "np.ndarray") -> "np.ndarray":
+        """Evaluate the heuristic for every board of a batch.
+
+        Parameters:
+            boards (np.ndarray): A batch of boards.
+
+        Returns:
+            The heuristic value of every board.
+        """
+        return self._table[boards, self._positions].sum(axis=1, dtype=np.int64)
+
+
+class BeamSearch:
+    """Class running a beam search over batches of boards. Every step expands
+    the whole beam at once and keeps the best boards by heuristic value.
+
+    Variables:
+        layout (Layout): The size of the board searched.
+        width (int): The most boards kept in every layer.
+        depth (int): The number of moves made by the boards of the beam.
+    """
+
+    def __init__(
+        self,
+        packed: int,
+        heuristic: str,
+        layout: Layout,
+        width: int = DEFAULT_BEAM_WIDTH,
+    ) -> None:
+        """Default constructor for a BeamSearch object.
+
+        Parameters:
+            packed (int): The packed root state.
+            heuristic (str): The name of the heuristic, one of
+                BATCH_HEURISTICS.
+            layout (Layout): The size of the board searched.
+            width (int): The most boards kept in every layer.
+
+        Throws:
+            AssertionError if the heuristic cannot be evaluated in batches.
+            ImportError if NumPy is not installed.
+        """
+        self.layout = layout
+        self.width = width
+        self.depth = 0
+        self._evaluate = BatchHeuristic(heuristic, layout)
+
+        # The target of every move code from every blank position, or -1.
+        self._targets = np.full((4, layout.size), -1, dtype=np.int64)
+        for blank, moves in enumerate(layout.neighbors):
+            for code, target in moves:
+                self._targets[code, blank] = target
+
+        self._boards = unpack_boards([packed], layout)
+        self._blanks = np.argmin(self._boards, axis=1)
+        self._codes = np.full(1, -1, dtype=np.int64)
+        self._seen = board_keys(self._boards)
+        # The parent index, move code and blank of every board of each layer.
+        self._layers: List[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]] = []
+
+    def __len__(self) -> int:
+        """Return the number of boards in the beam.
+
+        Returns:
+            The size of the current layer.
+        """
+        return len(self._boards)
+
+    def step(self) -> Tuple[Optional[List[Tuple[int, int]]], int, int, int]:
+        """Expand every board of the beam and keep the best children that
+        were not seen in an earlier layer.
+
+        Throws:
+            IndexError if the beam is empty.
+
+        Returns:
+            The solution as (move code, target) pairs if a child is the goal
+            state, otherwise None, then the boards expanded, generated and
+            rejected as duplicates.
+        """
+        if len(self._boards) == 0:
+            raise IndexError("No solution found.")
+
+        boards, parents, codes, blanks = [], [], [], []
+        for code in range(4):
+            targets = self._targets[code, self._blanks]
+            # The move undoing the one that led to a board is never made.
+            index = np.nonzero((targets >= 0) & (self._codes != code ^ 1))[0]
+            moved = self._boards[index]
+            rows = np.arange(len(index))
+            target = targets[index]
+            moved[rows, self._blanks[index]] = moved[rows, target]
+            moved[rows, target] = 0
+            boards.append(moved)
+            parents.append(index)
+            codes.append(np.full(len(index), code, dtype=np.int64))
+            blanks.append(target)
+
+        boards = np.concatenate(boards)
+        parents = np.concatenate(parents)
+        codes = np.concatenate(codes)
+        blanks = np.concatenate(blanks)
+        expanded = len(self._boards)
+        generated = len(boards)
+
+        # Keep the first copy of every board that no earlier layer held.
+        keys, first = np.unique(board_keys(boards), return_index=True)
+        fresh = ~np.isin(keys, self._seen)
+        keep = first[fresh]
+        keys = keys[fresh]
+        duplicates = generated - len(keep)
+        boards = boards[keep]
+        parents = parents[keep]
+        codes = codes[keep]
+        blanks = blanks[keep]
+
+        h_values = self._evaluate(boards)
+        goals = np.nonzero(h_values == 0)[0]
+        if len(goals) > 0:
+            return (
+                self._path(goals[0], parents, codes, blanks),
+                expanded,
+                generated,
+                duplicates,
+            )
+
+        if len(boards) > self.width:
+            best = np.argpartition(h_values, self.width - 1)[: self.width]
+            boards = boards[best]
+            parents = parents[best]
+            codes = codes[best]
+            blanks = blanks[best]
+            keys = keys[best]
+
+        self._seen = np.union1d(self._seen, keys)
+        self._layers.append((parents, codes, blanks))
+        self._boards = boards
+        self._codes = codes
+        self._blanks = blanks
+        self.depth += 1
+        return None, expanded, generated, duplicates
+
+    def _path(
+        self,
+        index: int,
+        parents: "np.ndarray",
+        codes: "np.ndarray",
+        blanks: "np.ndarray",
+    ) -> List[Tuple[int, int]]:
+        """Follow the parent indices of the layers back to the root.
+
+        Parameters:
+            index (int): The index of the goal board among the children.
+            parents (np.ndarray): The parent index of every child.
+            codes (np.ndarray): The move code leading to every child.
+            blanks (np.ndarray): The blank position of every child.
+
+        Returns:
+            The (move code, target) pairs leading from the root to the goal.
+        """
+        path = [(int(codes[index]), int(blanks[index]))]
+        index = parents[index]
+        for layer_parents, layer_codes, layer_blanks in reversed(self._layers):
+            path.append((int(layer_codes[index]), int(layer_blanks[index])))
+            index = layer_parents[index]
+        path.reverse()
+        return path
@@ -0,0 +1,65 @@
+import sys
+import time
+
+import pytest
+
+import agent
+from src.batch import solve_batch, solve_board
+
+BOARDS = [
+    "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15",
+    "2 6 3 4 1 10 7 8 5 14 11 12 9 _ 13 15",
+    "1 2 3",
+    "1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 _",
+]
+
+
+def test_solve_board():
+    result = solve_board(0, BOARDS[0], "astar")
+    assert result["status"] == "solved"
+    assert len(result["moves"]) == 7
+    assert result["expanded"] > 0
+
+    assert solve_board(1, BOARDS[1], "astar")["status"] == "unsolvable"
+    assert solve_board(2, BOARDS[2], "astar")["status"] == "invalid"
+    assert solve_board(3, BOARDS[3], "astar")["moves"] == []
+
+    result = solve_board(0, BOARDS[0], "bfs", timeout=0)
+    assert result["status"] == "timeout"
+
+    # Korf's first instance; one idastar iteration outlasts the timeout.
+    start = time.perf_counter()
+    korf = "13 6 8 12 15 14 _ 10 11 7 4 5 9 1 3 2"
+    result = solve_board(4, korf, "idastar", timeout=0.5)
+    assert result["status"] == "timeout"
+    assert time.perf_counter() - start < 1.0
+
+    # The first weighted arastar solution is longer than the optimal 30.
+    hard = "15 11 2 4 1 _ 3 7 9 10 14 8 13 6 5 12"
+    assert len(solve_board(5, hard, "arastar")["moves"]) == 30
+
+
+def test_batch_rejects_single_board_options(monkeypatch, capsys):
+    monkeypatch.setattr(
+        sys, "argv", ["agent.py", "astar", "--batch", "-", "--stats", "json"]
+    )
+    with pytest.raises(SystemExit) as error:
+        agent.main()
+    assert error.value.code == 2
+    assert "--stats cannot be used with --batch" in capsys.readouterr().err
+
+
+def test_solve_batch_ordered():
+    results = list(solve_batch(BOARDS + [""], "idastar", workers=2, ordered=True))
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert [result["status"] for result in results] == [
+        "solved",
+        "unsolvable",
+        "invalid",
+        "solved",
+    ]
+
+
+def test_solve_batch_completion():
+    results = list(solve_batch(BOARDS * 3, "astar", workers=2))
+    assert sorted(result["index"] for result in results) == list(range(12))
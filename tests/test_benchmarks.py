@@ -0,0 +1,56 @@
+from benchmarks.suite import (
+    DEFAULT_SETS,
+    SET_LIMITS,
+    compare_results,
+    instance_set,
+    korf_boards,
+    random_walk_boards,
+    run_suite,
+)
+from src.utils import convert_string_to_list, is_solvable, validate_list
+
+
+def test_korf_boards():
+    boards = korf_boards()
+    assert len(boards) == 100
+    for board in boards:
+        matrix_list = convert_string_to_list(board)
+        assert validate_list(matrix_list)
+        assert is_solvable(matrix_list)
+
+    # Korf's first instance, rotated and relabelled.
+    assert boards[0] == "13 6 8 12 15 14 _ 10 11 7 4 5 9 1 3 2"
+
+
+def test_random_walk_boards():
+    boards = random_walk_boards(8, 5)
+    assert boards == random_walk_boards(8, 5)
+    assert len(boards) == 5
+    assert instance_set("walk-8")[:5] == boards
+
+
+def test_run_and_compare():
+    results = run_suite(["idastar"], ["walk-8"], limit=3)
+    result = results["results"]["idastar"]["walk-8"]
+    assert result["instances"] == 3
+    assert result["solved"] == 3
+    assert result["nodes_per_sec"] > 0
+    assert result["peak_memory"] > 0
+    assert compare_results(results, results) == []
+
+    slower = {"results": {"idastar": {"walk-8": dict(result)}}}
+    slower["results"]["idastar"]["walk-8"]["nodes_per_sec"] /= 2
+    slower["results"]["idastar"]["walk-8"]["peak_memory"] *= 2
+    assert len(compare_results(results, slower)) == 2
+
+
+def test_set_limits(monkeypatch):
+    monkeypatch.setitem(SET_LIMITS, "korf100", (1, 0.2))
+    results = run_suite(["idastar"])["results"]["idastar"]
+    assert set(results) == set(DEFAULT_SETS["idastar"])
+    korf = results["korf100"]
+    assert korf["instances"] == 1
+    assert korf["timeout"] == 0.2
+    assert korf["solved"] == 0
+    assert korf["per_instance"][0]["time"] < 1.0
+    assert korf["peak_memory"] > 0
@@ -2,7 +2,19 @@ from copy import deepcopy
 
 import pytest
 
-from src.board import GOAL_STATE, Board
+from src.board import (
+    DEFAULT_LAYOUT,
+    GOAL_PACKED,
+    GOAL_STATE,
+    LEFT,
+    UP,
+    Board,
+    find_blank,
+    get_layout,
+    pack_state,
+    parse_size,
+    unpack_state,
+)
 from src.utils import convert_string_to_list
 
 
@@ -73,3 +85,73 @@ class TestBoard:
             board.move(move)
 
         assert board.is_goal_state()
+
+    def test_packed(self, board):
+        tiles = convert_string_to_list("1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15")
+        assert unpack_state(pack_state(tiles)) == tiles
+        assert board.packed == pack_state(tiles)
+        assert board.blank == 1
+        assert board.get_blank_spot() == (0, 1)
+        assert find_blank(board.packed) == 1
+        assert find_blank(GOAL_PACKED) == 15
+
+        goal = [elem for row in GOAL_STATE for elem in row]
+        assert pack_state(goal) == GOAL_PACKED
+
+        copy_board = board.copy()
+        assert copy_board == board
+        assert copy_board.move("Up") is True
+        assert copy_board != board
+        assert copy_board.blank == 5
+        assert copy_board.packed == Board.from_packed(copy_board.packed, 5).packed
+
+
+class TestLayout:
+    def test_default(self):
+        assert get_layout(4, 4) is DEFAULT_LAYOUT
+        assert DEFAULT_LAYOUT.goal_state == GOAL_STATE
+        assert DEFAULT_LAYOUT.goal_packed == GOAL_PACKED
+        assert DEFAULT_LAYOUT.blank_moves[0] == (("Up", 4), ("Left", 1))
+        assert DEFAULT_LAYOUT.neighbors[0] == ((UP, 4), (LEFT, 1))
+
+    def test_sizes(self):
+        small = get_layout(3, 3)
+        assert small.tile_bits == 4
+        assert small.goal_state == [["1", "2", "3"], ["4", "5", "6"], ["7", "8", "_"]]
+        assert small.blank_moves[4] == (
+            ("Up", 7),
+            ("Down", 1),
+            ("Left", 5),
+            ("Right", 3),
+        )
+
+        large = get_layout(5, 5)
+        assert large.tile_bits == 5
+        assert large.unpack(large.goal_packed) == [
+            str(tile) for tile in range(1, 25)
+        ] + ["_"]
+
+        wide = parse_size("2x5")
+        assert (wide.rows, wide.cols, wide.goal_blank) == (2, 5, 9)
+        assert wide.blank_moves[9] == (("Down", 4), ("Right", 8))
+
+        with pytest.raises(ValueError):
+            parse_size("3by3")
+        with pytest.raises(ValueError):
+            parse_size("1x16")
+        with pytest.raises(AssertionError):
+            get_layout(1, 4)
+
+    def test_board(self):
+        layout = get_layout(3, 3)
+        board = Board(convert_string_to_list("1 2 3 4 5 6 7 _ 8"), layout)
+        assert board.layout is layout
+        assert board.get_blank_spot() == (2, 1)
+        assert board.get_valid_moves() == ("Down", "Left", "Right")
+        assert board.move("Up") is False
+        assert str(board).count("-") == 24
+
+        assert board.move("Left") is True
+        assert board.is_goal_state()
+        assert board == Board.from_packed(layout.goal_packed, 8, layout)
+        assert board != Board.from_packed(layout.goal_packed, 8)
@@ -0,0 +1,126 @@
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import agent
+from src.board import Board, get_layout
+from src.cache import SolutionCache, reflect_state
+from src.utils import convert_string_to_list
+
+STRING = "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15"
+MOVES = ["Left", "Up", "Right", "Up", "Up", "Left", "Left"]
+
+
+def reflect(board):
+    layout = board.layout
+    row, col = divmod(board.blank, layout.cols)
+    return Board.from_packed(
+        reflect_state(board.packed, layout), col * layout.cols + row, layout
+    )
+
+
+def solves(board, moves):
+    board = board.copy()
+    return all(board.move(move) for move in moves) and board.is_goal_state()
+
+
+def store(path, index):
+    cache = SolutionCache(path, max_entries=1000)
+    board = Board(convert_string_to_list(STRING))
+    for move in MOVES[:index]:
+        board.move(move)
+    cache.put(board, MOVES[index:], True)
+    return cache.get(board) == MOVES[index:]
+
+
+def test_reflect_state():
+    for side in (3, 4, 5):
+        layout = get_layout(side, side)
+        assert reflect_state(layout.goal_packed, layout) == layout.goal_packed
+
+    board = Board(convert_string_to_list(STRING))
+    assert reflect_state(reflect(board).packed, board.layout) == board.packed
+    assert reflect(board).current_state[1] == ["_", "10", "6", "7"]
+
+
+def test_get_and_put(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.db"))
+    board = Board(convert_string_to_list(STRING))
+    assert cache.get(board) is None
+
+    cache.put(board, MOVES, optimal=False)
+    assert cache.get(board) == MOVES
+    assert cache.get(board, optimal=True) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # A mirrored board shares the entry with its moves reflected.
+    mirrored = reflect(board)
+    assert len(cache) == 1
+    assert solves(mirrored, cache.get(mirrored))
+
+    longer = MOVES + ["Up", "Down"]
+    cache.put(board, longer, optimal=False)
+    assert cache.get(board) == MOVES
+    cache.put(mirrored, cache.get(mirrored), optimal=True)
+    assert cache.get(board, optimal=True) == MOVES
+    assert len(cache) == 1
+    cache.close()
+
+    # Entries persist for other processes.
+    assert SolutionCache(str(tmp_path / "cache.db")).get(board) == MOVES
+
+
+def test_eviction(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.db"), max_entries=3)
+    board = Board(convert_string_to_list(STRING))
+    boards = []
+    for move in MOVES:
+        boards.append(board.copy())
+        cache.put(board, ["Up"])
+        board.move(move)
+
+    assert len(cache) == 3
+    assert cache.get(boards[0]) is None
+    assert cache.get(boards[-1]) == ["Up"]
+
+
+def test_count_of_existing_database(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SolutionCache(path)
+    board = Board(convert_string_to_list(STRING))
+    for move in MOVES:
+        cache.put(board, ["Up"])
+        board.move(move)
+    cache.close()
+
+    # A database written before the running count was kept is counted once.
+    connection = sqlite3.connect(path)
+    connection.execute("DROP TABLE entry_count")
+    connection.commit()
+    connection.close()
+    assert len(SolutionCache(path)) == len(MOVES)
+
+
+def test_concurrent_writers(tmp_path):
+    path = str(tmp_path / "cache.db")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(store, [path] * 7, range(7)))
+    assert all(results)
+    assert len(SolutionCache(path)) == 7
+
+
+def test_bloom_run_not_cached_as_optimal(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    for explored_set in ("bloom", "set"):
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            ["agent.py", "bfs", STRING, "--explored-set", explored_set]
+            + ["--cache", path],
+        )
+        assert agent.main() == 0
+
+        cache = SolutionCache(path)
+        board = Board(convert_string_to_list(STRING))
+        assert cache.get(board) == MOVES
+        assert (cache.get(board, optimal=True) == MOVES) == (explored_set == "set")
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from src.board import Board, get_layout
+from src.explored import (
+    EXPLORED_SETS,
+    BloomExploredSet,
+    HashExploredSet,
+    RankExploredSet,
+    new_explored_set,
+)
+from src.tree import Node, Tree
+from src.utils import convert_string_to_list
+
+
+def random_keys(count, bits=64):
+    rng = random.Random(3)
+    return [rng.getrandbits(bits) | 1 for _ in range(count)]
+
+
+def test_hash():
+    explored = HashExploredSet(get_layout(4, 4), capacity=8)
+    keys = random_keys(1000)
+    for key in keys[:500]:
+        explored.add(key)
+        explored.add(key)
+    assert len(explored) == 500
+    assert all(key in explored for key in keys[:500])
+    assert not any(key in explored for key in keys[500:])
+
+    with pytest.raises(AssertionError):
+        HashExploredSet(get_layout(5, 5))
+
+
+def test_rank():
+    layout = get_layout(3, 3)
+    explored = RankExploredSet(layout)
+    assert explored.rank(layout.pack(list("87654321_"))) == 362879
+    assert explored.rank(layout.pack(list("_12345678"))) == 0
+
+    boards = ["4 1 3 7 2 6 _ 5 8", "1 2 3 4 5 6 7 _ 8", "8 6 7 2 5 4 3 _ 1"]
+    packed = [layout.pack(convert_string_to_list(board)) for board in boards]
+    for key in packed[:2]:
+        explored.add(key)
+    explored.add(packed[0])
+    assert len(explored) == 2
+    assert packed[0] in explored and packed[1] in explored
+    assert packed[2] not in explored
+
+    with pytest.raises(AssertionError):
+        RankExploredSet(get_layout(4, 4))
+
+
+def test_bloom():
+    explored = BloomExploredSet(get_layout(4, 4), capacity=10000, error_rate=0.01)
+    assert explored.hash_count == 7
+    keys = random_keys(20000)
+    for key in keys[:10000]:
+        explored.add(key)
+    assert all(key in explored for key in keys[:10000])
+    false_positives = sum(key in explored for key in keys[10000:])
+    assert false_positives < 2 * 0.01 * 10000
+
+
+@pytest.mark.parametrize("name", EXPLORED_SETS)
+def test_clear(name):
+    layout = get_layout(3, 3)
+    boards = ["4 1 3 7 2 6 _ 5 8", "1 2 3 4 5 6 7 _ 8"]
+    packed = [layout.pack(convert_string_to_list(board)) for board in boards]
+    explored = new_explored_set(name, layout)
+    explored.add(packed[0])
+    explored.clear()
+    assert len(explored) == 0
+    assert packed[0] not in explored
+
+    explored.add(packed[1])
+    assert len(explored) == 1
+    assert packed[1] in explored and packed[0] not in explored
+
+
+@pytest.mark.parametrize("name", EXPLORED_SETS)
+def test_tree(name):
+    board = Board(convert_string_to_list("4 1 3 7 2 6 _ 5 8"), get_layout(3, 3))
+    for routine in ("bfs", "astar", "bibfs", "arastar"):
+        tree = Tree(Node(board), routine, explored_backend=name)
+        assert tree.explored_backend == name
+        goals = tree.run()
+        assert goals[0].is_goal_state()
+        assert goals[0].depth_count == 6
+        assert tree.root.get_current_key() in tree.explored_set
+        assert len(tree.explored_set) > 0
+
+    with pytest.raises(AssertionError):
+        new_explored_set("trie", board.layout)
@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from src.board import Board, get_layout
+from src.external import ExternalBFS
+from src.tree import Node, Tree
+from src.utils import convert_string_to_list
+
+
+def test_layers(tmp_path):
+    layout = get_layout(3, 3)
+    search = ExternalBFS(layout.goal_packed, layout, str(tmp_path), 5000)
+    with pytest.raises(IndexError):
+        while True:
+            path, expanded, generated, duplicates = search.step()
+            assert path is None
+            assert expanded == search.layer_sizes[-2]
+            assert duplicates <= generated
+
+    # Every solvable 3x3 board is at most 31 moves from the goal.
+    assert sum(search.layer_sizes) == 181440
+    assert search.depth == 31
+    assert search.layer_sizes[:4] == [1, 2, 4, 8]
+    assert search.layer_sizes[-1] == 2
+    assert not any(name.startswith("run-") for name in os.listdir(tmp_path))
+
+    board = Board(convert_string_to_list("4 1 3 7 2 6 _ 5 8"), layout)
+    assert search.distance(board.packed) == 6
+    assert search.distance(layout.goal_packed) == 0
+    search.close()
+    assert os.path.exists(search.layer_path(31))
+
+
+def test_path():
+    layout = get_layout(3, 3)
+    board = Board(convert_string_to_list("8 6 7 2 5 4 3 _ 1"), layout)
+    search = ExternalBFS(board.packed, layout, buffer_states=100)
+    path = None
+    while path is None:
+        path, _, _, _ = search.step()
+    assert len(path) == search.depth == 31
+
+    node = Node(board)
+    for code, target in path:
+        node = node.move_child(code, target)
+    assert node.is_goal_state()
+
+    search.close()
+    assert not os.path.exists(search.directory)
+
+
+def test_tree(tmp_path):
+    string = "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15"
+    tree = Tree(Node(Board(convert_string_to_list(string))), "extbfs")
+    goals = tree.run()
+    assert len(goals) == 1
+    assert goals[0].is_goal_state()
+    assert goals[0].depth_count == 7
+    assert tree.stats.expanded == tree.expand_count
+    assert tree.stats.duplicates > 0
+    assert not os.path.exists(tree._external.directory)
+
+    tree = Tree(Node(Board(convert_string_to_list(string))), "extbfs")
+    assert list(tree.solve_iter(max_expansions=10))[-1].reason == "max_expansions"
+    assert os.path.exists(tree._external.directory)
+    goals = tree.run()
+    assert [goal.depth_count for goal in goals] == [7]
+    assert not os.path.exists(tree._external.directory)
+
+    tree = Tree(
+        Node(Board(convert_string_to_list(string))), "extbfs", spill_dir=str(tmp_path)
+    )
+    assert tree.spill_dir == str(tmp_path)
+    tree.run()
+    assert sorted(os.listdir(tmp_path)) == [f"layer-{d:03d}.bin" for d in range(8)]
@@ -0,0 +1,64 @@
+import math
+
+import pytest
+
+from src.frontier import FRONTIERS, BucketFrontier, Frontier, HeapFrontier
+
+
+@pytest.mark.parametrize("name", list(FRONTIERS))
+def test_empty(name):
+    frontier = FRONTIERS[name]()
+    assert frontier.qsize() == len(frontier) == 0
+    assert frontier.min_priority() == math.inf
+    assert list(frontier) == []
+    with pytest.raises(IndexError):
+        frontier.get()
+
+
+def test_incomplete_frontier():
+    class PutOnly(Frontier):
+        def put(self, item, priority=0, tie=0):
+            pass
+
+    with pytest.raises(TypeError):
+        Frontier()
+    with pytest.raises(TypeError):
+        PutOnly()
+
+
+def test_fifo_and_lifo():
+    fifo = FRONTIERS["fifo"]()
+    lifo = FRONTIERS["lifo"]()
+    for item in "abc":
+        fifo.put(item, priority=5)
+        lifo.put(item, priority=5)
+    assert fifo.peek() == "a"
+    assert [fifo.get() for _ in range(3)] == ["a", "b", "c"]
+    assert lifo.peek() == "c"
+    assert [lifo.get() for _ in range(3)] == ["c", "b", "a"]
+
+
+@pytest.mark.parametrize("frontier_class", [BucketFrontier, HeapFrontier])
+def test_priority_order(frontier_class):
+    frontier = frontier_class()
+    entries = [("a", 3, 1), ("b", 1, 2), ("c", 1, 0), ("d", 3, 1), ("e", 1, 2)]
+    for item, priority, tie in entries:
+        frontier.put(item, priority, tie)
+    assert len(frontier) == 5
+    assert sorted(frontier) == list("abcde")
+    assert frontier.min_priority() == 1
+    assert frontier.peek() == "c"
+
+    # Lowest priority, then lowest tie value, then the newest item.
+    assert [frontier.get() for _ in range(3)] == ["c", "e", "b"]
+    frontier.put("f", 2)
+    assert frontier.min_priority() == 2
+    assert [frontier.get() for _ in range(3)] == ["f", "d", "a"]
+    assert frontier.qsize() == 0
+
+
+def test_heap_does_not_compare_items():
+    frontier = HeapFrontier()
+    frontier.put({"a": 1}, 0.5)
+    frontier.put({"b": 2}, 0.5)
+    assert frontier.get() == {"b": 2}
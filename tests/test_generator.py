@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+from src.board import Board, get_layout
+from src.generator import (
+    format_board,
+    generate_boards,
+    optimal_distance,
+    random_walk,
+    record_width,
+    write_binary,
+    write_text,
+)
+from src.heuristics import get_heuristic
+from src.utils import convert_string_to_list, is_solvable
+
+
+@pytest.mark.parametrize("rows, cols", [(4, 4), (3, 3), (3, 4), (5, 5)])
+def test_uniform(rows, cols):
+    layout = get_layout(rows, cols)
+    boards = list(generate_boards(500, layout, seed=11))
+    assert boards == list(generate_boards(500, layout, seed=11))
+    assert len(set(boards)) > 490
+    for packed in boards:
+        assert is_solvable(layout.unpack(packed), rows, cols)
+
+
+def test_walk():
+    boards = list(generate_boards(20, mode="walk", length=10, seed=3))
+    assert boards != list(generate_boards(20, mode="walk", length=10, seed=4))
+    for packed in boards[:5]:
+        assert optimal_distance(packed) <= 10
+
+    boards = list(generate_boards(20000, mode="walk", length=12, seed=1))
+    assert get_layout(4, 4).goal_packed not in boards
+    with pytest.raises(AssertionError):
+        next(generate_boards(1, mode="walk", length=0))
+
+    layout = get_layout(3, 3)
+    assert random_walk(None, 0, layout) == layout.goal_packed
+    assert optimal_distance(layout.goal_packed, layout) == 0
+
+
+def test_filters():
+    manhattan = get_heuristic("manhattan")
+    boards = generate_boards(50, seed=5, heuristic_range=(30, 35))
+    assert all(30 <= manhattan(packed) <= 35 for packed in boards)
+
+    boards = generate_boards(5, mode="walk", length=20, seed=5, distance_range=(12, 14))
+    assert all(12 <= optimal_distance(packed) <= 14 for packed in boards)
+
+    with pytest.raises(AssertionError):
+        next(generate_boards(1, mode="walk", length=5, distance_range=(10, 20)))
+    with pytest.raises(AssertionError):
+        next(generate_boards(1, mode="spiral"))
+
+
+def test_output():
+    layout = get_layout(3, 3)
+    boards = list(generate_boards(10, layout, seed=1))
+
+    text = io.StringIO()
+    assert write_text(iter(boards), text, layout) == 10
+    lines = text.getvalue().splitlines()
+    assert lines[0] == format_board(boards[0], layout)
+    assert [Board(convert_string_to_list(line), layout).packed for line in lines] == (
+        boards
+    )
+
+    binary = io.BytesIO()
+    assert write_binary(iter(boards), binary, layout) == 10
+    data = binary.getvalue()
+    width = record_width(layout)
+    assert width == 5
+    assert len(data) == 10 * width
+    assert int.from_bytes(data[:width], "big") == boards[0]
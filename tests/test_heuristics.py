@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from src.board import GOAL_PACKED, get_blank_moves, get_layout, pack_state, slide
+from src.heuristics import (
+    HEURISTIC_DELTAS,
+    get_heuristic,
+    get_heuristic_delta,
+    linear_conflict,
+    manhattan_distance,
+    manhattan_linear_conflict,
+    manhattan_to,
+    misplaced_tiles,
+)
+from src.utils import convert_string_to_list
+
+
+@pytest.fixture
+def packed():
+    string = "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15"
+    return pack_state(convert_string_to_list(string))
+
+
+def test_goal_is_zero():
+    assert misplaced_tiles(GOAL_PACKED) == 0
+    assert manhattan_distance(GOAL_PACKED) == 0
+    assert linear_conflict(GOAL_PACKED) == 0
+
+
+def test_misplaced_tiles(packed):
+    assert misplaced_tiles(packed) == 8
+
+
+def test_manhattan_distance(packed):
+    assert manhattan_distance(packed) == 7
+
+
+def test_linear_conflict():
+    swapped = pack_state(
+        convert_string_to_list("2 1 3 4 5 6 7 8 9 10 11 12 13 14 15 _")
+    )
+    assert manhattan_distance(swapped) == 2
+    assert linear_conflict(swapped) == 2
+    assert manhattan_linear_conflict(swapped) == 4
+
+    reversed_row = pack_state(
+        convert_string_to_list("4 3 2 1 5 6 7 8 9 10 11 12 13 14 15 _")
+    )
+    assert linear_conflict(reversed_row) == 6
+
+
+def test_get_heuristic():
+    assert get_heuristic("linear") is manhattan_linear_conflict
+
+    with pytest.raises(AssertionError):
+        get_heuristic("unknown")
+
+
+def test_manhattan_to(packed):
+    assert manhattan_to(GOAL_PACKED)(packed) == manhattan_distance(packed)
+    assert manhattan_to(packed)(packed) == 0
+    assert manhattan_to(packed)(GOAL_PACKED) == 7
+
+
+@pytest.mark.parametrize("name", list(HEURISTIC_DELTAS))
+def test_heuristic_deltas(name, packed):
+    heuristic = get_heuristic(name)
+    delta = get_heuristic_delta(name)
+    generator = random.Random(7)
+
+    blank = 1
+    value = heuristic(packed)
+    for _ in range(300):
+        target = generator.choice(get_blank_moves(blank))[1]
+        value += delta(packed, blank, target)
+        packed = slide(packed, blank, target)
+        blank = target
+        assert value == heuristic(packed)
+
+
+@pytest.mark.parametrize("name", ["misplaced", "manhattan", "linear"])
+@pytest.mark.parametrize("rows, cols", [(3, 3), (3, 5), (5, 5)])
+def test_other_sizes(name, rows, cols):
+    layout = get_layout(rows, cols)
+    heuristic = get_heuristic(name, layout)
+    delta = get_heuristic_delta(name, layout)
+    generator = random.Random(11)
+    assert heuristic(layout.goal_packed) == 0
+
+    packed = layout.goal_packed
+    blank = layout.goal_blank
+    value = 0
+    for _ in range(300):
+        target = generator.choice(get_blank_moves(blank, layout))[1]
+        value += delta(packed, blank, target)
+        packed = slide(packed, blank, target, layout.tile_bits)
+        blank = target
+        assert value == heuristic(packed)
+
+    with pytest.raises(AssertionError):
+        get_heuristic("pdb555", layout)
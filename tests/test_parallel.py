@@ -0,0 +1,77 @@
+import multiprocessing
+
+import pytest
+
+from src.board import Board, get_layout
+from src.heuristics import get_heuristic, get_heuristic_delta
+from src.parallel import FOUND, STOPPED, ParallelIDAStar, SubtreeSearch
+from src.tree import Node, Tree
+from src.utils import convert_string_to_list
+
+STRING = "5 1 2 3 9 6 7 4 13 10 11 8 14 15 _ 12"
+
+
+def test_split():
+    board = Board(convert_string_to_list(STRING))
+    heuristic = get_heuristic("manhattan")
+    search = ParallelIDAStar("manhattan", board.layout, 2)
+
+    h_value = heuristic(board.packed)
+    minimum, tasks, expanded, generated = search.split(
+        board.packed, board.blank, h_value, h_value + 10
+    )
+    assert len(tasks) >= 2 * 16
+    assert 0 < expanded < generated
+    for packed, _, depth, _, task_h_value, path in tasks:
+        assert len(path) == depth
+        assert task_h_value == heuristic(packed)
+
+    minimum, tasks, _, _ = search.split(board.packed, board.blank, h_value, 0)
+    assert minimum == h_value
+    assert tasks == []
+
+    goal = get_layout(4, 4)
+    minimum, tasks, _, _ = search.split(goal.goal_packed, goal.goal_blank, 0, 0)
+    assert minimum == FOUND
+    assert tasks[0][5] == []
+
+
+def test_subtree_search():
+    layout = get_layout(4, 4)
+    packed = Board(convert_string_to_list(STRING)).packed
+    heuristic = get_heuristic("linear")
+    search = SubtreeSearch(heuristic, get_heuristic_delta("linear"), layout)
+
+    task = (packed, 14, 0, 0, heuristic(packed), [])
+    result, path, expanded, _ = search.run(task, 10)
+    assert result == 11
+    assert path == []
+
+    result, path, expanded, generated = search.run(task, 11)
+    assert result == FOUND
+    assert len(path) == 11
+    assert 0 < expanded < generated
+
+    stop = multiprocessing.Event()
+    stop.set()
+    search = SubtreeSearch(lambda packed: 0, None, layout, stop)
+    assert search.run(task, 20)[0] == STOPPED
+
+
+def test_parallel_tree():
+    for string in (STRING, "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15"):
+        serial = Tree(Node(Board(convert_string_to_list(string))), "idastar")
+        tree = Tree(Node(Board(convert_string_to_list(string))), "idastar", workers=2)
+        assert tree.workers == 2
+        while len(serial.goal_states) == 0:
+            serial.expand()
+        while len(tree.goal_states) == 0:
+            tree.expand()
+
+        goal = tree.goal_states[0]
+        assert goal.is_goal_state()
+        assert goal.depth_count == serial.goal_states[0].depth_count
+        assert tree.expand_count > 0
+
+    with pytest.raises(AssertionError):
+        Tree(Node(Board(convert_string_to_list(STRING))), "astar", workers=2)
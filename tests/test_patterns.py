@@ -0,0 +1,63 @@
+import pytest
+
+from src.board import GOAL_PACKED, pack_state
+from src.heuristics import manhattan_distance
+from src.patterns import (
+    PatternDatabase,
+    PatternHeuristic,
+    build_pattern_table,
+    pattern_path,
+    rank_positions,
+    save_pattern_table,
+    table_size,
+    unrank_positions,
+)
+from src.utils import convert_string_to_list
+
+
+@pytest.fixture
+def packed():
+    string = "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15"
+    return pack_state(convert_string_to_list(string))
+
+
+def load(tmp_path, pattern):
+    path = pattern_path(str(tmp_path), pattern)
+    save_pattern_table(path, pattern, build_pattern_table(pattern))
+    return PatternDatabase(path)
+
+
+def test_ranking():
+    assert table_size(2) == 240
+    indices = set()
+    for index in range(table_size(2)):
+        positions = unrank_positions(index, 2)
+        assert rank_positions(positions) == index
+        indices.add(tuple(positions))
+    assert len(indices) == 240
+
+
+def test_single_tiles_match_manhattan(tmp_path, packed):
+    heuristic = PatternHeuristic([load(tmp_path, (tile,)) for tile in range(1, 16)])
+    assert heuristic(GOAL_PACKED) == 0
+    assert heuristic(packed) == manhattan_distance(packed)
+
+
+def test_pattern_heuristic(tmp_path, packed):
+    database = load(tmp_path, (1, 2, 3))
+    assert database.pattern == (1, 2, 3)
+
+    heuristic = PatternHeuristic([database])
+    assert heuristic(GOAL_PACKED) == 0
+    # Tiles 2 and 3 swapped in the top row need at least four moves.
+    swapped = pack_state(
+        convert_string_to_list("1 3 2 4 5 6 7 8 9 10 11 12 13 14 15 _")
+    )
+    assert heuristic(swapped) >= 4
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "bad.pdb"
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        PatternDatabase(str(path))
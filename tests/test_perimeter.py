@@ -0,0 +1,84 @@
+import pytest
+
+from src.board import Board, get_layout
+from src.heuristics import get_heuristic
+from src.perimeter import (
+    PerimeterDatabase,
+    PerimeterHeuristic,
+    build_perimeter,
+    perimeter_path,
+)
+from src.tree import Node, Tree
+from src.utils import convert_string_to_list
+
+LAYOUT = get_layout(3, 3)
+
+BOARDS = ["4 1 3 7 2 6 _ 5 8", "2 7 3 5 8 1 4 6 _", "1 2 3 _ 4 6 7 5 8"]
+
+
+@pytest.fixture(scope="module")
+def database(tmp_path_factory):
+    path = perimeter_path(str(tmp_path_factory.mktemp("perimeter")), LAYOUT)
+    sizes = build_perimeter(path, LAYOUT, 8)
+    assert sizes == [1, 2, 4, 8, 16, 20, 39, 62, 116]
+    return PerimeterDatabase(path)
+
+
+def test_database(database, tmp_path):
+    assert database.layout is LAYOUT
+    assert database.depth == 8
+    assert len(database) == 268
+    assert database.distance(LAYOUT.goal_packed) == 0
+
+    board = Board(convert_string_to_list("4 1 3 7 2 6 _ 5 8"), LAYOUT)
+    assert database.distance(board.packed) == 6
+    node = Node(board)
+    for code, target in database.tail(board.packed):
+        node = node.move_child(code, target)
+    assert node.is_goal_state()
+    assert node.depth_count == 6
+
+    far = Board(convert_string_to_list(BOARDS[1]), LAYOUT)
+    assert database.distance(far.packed) is None
+    assert database.tail(far.packed) is None
+
+    bad = tmp_path / "bad.db"
+    bad.write_bytes(b"PDB1")
+    with pytest.raises(ValueError):
+        PerimeterDatabase(str(bad))
+
+
+def test_heuristic(database):
+    base = get_heuristic("manhattan", LAYOUT)
+    heuristic = PerimeterHeuristic(base, database)
+    near = Board(convert_string_to_list(BOARDS[0]), LAYOUT).packed
+    far = Board(convert_string_to_list(BOARDS[1]), LAYOUT).packed
+    assert heuristic(near) == 6 >= base(near)
+    assert heuristic(far) == max(base(far), 9)
+    assert heuristic(LAYOUT.goal_packed) == 0
+
+
+@pytest.mark.parametrize("routine", ["bfs", "iddfs", "astar", "idastar"])
+def test_tree(database, routine):
+    for string in BOARDS:
+        board = Board(convert_string_to_list(string), LAYOUT)
+        baseline = Tree(Node(board), routine, depth_limit=20)
+        expected = baseline.run()[0]
+
+        tree = Tree(Node(board), routine, perimeter=database, depth_limit=20)
+        assert tree.perimeter is database
+        goal = tree.run()[0]
+        assert goal.is_goal_state()
+        assert goal.depth_count == expected.depth_count
+        assert tree.expand_count <= baseline.expand_count
+
+
+def test_unsupported(database):
+    board = Board(convert_string_to_list(BOARDS[0]), LAYOUT)
+    with pytest.raises(AssertionError):
+        Tree(Node(board), "bibfs", perimeter=database)
+    with pytest.raises(AssertionError):
+        Tree(Node(board), "idastar", workers=2, perimeter=database)
+    board = Board(convert_string_to_list("1 2 3 4 5 6 7 8 9 10 11 12 13 14 _ 15"))
+    with pytest.raises(AssertionError):
+        Tree(Node(board), "astar", perimeter=database)
@@ -0,0 +1,55 @@
+from src.board import DOWN, LEFT, RIGHT, UP, get_layout, slide
+from src.pruning import PRUNED, MoveAutomaton, find_duplicate_paths, get_move_automaton
+
+
+def test_find_duplicate_paths():
+    forbidden = find_duplicate_paths(6)
+    assert (UP, DOWN) in forbidden
+    assert (LEFT, RIGHT) in forbidden
+
+    # Circling a 2x2 block halfway one way equals going the other way.
+    assert (LEFT, UP, RIGHT, DOWN, LEFT, UP) in forbidden
+    assert (UP, LEFT, DOWN, RIGHT, UP, LEFT) not in forbidden
+    assert len(forbidden) == 8
+
+
+def test_move_automaton():
+    automaton = MoveAutomaton([(UP, DOWN), (LEFT, LEFT, LEFT)])
+    assert automaton.walk([UP, UP, LEFT]) != PRUNED
+    assert automaton.walk([LEFT, UP, DOWN]) == PRUNED
+    assert automaton.walk([LEFT, LEFT, UP, LEFT, LEFT]) != PRUNED
+    assert automaton.walk([UP, LEFT, LEFT, LEFT]) == PRUNED
+    assert get_move_automaton() is get_move_automaton()
+
+
+def test_pruning_keeps_shortest_paths():
+    layout = get_layout(3, 3)
+    automaton = get_move_automaton()
+
+    # Every state keeps its breadth-first distance with the pruned moves.
+    distances = {layout.goal_packed: 0}
+    layer = {(layout.goal_packed, layout.goal_blank)}
+    for depth in range(1, 11):
+        next_layer = set()
+        for packed, blank in layer:
+            for code, target in layout.neighbors[blank]:
+                moved = slide(packed, blank, target, layout.tile_bits)
+                if moved not in distances:
+                    distances[moved] = depth
+                    next_layer.add((moved, target))
+        layer = next_layer
+
+    reached = {}
+    paths = [(layout.goal_packed, layout.goal_blank, automaton.start, 0)]
+    while paths:
+        packed, blank, state, depth = paths.pop()
+        reached[packed] = min(reached.get(packed, depth), depth)
+        if depth == 10:
+            continue
+        for code, target in layout.neighbors[blank]:
+            next_state = automaton.transitions[state][code]
+            if next_state != PRUNED:
+                moved = slide(packed, blank, target, layout.tile_bits)
+                paths.append((moved, target, next_state, depth + 1))
+
+    assert reached == distances
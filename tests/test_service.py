@@ -0,0 +1,196 @@
+import asyncio
+import json
+import time
+
+from src.service import SolverService
+
+BOARD = "1 _ 2 4 5 7 3 8 9 6 11 12 13 10 14 15"
+
+# Far too deep for bfs to solve within the tests.
+HARD_BOARD = "15 11 2 4 1 _ 3 7 9 10 14 8 13 6 5 12"
+
+# Korf's first instance; one idastar iteration takes seconds.
+KORF_BOARD = "13 6 8 12 15 14 _ 10 11 7 4 5 9 1 3 2"
+
+
+def test_solve_and_stats():
+    async def scenario():
+        service = SolverService(workers=1)
+        await service.start()
+        try:
+            result = await service.submit({"id": 1, "board": BOARD})
+            invalid = await service.submit({"board": "1 2 3"})
+            missing = await service.submit({"id": 2})
+            return result, invalid, missing, service.stats()
+        finally:
+            await service.close()
+
+    result, invalid, missing, stats = asyncio.run(scenario())
+    assert result["id"] == 1
+    assert result["status"] == "solved"
+    assert len(result["moves"]) == 7
+    assert invalid["status"] == "invalid"
+    assert invalid["id"] == "job-1"
+    assert missing["status"] == "invalid"
+
+    assert stats["queued"] == stats["running"] == 0
+    assert stats["completed"] == 2
+    assert stats["latency_ms"]["p50"] <= stats["latency_ms"]["p99"]
+
+
+def test_invalid_id_and_deadline():
+    async def scenario():
+        service = SolverService(workers=1)
+        await service.start()
+        try:
+            bad_id = await service.submit({"id": [1], "board": BOARD})
+            bad_deadline = await service.submit({"board": BOARD, "deadline": "5"})
+            negative = await service.submit({"board": BOARD, "deadline": -1})
+            small = await service.submit({"board": BOARD, "size": "1x5"})
+            number = await service.submit({"board": BOARD, "size": 4})
+            sizes = small, number
+            return bad_id, bad_deadline, negative, sizes, service.cancel([1])
+        finally:
+            await service.close()
+
+    bad_id, bad_deadline, negative, sizes, cancelled = asyncio.run(scenario())
+    assert bad_id == {"id": [1], "status": "invalid", "error": "Bad id."}
+    assert bad_deadline["status"] == "invalid"
+    assert bad_deadline["error"] == "Bad deadline."
+    assert negative["status"] == "invalid"
+    assert [size["status"] for size in sizes] == ["invalid", "invalid"]
+    assert sizes[1]["error"] == "Bad size."
+    assert not cancelled
+
+
+def test_cancel_deadline_and_backpressure():
+    async def scenario():
+        service = SolverService(workers=1, max_queue=1)
+        await service.start()
+        try:
+            slow = {"board": HARD_BOARD, "routine": "bfs"}
+            running = asyncio.ensure_future(service.submit(dict(slow, id="a")))
+            await asyncio.sleep(0.2)
+            queued = asyncio.ensure_future(service.submit(dict(slow, id="b")))
+            await asyncio.sleep(0)
+            busy = await service.submit(dict(slow, id="c"))
+            depth = service.stats()
+
+            assert service.cancel("b")
+            assert service.cancel("a")
+            assert not service.cancel("missing")
+            results = await asyncio.gather(running, queued)
+
+            timed = await service.submit(dict(slow, id="d", deadline=0.2))
+            return busy, depth, results, timed
+        finally:
+            await service.close()
+
+    busy, depth, results, timed = asyncio.run(scenario())
+    assert busy == {"id": "c", "status": "busy"}
+    assert depth["queued"] == 1
+    assert depth["running"] == 1
+    assert depth["rejected"] == 1
+    assert [result["status"] for result in results] == ["cancelled", "cancelled"]
+    assert timed["status"] == "timeout"
+
+
+def test_cancel_and_deadline_within_iteration():
+    async def scenario():
+        service = SolverService(workers=1)
+        await service.start()
+        try:
+            slow = {"board": KORF_BOARD, "routine": "idastar"}
+            running = asyncio.ensure_future(service.submit(dict(slow, id="a")))
+            await asyncio.sleep(0.5)
+            start = time.perf_counter()
+            assert service.cancel("a")
+            cancelled = await running
+            cancel_wait = time.perf_counter() - start
+
+            start = time.perf_counter()
+            timed = await service.submit(dict(slow, id="b", deadline=0.5))
+            return cancelled, cancel_wait, timed, time.perf_counter() - start
+        finally:
+            await service.close()
+
+    cancelled, cancel_wait, timed, timed_wait = asyncio.run(scenario())
+    assert cancelled["status"] == "cancelled"
+    assert cancel_wait < 0.5
+    assert timed["status"] == "timeout"
+    assert timed_wait < 1.0
+
+
+def test_queued_answered_at_deadline_and_on_cancel():
+    async def scenario():
+        service = SolverService(workers=1)
+        await service.start()
+        try:
+            slow = {"board": HARD_BOARD, "routine": "bfs"}
+            running = asyncio.ensure_future(service.submit(dict(slow, id="a")))
+            await asyncio.sleep(0.2)
+
+            start = time.perf_counter()
+            timed = await service.submit(dict(slow, id="b", deadline=0.3))
+            timed_wait = time.perf_counter() - start
+
+            queued = asyncio.ensure_future(service.submit(dict(slow, id="c")))
+            await asyncio.sleep(0)
+            start = time.perf_counter()
+            assert service.cancel("c")
+            cancelled = await queued
+            cancel_wait = time.perf_counter() - start
+
+            still_running = not running.done()
+            service.cancel("a")
+            await running
+            return timed, timed_wait, cancelled, cancel_wait, still_running
+        finally:
+            await service.close()
+
+    timed, timed_wait, cancelled, cancel_wait, still_running = asyncio.run(scenario())
+    assert timed == {"id": "b", "status": "timeout"}
+    assert 0.25 < timed_wait < 0.6
+    assert cancelled == {"id": "c", "status": "cancelled"}
+    assert cancel_wait < 0.1
+    assert still_running
+
+
+def test_tcp():
+    async def scenario():
+        service = SolverService(workers=1)
+        await service.start()
+        server = await asyncio.start_server(service.handle_client, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for request in (
+                {"op": "solve", "id": 7, "board": BOARD},
+                {"op": "stats"},
+                {"op": "cancel", "id": 8},
+                {"op": "cancel", "id": [1]},
+            ):
+                writer.write(json.dumps(request).encode() + b"\n")
+            writer.write(b"not json\n")
+            await writer.drain()
+
+            answers = [json.loads(await reader.readline()) for _ in range(5)]
+            writer.close()
+            return answers
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+
+    answers = asyncio.run(scenario())
+    solved = [answer for answer in answers if answer.get("id") == 7][0]
+    assert solved["status"] == "solved"
+    assert [answer.get("op") for answer in answers].count("stats") == 1
+    assert {"op": "cancel", "id": 8, "cancelled": False} in answers
+    assert {
+        "op": "cancel",
+        "id": [1],
+        "status": "invalid",
+        "error": "Bad id.",
+    } in answers
+    assert {"status": "invalid", "error": "Bad JSON."} in answers
@@ -0,0 +1,51 @@
+import tracemalloc
+
+from src.stats import PHASES, SearchStats
+
+
+def test_counters():
+    stats = SearchStats()
+    assert stats.nodes_per_sec == 0.0
+
+    stats.start()
+    stats.count_expansion()
+    stats.record_frontier(5)
+    stats.record_frontier(3)
+    stats.record_explored(4)
+    stats.stop()
+
+    assert stats.expanded == 1
+    assert stats.frontier == 3
+    assert stats.peak_frontier == 5
+    assert stats.peak_explored == 4
+    assert stats.elapsed > 0
+    assert stats.nodes_per_sec > 0
+
+    summary = stats.as_dict()
+    assert summary["phase_times"] is None
+    assert summary["peak_allocation"] is None
+
+
+def test_timing_and_tracing():
+    stats = SearchStats(timed=True, trace_memory=True)
+    stats.start()
+    assert tracemalloc.is_tracing()
+    data = [0] * 10000
+    stats.add_time("heuristic", 0.5)
+    stats.stop()
+    del data
+
+    assert not tracemalloc.is_tracing()
+    assert stats.peak_allocation > 0
+    assert set(stats.as_dict()["phase_times"]) == set(PHASES)
+    assert stats.phase_times["heuristic"] == 0.5
+
+
+def test_progress_reports():
+    reports = []
+    stats = SearchStats(report_interval=0, reporter=reports.append)
+    stats.start()
+    for _ in range(2048):
+        stats.count_expansion()
+    assert len(reports) == 2
+    assert reports[-1]["expanded"] == 2048
@@ -1,6 +1,10 @@
+import math
+import time
+
 import pytest
 
-from src.board import Board
+from src.board import Board, get_layout
+from src.stats import SearchStats
 from src.tree import Node, Tree
 from src.utils import convert_string_to_list
 
@@ -23,7 +27,6 @@ class TestNode:
         assert root_node.current_board is not None
         assert root_node.action_used == []
         assert root_node.depth_count == 0
-        assert root_node.children == []
 
         child_node = root_node.move_board("Left")
         assert child_node.parent_node is not None
@@ -32,16 +35,12 @@ class TestNode:
         assert child_node.current_board is not None
         assert child_node.action_used[0] == "Left"
         assert child_node.depth_count == 1
-
-        assert child_node.children == []
-        assert len(root_node.children) == 1
-        assert root_node.children[0] is child_node
+        assert not hasattr(root_node, "children")
 
     def test_move(self, root_node):
         child_node = root_node.move_board("Up")
         assert child_node.parent_node is root_node
         assert child_node.current_board is not None
-        assert root_node.children[0] is child_node
 
         assert child_node.get_current_array()[0] == ["1", "7", "2", "4"]
         assert child_node.action_used[0] == "Up"
@@ -49,12 +48,32 @@ class TestNode:
 
         grandchild_node = child_node.move_board("Left")
         assert grandchild_node.action_used[1] == "Left"
+        assert grandchild_node.last_action == "Left"
+        assert child_node.action_used == ["Up"]
+        assert root_node.last_action is None
         assert grandchild_node.depth_count == 2
 
         child_node = root_node.move_board("Down")
         assert child_node.action_used[0] == "Down"
         assert child_node.depth_count == 0
 
+    def test_move_child(self, root_node):
+        board = root_node.current_board
+        moves = root_node.get_child_moves()
+        assert moves == board.layout.neighbors[board.blank]
+
+        for code, target in moves:
+            child = root_node.move_child(code, target)
+            expected = root_node.move_board(child.last_action)
+            assert child.current_board == expected.current_board
+            assert child.depth_count == 1
+            assert child.parent_node is root_node
+
+            # The move back to the parent is never offered.
+            back = [move[1] for move in child.get_child_moves()]
+            assert board.blank not in back
+            assert len(back) == len(child.current_board.get_valid_moves()) - 1
+
     def test_heuristic(self, root_node):
         assert root_node.calculate_heuristic() == 8
 
@@ -69,7 +88,7 @@ class TestTree:
     def test_init(self, tree):
         assert tree.root is not None
         assert tree.expand_count == 0
-        assert tree.root.get_current_string() not in tree.explored_set
+        assert tree.root.get_current_key() not in tree.explored_set
 
         assert tree.frontier.qsize() == 1
         assert len(tree.explored_set) == 0
@@ -84,18 +103,253 @@ class TestTree:
 
     def test_expand(self, tree):
         assert tree.frontier.qsize() == 1
-        assert tree.root.get_current_string() not in tree.explored_set
+        assert tree.root.get_current_key() not in tree.explored_set
 
         tree.expand()
         assert tree.frontier.qsize() == 3
         assert tree.expand_count == 1
-        assert tree.root.get_current_string() in tree.explored_set
+        assert tree.root.get_current_key() in tree.explored_set
         assert len(tree.explored_set) == 1
 
+        # The move back to the root is pruned.
         tree.expand()
-        assert tree.frontier.qsize() == 6
+        assert tree.frontier.qsize() == 5
         assert tree.expand_count == 2
 
         while len(tree.goal_states) == 0:
             tree.expand()
         assert len(tree.goal_states) == 1
+
+    def test_heuristic_routines(self, root_node):
+        with pytest.raises(AssertionError):
+            Tree(root_node, "astar", "unknown")
+        for routine in ("astar", "idastar", "biastar", "arastar"):
+            with pytest.raises(AssertionError):
+                Tree(root_node, routine, "misplaced")
+
+        ish = Tree(root_node, "ish")
+        assert ish.heuristic == "misplaced"
+
+        astar = Tree(root_node, "astar")
+        assert astar.heuristic == "linear"
+        assert root_node.h_value == root_node.calculate_heuristic("linear")
+        assert root_node.f_value == root_node.h_value
+        while len(astar.goal_states) == 0:
+            astar.expand()
+        assert len(astar.goal_states[0].action_used) == 7
+        assert astar.goal_states[0].is_goal_state()
+        assert astar.goal_states[0].h_value == 0
+        assert astar.goal_states[0].f_value == 7
+
+    def test_idastar(self, root_node):
+        tree = Tree(root_node, "idastar", "manhattan")
+        assert tree.bound == 7
+
+        tree.expand()
+        assert len(tree.goal_states) == 1
+        assert tree.goal_states[0].action_used == [
+            "Left",
+            "Up",
+            "Right",
+            "Up",
+            "Up",
+            "Left",
+            "Left",
+        ]
+        assert tree.goal_states[0].is_goal_state()
+
+    def test_iddfs(self, root_node):
+        tree = Tree(root_node, "iddfs")
+        assert tree.depth_limit == math.inf
+        assert tree.bound == 5
+
+        while len(tree.goal_states) == 0:
+            tree.expand()
+        assert tree.bound == 7
+        assert len(tree.goal_states[0].action_used) == 7
+        assert tree.goal_states[0].is_goal_state()
+        assert tree.stats.peak_frontier == 6
+
+        tree = Tree(root_node, "iddfs", depth_limit=5)
+        with pytest.raises(IndexError):
+            while len(tree.goal_states) == 0:
+                tree.expand()
+        assert len(tree.goal_states) == 0
+
+    def test_depth_limit(self, root_node):
+        assert Tree(root_node, "dfs").depth_limit == 16
+        tree = Tree(root_node, "dfs", depth_limit=7)
+        while len(tree.goal_states) == 0:
+            tree.expand()
+        assert len(tree.goal_states[0].action_used) <= 8
+
+    def test_priority_queues(self, root_node):
+        for routine in ("ish", "astar", "biastar"):
+            for priority_queue in ("bucket", "heap"):
+                tree = Tree(root_node, routine, priority_queue=priority_queue)
+                assert tree.priority_queue == priority_queue
+                while len(tree.goal_states) == 0:
+                    tree.expand()
+                assert len(tree.goal_states[0].action_used) == 7
+
+        with pytest.raises(AssertionError):
+            Tree(root_node, "astar", priority_queue="fifo")
+
+    def test_bidirectional(self, root_node):
+        for routine in ("bibfs", "biastar"):
+            tree = Tree(root_node, routine)
+            while len(tree.goal_states) == 0:
+                tree.expand()
+
+            goal = tree.goal_states[0]
+            assert goal.is_goal_state()
+            assert len(goal.action_used) == 7
+            assert goal.depth_count == 7
+
+    def test_anytime(self):
+        string = "15 11 2 4 1 _ 3 7 9 10 14 8 13 6 5 12"
+        root = Node(Board(convert_string_to_list(string)))
+        tree = Tree(root, "arastar")
+        assert tree.heuristic == "manhattan"
+        while not tree.finished:
+            tree.expand()
+
+        lengths = [goal.depth_count for goal in tree.goal_states]
+        assert len(lengths) > 1
+        assert lengths == sorted(lengths, reverse=True)
+        assert tree.bounds == sorted(tree.bounds, reverse=True)
+        assert all(1.0 <= bound <= 3.0 for bound in tree.bounds)
+        assert tree.suboptimality == tree.bounds[-1] == 1.0
+        assert tree.weight < 3.0
+        assert tree.goal_states[-1].is_goal_state()
+
+        optimal = Tree(root, "astar", "manhattan")
+        while len(optimal.goal_states) == 0:
+            optimal.expand()
+        assert lengths[-1] == optimal.goal_states[0].depth_count == 30
+
+    def test_time_budget(self, root_node):
+        tree = Tree(root_node, "astar", time_budget=0)
+        tree.expand()
+        assert tree.finished
+        assert len(tree.goal_states) == 0
+
+        expand_count = tree.expand_count
+        tree.expand()
+        assert tree.expand_count == expand_count
+
+        tree = Tree(root_node, "arastar", weight=1.0)
+        while not tree.finished:
+            tree.expand()
+        assert tree.bounds == [1.0]
+        assert len(tree.goal_states[0].action_used) == 7
+
+    @pytest.mark.parametrize("routine, budget", [("idastar", 0.5), ("iddfs", 1.0)])
+    def test_time_budget_within_iteration(self, routine, budget):
+        # Korf's first instance; the iteration running when the budget is
+        # used up would take seconds more to finish.
+        string = "13 6 8 12 15 14 _ 10 11 7 4 5 9 1 3 2"
+        board = Board(convert_string_to_list(string))
+        tree = Tree(Node(board), routine, time_budget=budget)
+        start = time.perf_counter()
+        while not tree.finished:
+            tree.expand()
+        assert time.perf_counter() - start < budget + 0.5
+        assert len(tree.goal_states) == 0
+
+    def test_solve_iter(self, root_node):
+        tree = Tree(root_node, "astar")
+        events = list(tree.solve_iter(solutions=2, progress_interval=0))
+        kinds = [event.kind for event in events]
+        assert kinds[0] == "progress"
+        assert kinds.count("solution") == 2
+        assert events[-1].kind == "done"
+        assert events[-1].reason == "solutions"
+        lengths = [event.node.depth_count for event in events if event.node]
+        assert lengths == [7, 17]
+        assert events[-1].stats["expanded"] == tree.expand_count
+
+        events = list(Tree(root_node, "bfs").solve_iter(max_expansions=5))
+        assert [(event.kind, event.reason) for event in events] == [
+            ("done", "max_expansions")
+        ]
+
+        tree = Tree(root_node, "idastar")
+        events = list(tree.solve_iter(solutions=3))
+        assert [event.kind for event in events] == ["solution", "done"]
+        assert events[-1].reason == "finished"
+
+        tree = Tree(root_node, "iddfs", depth_limit=3)
+        assert list(tree.solve_iter())[-1].reason == "exhausted"
+
+    def test_run(self, root_node):
+        tree = Tree(root_node, "astar")
+        goals = tree.run()
+        assert len(goals) == 1
+        assert goals[0].depth_count == 7
+        assert tree.finished
+
+        assert Tree(root_node, "bfs").run(max_expansions=1) == []
+        assert Tree(root_node, "bfs").run(time_limit=0) == []
+
+    def test_memory_budget(self, root_node):
+        tree = Tree(root_node, "astar", max_memory=1)
+        assert tree.max_memory == 1
+
+        tree.expand()
+        assert tree.routine == "idastar"
+        assert tree.frontier.qsize() == 0
+        while len(tree.goal_states) == 0:
+            tree.expand()
+        assert len(tree.goal_states[0].action_used) == 7
+
+        tree = Tree(root_node, "ish", max_memory=1)
+        assert tree.heuristic == "misplaced"
+        tree.expand()
+        assert tree.routine == "idastar"
+        assert tree.heuristic == "manhattan"
+        assert tree.bound == tree.root.h_value
+        while len(tree.goal_states) == 0:
+            tree.expand()
+        assert len(tree.goal_states[0].action_used) == 7
+
+    def test_stats(self, root_node):
+        tree = Tree(root_node, "bfs", stats=SearchStats(timed=True))
+        while len(tree.goal_states) == 0:
+            tree.expand()
+
+        stats = tree.stats
+        assert stats.expanded == tree.expand_count
+        assert stats.generated >= stats.expanded
+        assert stats.duplicates > 0
+        assert stats.peak_explored == len(tree.explored_set)
+        assert stats.peak_frontier >= stats.frontier > 0
+        assert stats.phase_times["expand"] >= stats.phase_times["frontier"] > 0
+
+    @pytest.mark.parametrize("routine", ["idastar", "extbfs"])
+    def test_progress_reports(self, root_node, routine):
+        # Neither routine counts its expansions one at a time here.
+        reports = []
+        stats = SearchStats(report_interval=0, reporter=reports.append)
+        workers = 2 if routine == "idastar" else None
+        tree = Tree(root_node, routine, stats=stats, workers=workers)
+        while len(tree.goal_states) == 0:
+            tree.expand()
+        assert reports
+        assert reports[-1]["expanded"] == tree.expand_count
+
+    @pytest.mark.parametrize(
+        "string, rows, cols",
+        [("4 1 3 7 2 6 _ 5 8", 3, 3), ("5 1 2 4 _ 6 3 7 9 10 11 8", 3, 4)],
+    )
+    def test_other_sizes(self, string, rows, cols):
+        layout = get_layout(rows, cols)
+        for routine in ("bfs", "iddfs", "astar", "idastar", "bibfs", "biastar"):
+            tree = Tree(Node(Board(convert_string_to_list(string), layout)), routine)
+            while len(tree.goal_states) == 0:
+                tree.expand()
+
+            goal = tree.goal_states[0]
+            assert goal.is_goal_state()
+            assert goal.current_board.layout is layout
+            assert len(goal.action_used) == 6
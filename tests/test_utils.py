@@ -1,6 +1,11 @@
 import pytest
 
-from src.utils import convert_string_to_list, validate_list
+from src.utils import (
+    convert_string_to_list,
+    is_solvable,
+    is_solvable_permutation,
+    validate_list,
+)
 
 
 @pytest.fixture
@@ -33,3 +38,39 @@ def test_validate_list(input_list):
     with pytest.raises(Exception) as e:
         validate_list(no_blank_list)
         assert "(expected 1-15 & '_' character)" in e
+
+
+def test_is_solvable(input_list):
+    assert is_solvable(input_list) is True
+    assert is_solvable(convert_string_to_list("1 2 3 4 5 6 7 8 9 10 11 12 13 14 15 _"))
+
+    swapped = convert_string_to_list("1 2 3 4 5 6 7 8 9 10 11 12 13 15 14 _")
+    assert is_solvable(swapped) is False
+
+    # Moving the blank up a row keeps the puzzle solvable.
+    shifted = convert_string_to_list("1 2 3 4 5 6 7 8 9 10 11 _ 13 14 15 12")
+    assert is_solvable(shifted) is True
+
+    # Swapping two tiles with the blank moved is also unsolvable.
+    odd = convert_string_to_list("2 1 3 4 5 6 7 8 9 10 11 _ 13 14 15 12")
+    assert is_solvable(odd) is False
+
+    assert is_solvable_permutation([1, 2, 3, 4, 5, 6, 7, 0, 8], 3, 3) is True
+    assert is_solvable_permutation([2, 1, 3, 4, 5, 6, 7, 8, 0], 3, 3) is False
+
+
+def test_other_sizes():
+    small = convert_string_to_list("1 2 3 4 5 6 7 _ 8")
+    assert validate_list(small, 3, 3) is True
+    assert is_solvable(small, 3, 3) is True
+    assert is_solvable(convert_string_to_list("2 1 3 4 5 6 7 8 _"), 3, 3) is False
+
+    with pytest.raises(AssertionError, match="expected 1-15"):
+        validate_list(small)
+    with pytest.raises(AssertionError, match="expected 1-9"):
+        validate_list(small, 2, 5)
+    assert validate_list(small + ["9"], 2, 5) is True
+
+    wide = convert_string_to_list("1 2 3 4 5 6 7 8 9 10 _ 11")
+    assert validate_list(wide, 3, 4) is True
+    assert is_solvable(wide, 3, 4) is True
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src.board import Board, get_layout, slide
+from src.heuristics import get_heuristic
+from src.tree import Node, Tree
+from src.utils import convert_string_to_list
+
+np = pytest.importorskip("numpy")
+
+from src.vectorized import (  # noqa: E402
+    BatchHeuristic,
+    BeamSearch,
+    board_keys,
+    unpack_boards,
+)
+
+STRING = "15 11 2 4 1 _ 3 7 9 10 14 8 13 6 5 12"
+
+
+def random_states(layout, count):
+    rng = random.Random(7)
+    states = []
+    for _ in range(count):
+        packed, blank = layout.goal_packed, layout.goal_blank
+        for _ in range(40):
+            _, target = rng.choice(layout.neighbors[blank])
+            packed, blank = slide(packed, blank, target, layout.tile_bits), target
+        states.append(packed)
+    return states
+
+
+@pytest.mark.parametrize("rows, cols", [(4, 4), (3, 3), (5, 5)])
+def test_batch_heuristic(rows, cols):
+    layout = get_layout(rows, cols)
+    states = random_states(layout, 50)
+    boards = unpack_boards(states, layout)
+    assert boards.dtype == np.uint8
+    assert boards.shape == (50, layout.size)
+
+    for name in ("misplaced", "manhattan"):
+        values = BatchHeuristic(name, layout)(boards)
+        heuristic = get_heuristic(name, layout)
+        assert values.tolist() == [heuristic(packed) for packed in states]
+
+    with pytest.raises(AssertionError):
+        BatchHeuristic("linear", layout)
+
+
+def test_board_keys():
+    layout = get_layout(4, 4)
+    states = random_states(layout, 20)
+    boards = unpack_boards(states + states[:5], layout)
+    assert len(np.unique(board_keys(boards))) == len(set(states))
+
+
+def test_beam_search():
+    board = Board(convert_string_to_list(STRING))
+    search = BeamSearch(board.packed, "manhattan", board.layout, 100)
+    path = None
+    while path is None:
+        path, expanded, generated, duplicates = search.step()
+        assert 0 < expanded <= 100
+        assert duplicates <= generated
+    assert len(search) <= 100
+    assert len(path) == search.depth + 1
+
+    node = Node(board)
+    for code, target in path:
+        node = node.move_child(code, target)
+    assert node.is_goal_state()
+
+
+def test_beam_tree():
+    root = Node(Board(convert_string_to_list(STRING)))
+    tree = Tree(root, "beam", beam_width=1000)
+    assert tree.heuristic == "manhattan"
+    while len(tree.goal_states) == 0:
+        tree.expand()
+
+    goal = tree.goal_states[0]
+    assert goal.is_goal_state()
+    assert len(goal.action_used) == 30
+    assert tree.stats.expanded == tree.expand_count
+    assert tree.stats.duplicates > 0
+
+    with pytest.raises(AssertionError):
+        Tree(root, "beam", "linear")